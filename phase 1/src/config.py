@@ -6,6 +6,13 @@ from typing import Optional
 import re
 
 
+# Match various YouTube URL formats (watch, embed, short links, bare IDs).
+# Compiled once at import so extract_video_id does a single search per URL.
+_VIDEO_ID_RE = re.compile(
+    r'(?:(?:v=|/|embed/)([0-9A-Za-z_-]{11})|^([0-9A-Za-z_-]{11})$)'
+)
+
+
 @dataclass
 class PathConfig:
     """Path configuration for the pipeline."""
@@ -19,22 +26,39 @@ class PathConfig:
         self.workspace_root = workspace_root
         self.data_dir = workspace_root / "data"
         self.raw_dir = self.data_dir / "raw"
-    
+        # Per-video directory paths, built once on first access; every
+        # stage asks for the same handful of paths repeatedly.
+        self._dir_cache = {}
+
+    def _dirs_for(self, video_id: str) -> dict:
+        """Get (and cache) all directory paths for a video."""
+        dirs = self._dir_cache.get(video_id)
+        if dirs is None:
+            video_dir = self.raw_dir / video_id
+            dirs = {
+                "video": video_dir,
+                "source": video_dir / "source",
+                "normalized": video_dir / "normalized",
+                "keyframes": video_dir / "keyframes",
+            }
+            self._dir_cache[video_id] = dirs
+        return dirs
+
     def get_video_dir(self, video_id: str) -> Path:
         """Get the directory for a specific video."""
-        return self.raw_dir / video_id
-    
+        return self._dirs_for(video_id)["video"]
+
     def get_source_dir(self, video_id: str) -> Path:
         """Get the source directory for raw downloads."""
-        return self.get_video_dir(video_id) / "source"
-    
+        return self._dirs_for(video_id)["source"]
+
     def get_normalized_dir(self, video_id: str) -> Path:
         """Get the normalized media directory."""
-        return self.get_video_dir(video_id) / "normalized"
-    
+        return self._dirs_for(video_id)["normalized"]
+
     def get_keyframes_dir(self, video_id: str) -> Path:
         """Get the keyframes directory."""
-        return self.get_video_dir(video_id) / "keyframes"
+        return self._dirs_for(video_id)["keyframes"]
 
 
 @dataclass
@@ -43,7 +67,7 @@ class ModelConfig:
     # Whisper settings
     whisper_model: str = "large-v3"
     whisper_device: str = "cuda"
-    whisper_compute_type: str = "float16"
+    whisper_compute_type: str = "int8_float16"  # int8 weights, fp16 activations
     
     # WhisperX settings
     whisperx_align: bool = True
@@ -64,6 +88,7 @@ class ModelConfig:
     ocr_lang: str = "en"
     ocr_use_gpu: bool = True
     ocr_conf_threshold: float = 0.5
+    ocr_batch_size: int = 16  # keyframes per EasyOCR inference batch
     
     # Layout parser settings
     layout_model: str = "lp://PubLayNet/faster_rcnn_R_50_FPN_3x/config"
@@ -107,22 +132,16 @@ class PipelineConfig:
     @staticmethod
     def extract_video_id(url: str) -> str:
         """Extract video ID from YouTube URL."""
-        # Match various YouTube URL formats
-        patterns = [
-            r'(?:v=|\/)([0-9A-Za-z_-]{11}).*',
-            r'(?:embed\/)([0-9A-Za-z_-]{11})',
-            r'^([0-9A-Za-z_-]{11})$'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                return match.group(1)
-        
+        match = _VIDEO_ID_RE.search(url)
+        if match:
+            return next(group for group in match.groups() if group)
+
         raise ValueError(f"Could not extract video ID from URL: {url}")
     
     def ensure_directories(self):
         """Create all necessary directories."""
-        self.paths.get_source_dir(self.video_id).mkdir(parents=True, exist_ok=True)
-        self.paths.get_normalized_dir(self.video_id).mkdir(parents=True, exist_ok=True)
-        self.paths.get_keyframes_dir(self.video_id).mkdir(parents=True, exist_ok=True)
+        # os.makedirs on pre-joined strings does the component stats in C;
+        # pathlib's mkdir would re-walk the path per call.
+        base = os.path.join(str(self.paths.raw_dir), self.video_id)
+        for sub in ("source", "normalized", "keyframes"):
+            os.makedirs(os.path.join(base, sub), exist_ok=True)
@@ -1,16 +1,38 @@
 """Automatic Speech Recognition with word-level timestamps."""
+import functools
 import json
 import logging
+import threading
+from array import array
 from pathlib import Path
 from typing import Dict, Any, List, Optional
+import numpy as np
 import torch
-from faster_whisper import WhisperModel
+from faster_whisper import WhisperModel, BatchedInferencePipeline
 import whisperx
 
+from src.serialization import dump_json
+
 
 logger = logging.getLogger(__name__)
 
 
+# WhisperX models cached across videos processed in the same interpreter.
+# Loading the alignment model moves ~1 GB of weights to GPU, which would
+# otherwise dominate cold-start on multi-video batch runs.
+_ALIGN_MODELS: Dict[tuple, tuple] = {}
+_DIARIZE_PIPELINES: Dict[str, Any] = {}
+
+
+@functools.lru_cache(maxsize=8192)
+def _format_timestamp(ms: int) -> str:
+    """Format milliseconds as HH:MM:SS.mmm"""
+    hours, rem = divmod(ms, 3_600_000)
+    minutes, rem = divmod(rem, 60_000)
+    secs = rem / 1000
+    return f"{hours:02d}:{minutes:02d}:{secs:06.3f}"
+
+
 class ASRProcessor:
     """Process audio to generate transcripts with word-level timestamps."""
     
@@ -18,7 +40,7 @@ class ASRProcessor:
         self,
         model_size: str = "large-v3",
         device: str = "cuda",
-        compute_type: str = "float16",
+        compute_type: str = "int8_float16",
         batch_size: int = 16
     ):
         self.model_size = model_size
@@ -26,6 +48,11 @@ class ASRProcessor:
         self.compute_type = compute_type
         self.batch_size = batch_size
         self.model = None
+        self.pipeline = None
+        # Background transcript writer; stays on the instance (never in
+        # the serializable result) and is joined before process() returns.
+        self._transcript_thread: Optional[threading.Thread] = None
+        self._transcript_error: Optional[BaseException] = None
         
     def process(
         self,
@@ -65,16 +92,25 @@ class ASRProcessor:
         # Step 1: Transcribe with faster-whisper
         logger.info("Step 1: Transcribing with Whisper...")
         whisper_result = self._transcribe_whisper(audio_path)
-        
+
+        # Decode + resample the audio once; align and diarize both need
+        # the same 16 kHz ndarray and each load_audio call would spawn a
+        # fresh ffmpeg decode of the full file.
+        audio = None
+        if align or diarize:
+            audio = whisperx.load_audio(str(audio_path))
+
         # Step 2: Align with WhisperX if requested
         if align:
             logger.info("Step 2: Aligning with WhisperX...")
-            whisper_result = self._align_whisperx(audio_path, whisper_result)
-        
+            whisper_result = self._align_whisperx(audio, whisper_result)
+
         # Step 3: Diarize if requested
         if diarize:
             logger.info("Step 3: Performing speaker diarization...")
-            whisper_result = self._diarize_whisperx(audio_path, whisper_result)
+            whisper_result = self._diarize_whisperx(audio, whisper_result)
+
+        audio = None
         
         # Prepare output
         result = {
@@ -86,76 +122,132 @@ class ASRProcessor:
             "diarized": diarize
         }
         
-        # Save JSON output
-        with open(asr_json_path, 'w') as f:
-            json.dump(result, f, indent=2)
-        
-        # Save human-readable transcript
+        # Write the human-readable transcript on a background thread so
+        # it overlaps the (much larger) asr.json dump below; joined
+        # before returning so write failures surface here rather than
+        # as a silently missing file.
         transcript_text = self._format_transcript(result["segments"])
-        with open(transcript_path, 'w') as f:
-            f.write(transcript_text)
-        
+        self._transcript_error = None
+
+        def _write_transcript():
+            try:
+                transcript_path.write_text(transcript_text)
+            except BaseException as e:
+                self._transcript_error = e
+
+        self._transcript_thread = threading.Thread(target=_write_transcript)
+        self._transcript_thread.start()
+
+        # Save JSON output
+        dump_json(result, asr_json_path)
+
+        self._join_transcript_thread()
+
         logger.info(f"ASR complete. Output saved to {asr_json_path}")
-        
+
         return result
+
+    def _join_transcript_thread(self) -> None:
+        """Wait for the background transcript write, surfacing failures."""
+        if self._transcript_thread is not None:
+            self._transcript_thread.join()
+            self._transcript_thread = None
+        if self._transcript_error is not None:
+            error, self._transcript_error = self._transcript_error, None
+            raise error
     
     def _transcribe_whisper(self, audio_path: Path) -> Dict[str, Any]:
         """Transcribe audio using faster-whisper."""
         if self.model is None:
-            logger.info(f"Loading Whisper model: {self.model_size}")
+            logger.info(f"Loading Whisper model: {self.model_size} ({self.compute_type})")
             self.model = WhisperModel(
                 self.model_size,
                 device=self.device,
                 compute_type=self.compute_type
             )
-        
-        segments, info = self.model.transcribe(
+            # Batched pipeline feeds multiple 30s windows through the
+            # encoder concurrently instead of one chunk per launch.
+            self.pipeline = BatchedInferencePipeline(model=self.model)
+
+        segments, info = self.pipeline.transcribe(
             str(audio_path),
+            batch_size=self.batch_size,
             beam_size=5,
             word_timestamps=True,
             vad_filter=True
         )
-        
-        # Convert segments to list with millisecond timestamps
-        segment_list = []
+
+        # Drain the generator into flat typed buffers in a single pass,
+        # then convert seconds -> milliseconds vectorized instead of one
+        # scalar multiply per segment/word.
+        seg_starts = array('d')
+        seg_ends = array('d')
+        texts = []
+        word_counts = []
+        word_texts = []
+        word_starts = array('d')
+        word_ends = array('d')
+        word_probs = []
+
         for segment in segments:
+            seg_starts.append(segment.start)
+            seg_ends.append(segment.end)
+            texts.append(segment.text.strip())
+
+            words = getattr(segment, 'words', None)
+            word_counts.append(len(words) if words else 0)
+            if words:
+                for word in words:
+                    word_texts.append(word.word)
+                    word_starts.append(word.start)
+                    word_ends.append(word.end)
+                    word_probs.append(word.probability)
+
+        seg_starts_ms = (np.asarray(seg_starts) * 1000).astype(np.int64).tolist()
+        seg_ends_ms = (np.asarray(seg_ends) * 1000).astype(np.int64).tolist()
+        word_starts_ms = (np.asarray(word_starts) * 1000).astype(np.int64).tolist()
+        word_ends_ms = (np.asarray(word_ends) * 1000).astype(np.int64).tolist()
+
+        segment_list = []
+        word_offset = 0
+        for start, end, text, count in zip(seg_starts_ms, seg_ends_ms, texts, word_counts):
             segment_dict = {
-                "start": int(segment.start * 1000),  # Convert to milliseconds
-                "end": int(segment.end * 1000),
-                "text": segment.text.strip(),
+                "start": start,
+                "end": end,
+                "text": text,
             }
-            
-            # Add word-level timestamps if available
-            if hasattr(segment, 'words') and segment.words:
+
+            if count:
                 segment_dict["words"] = [
                     {
-                        "word": word.word,
-                        "start": int(word.start * 1000),
-                        "end": int(word.end * 1000),
-                        "probability": word.probability
+                        "word": word_texts[j],
+                        "start": word_starts_ms[j],
+                        "end": word_ends_ms[j],
+                        "probability": word_probs[j]
                     }
-                    for word in segment.words
+                    for j in range(word_offset, word_offset + count)
                 ]
-            
+                word_offset += count
+
             segment_list.append(segment_dict)
-        
+
         return {
             "segments": segment_list,
             "language": info.language,
             "duration": info.duration
         }
     
-    def _align_whisperx(self, audio_path: Path, whisper_result: Dict[str, Any]) -> Dict[str, Any]:
+    def _align_whisperx(self, audio: np.ndarray, whisper_result: Dict[str, Any]) -> Dict[str, Any]:
         """Improve timestamp alignment using WhisperX."""
         try:
-            # Load audio
-            audio = whisperx.load_audio(str(audio_path))
-            
-            # Load alignment model
-            model_a, metadata = whisperx.load_align_model(
-                language_code=whisper_result.get("language", "en"),
-                device=self.device
-            )
+            # Load alignment model (cached per language/device)
+            key = (whisper_result.get("language", "en"), self.device)
+            if key not in _ALIGN_MODELS:
+                _ALIGN_MODELS[key] = whisperx.load_align_model(
+                    language_code=key[0],
+                    device=key[1]
+                )
+            model_a, metadata = _ALIGN_MODELS[key]
             
             # Prepare segments for alignment (convert back to seconds)
             segments_for_align = [
@@ -177,29 +269,46 @@ class ASRProcessor:
                 return_char_alignments=False
             )
             
-            # Convert aligned segments back to milliseconds
+            # Convert aligned segments back to milliseconds with bulk
+            # NumPy multiplies instead of one scalar conversion per value
+            segs = result_aligned["segments"]
+            seg_starts_ms = (
+                np.fromiter((s["start"] for s in segs), np.float64, len(segs)) * 1000
+            ).astype(np.int64).tolist()
+            seg_ends_ms = (
+                np.fromiter((s["end"] for s in segs), np.float64, len(segs)) * 1000
+            ).astype(np.int64).tolist()
+
             aligned_segments = []
-            for seg in result_aligned["segments"]:
+            for seg, start_ms, end_ms in zip(segs, seg_starts_ms, seg_ends_ms):
                 segment_dict = {
-                    "start": int(seg["start"] * 1000),
-                    "end": int(seg["end"] * 1000),
+                    "start": start_ms,
+                    "end": end_ms,
                     "text": seg["text"].strip(),
                 }
-                
+
                 # Add aligned word timestamps
-                if "words" in seg:
+                words = seg.get("words")
+                if words:
+                    word_starts_ms = (
+                        np.fromiter((w["start"] for w in words), np.float64, len(words)) * 1000
+                    ).astype(np.int64).tolist()
+                    word_ends_ms = (
+                        np.fromiter((w["end"] for w in words), np.float64, len(words)) * 1000
+                    ).astype(np.int64).tolist()
                     segment_dict["words"] = [
                         {
                             "word": word["word"],
-                            "start": int(word["start"] * 1000),
-                            "end": int(word["end"] * 1000),
+                            "start": word_start,
+                            "end": word_end,
                             "score": word.get("score", 1.0)
                         }
-                        for word in seg["words"]
+                        for word, word_start, word_end
+                        in zip(words, word_starts_ms, word_ends_ms)
                     ]
-                
+
                 aligned_segments.append(segment_dict)
-            
+
             whisper_result["segments"] = aligned_segments
             
         except Exception as e:
@@ -207,18 +316,17 @@ class ASRProcessor:
         
         return whisper_result
     
-    def _diarize_whisperx(self, audio_path: Path, whisper_result: Dict[str, Any]) -> Dict[str, Any]:
+    def _diarize_whisperx(self, audio: np.ndarray, whisper_result: Dict[str, Any]) -> Dict[str, Any]:
         """Perform speaker diarization using WhisperX."""
         try:
-            # Load diarization model
-            diarize_model = whisperx.DiarizationPipeline(
-                use_auth_token=None,  # Can use HuggingFace token if needed
-                device=self.device
-            )
-            
-            # Load audio
-            audio = whisperx.load_audio(str(audio_path))
-            
+            # Load diarization model (cached per device)
+            if self.device not in _DIARIZE_PIPELINES:
+                _DIARIZE_PIPELINES[self.device] = whisperx.DiarizationPipeline(
+                    use_auth_token=None,  # Can use HuggingFace token if needed
+                    device=self.device
+                )
+            diarize_model = _DIARIZE_PIPELINES[self.device]
+
             # Perform diarization
             diarize_segments = diarize_model(audio)
             
@@ -228,15 +336,14 @@ class ASRProcessor:
                 whisper_result["segments"]
             )
             
-            # Update segments with speaker information
+            # Update segments with speaker information via a hash join on
+            # start timestamp instead of a quadratic scan
+            by_start = {seg["start"]: seg for seg in whisper_result["segments"]}
             for seg in result_with_speakers["segments"]:
                 if "speaker" in seg:
-                    # Find corresponding segment in our result
-                    seg_start_ms = int(seg["start"] * 1000)
-                    for our_seg in whisper_result["segments"]:
-                        if our_seg["start"] == seg_start_ms:
-                            our_seg["speaker"] = seg["speaker"]
-                            break
+                    our_seg = by_start.get(int(seg["start"] * 1000))
+                    if our_seg is not None:
+                        our_seg["speaker"] = seg["speaker"]
             
         except Exception as e:
             logger.warning(f"Diarization failed: {e}. Proceeding without speaker labels.")
@@ -256,14 +363,18 @@ class ASRProcessor:
         
         return "\n".join(lines)
     
+    @classmethod
+    def release_models(cls):
+        """Release cached WhisperX models for memory-constrained runs."""
+        _ALIGN_MODELS.clear()
+        _DIARIZE_PIPELINES.clear()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
     @staticmethod
     def _format_timestamp(ms: int) -> str:
-        """Format milliseconds as HH:MM:SS.mmm"""
-        seconds = ms / 1000
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = seconds % 60
-        return f"{hours:02d}:{minutes:02d}:{secs:06.3f}"
+        """Format milliseconds as HH:MM:SS.mmm (memoized at module level)."""
+        return _format_timestamp(ms)
 
 
 def process_asr(
@@ -271,7 +382,7 @@ def process_asr(
     output_dir: Path,
     model_size: str = "large-v3",
     device: str = "cuda",
-    compute_type: str = "float16",
+    compute_type: str = "int8_float16",
     batch_size: int = 16,
     align: bool = True,
     diarize: bool = False,
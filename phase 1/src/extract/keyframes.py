@@ -1,14 +1,71 @@
 """Keyframe extraction with blur detection and smart sampling."""
+import concurrent.futures
+import functools
 import json
 import logging
+import multiprocessing
+import os
+import queue
+import threading
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 import cv2
 import numpy as np
 
+from src.serialization import dump_json
+try:
+    import av
+    PYAV_AVAILABLE = True
+except ImportError:
+    PYAV_AVAILABLE = False
+    logging.warning("PyAV not available. Falling back to OpenCV seek-based decoding.")
+try:
+    import torch
+    import torchvision.io
+    NVJPEG_AVAILABLE = torch.cuda.is_available()
+except ImportError:
+    NVJPEG_AVAILABLE = False
+try:
+    from turbojpeg import TurboJPEG
+    TURBOJPEG_AVAILABLE = True
+except ImportError:
+    TURBOJPEG_AVAILABLE = False
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 
 logger = logging.getLogger(__name__)
 
+# Module built with CUDA support and a device present
+try:
+    CUDA_AVAILABLE = cv2.cuda.getCudaEnabledDeviceCount() > 0
+except Exception:
+    CUDA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _count_changed_pixels(a, b, threshold):
+        """Fused absdiff + threshold + count over two grayscale images.
+
+        One pass, no intermediate mask allocation; parallelized over rows.
+        """
+        height, width = a.shape
+        total = 0
+        for y in numba.prange(height):
+            row_count = 0
+            for x in range(width):
+                delta = int(a[y, x]) - int(b[y, x])
+                if delta < 0:
+                    delta = -delta
+                if delta > threshold:
+                    row_count += 1
+            total += row_count
+        return total
+
 
 class KeyframeExtractor:
     """Extract keyframes from video based on scene changes and content."""
@@ -33,6 +90,40 @@ class KeyframeExtractor:
         self.long_scene_threshold = long_scene_threshold
         self.long_scene_sample_interval = long_scene_sample_interval
         self.pixel_delta_threshold = pixel_delta_threshold
+
+        # JPEG encoding releases the GIL inside libjpeg, so offload writes
+        # to a thread pool and let the decode loop keep going.
+        self._io_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=os.cpu_count()
+        )
+        self._write_futures: List[concurrent.futures.Future] = []
+        # Filename prefix for keyframe files; scene workers set this to a
+        # scene-scoped value so parallel workers never collide on names.
+        self._frame_prefix = ""
+
+        # SIMD JPEG encoder for the CPU write path; most opencv-python
+        # wheels link plain libjpeg, which is 3-5x slower per frame.
+        self._turbojpeg = TurboJPEG() if TURBOJPEG_AVAILABLE else None
+
+        # CUDA Laplacian for blur scoring when OpenCV has a GPU backend;
+        # the filter and upload buffer are created once and reused.
+        self._gpu_laplacian = None
+        self._gpu_frame = None
+        if CUDA_AVAILABLE:
+            # ksize=1 selects the same [[0,1,0],[1,-4,1],[0,1,0]] aperture
+            # as the CPU and batch scorers (see _blur_score_small).
+            self._gpu_laplacian = cv2.cuda.createLaplacianFilter(
+                cv2.CV_8UC1, cv2.CV_16S, ksize=1
+            )
+            self._gpu_frame = cv2.cuda_GpuMat()
+
+        # Scratch buffers reused across change-detection calls so the hot
+        # loop does not malloc a diff and a mask per compared pair.
+        self._diff_buf = np.empty((360, 640), np.uint8)
+        self._mask_buf = np.empty((360, 640), np.uint8)
+
+        # Populated once extract()/iter_extract() completes.
+        self.last_result: Optional[Dict[str, Any]] = None
     
     def extract(
         self,
@@ -43,40 +134,289 @@ class KeyframeExtractor:
     ) -> Dict[str, Any]:
         """
         Extract keyframes from video based on scene data.
-        
+
         Args:
             video_path: Path to video file
             scenes_data: Scene detection results
             output_dir: Directory to save keyframes
             skip_if_exists: Skip if output already exists
-            
+
         Returns:
             Dictionary containing keyframe information
         """
+        for _ in self.iter_extract(video_path, scenes_data, output_dir, skip_if_exists):
+            pass
+        return self.last_result
+
+    def iter_extract(
+        self,
+        video_path: Path,
+        scenes_data: Dict[str, Any],
+        output_dir: Path,
+        skip_if_exists: bool = True
+    ):
+        """
+        Yield keyframe records as scenes finish extracting.
+
+        Lets a downstream consumer (OCR) start on the first scene while
+        later scenes are still decoding. The manifest is written once the
+        generator is exhausted; the full result dict is then available as
+        self.last_result.
+
+        Args:
+            video_path: Path to video file
+            scenes_data: Scene detection results
+            output_dir: Directory to save keyframes
+            skip_if_exists: Replay the existing manifest if present
+
+        Yields:
+            Keyframe metadata dictionaries, in frame-id order
+        """
         output_dir.mkdir(parents=True, exist_ok=True)
         keyframes_json_path = output_dir.parent / "keyframes.json"
-        
+
         # Check if already processed
         if skip_if_exists and keyframes_json_path.exists():
             logger.info(f"Keyframes already extracted at {keyframes_json_path}, skipping")
             with open(keyframes_json_path, 'r') as f:
-                return json.load(f)
-        
+                self.last_result = json.load(f)
+            yield from self.last_result["keyframes"]
+            return
+
         logger.info(f"Extracting keyframes from {video_path}")
+
+        # Prefer the PyAV path: one keyframe-aware seek per scene followed
+        # by sequential decode, instead of a GOP redecode per probed frame.
+        # VFR sources fall back to the OpenCV seek-based path, where frame
+        # numbers cannot be derived from timestamps reliably.
+        use_pyav = PYAV_AVAILABLE and not self._is_vfr(video_path)
+
+        # Scenes are independent once their bounds are known, so fan them
+        # out across a process pool. Each worker opens its own decoder
+        # (neither VideoCapture nor a PyAV container can be shared) and
+        # writes scene-scoped temp files; frame ids and final filenames
+        # are assigned deterministically once everything is collected.
+        scenes = scenes_data["scenes"]
+        worker = functools.partial(
+            _process_scene,
+            str(video_path),
+            cfg={
+                "blur_threshold": self.blur_threshold,
+                "long_scene_threshold": self.long_scene_threshold,
+                "long_scene_sample_interval": self.long_scene_sample_interval,
+                "pixel_delta_threshold": self.pixel_delta_threshold,
+            },
+            output_dir=output_dir,
+            use_pyav=use_pyav,
+        )
+
+        # Renumber in scene order and move temp files to their canonical
+        # names so output is byte-identical to a sequential run; records
+        # are yielded as soon as their scene completes (pool.map returns
+        # results lazily in submission order).
+        keyframes = []
+        if len(scenes) > 1:
+            max_workers = min(os.cpu_count() or 1, len(scenes))
+            # Spawn, not fork: the parent has already touched CUDA (the
+            # torch/cv2 capability probes at import, plus the ASR branch
+            # running in-process), and forked children cannot
+            # re-initialize it for their own GPU blur scoring or nvJPEG
+            # writes. Spawned workers start from a clean interpreter.
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+            ) as pool:
+                for scene_keyframes in pool.map(worker, scenes):
+                    for kf in scene_keyframes:
+                        keyframes.append(self._finalize_record(kf, len(keyframes), output_dir))
+                        yield keyframes[-1]
+        else:
+            for scene in scenes:
+                for kf in worker(scene):
+                    keyframes.append(self._finalize_record(kf, len(keyframes), output_dir))
+                    yield keyframes[-1]
+
+        result = {
+            "video_path": str(video_path),
+            "total_keyframes": len(keyframes),
+            "blur_threshold": self.blur_threshold,
+            # Structure-of-arrays view of the per-frame records so batch
+            # consumers (OCR) can index columns without walking dicts
+            "frame_ids": [kf["frame_id"] for kf in keyframes],
+            "timestamps_ms": [kf["timestamp_ms"] for kf in keyframes],
+            "paths": [kf["path"] for kf in keyframes],
+            "blur_scores": [kf["blur_score"] for kf in keyframes],
+            "keyframes": keyframes
+        }
         
-        # Open video
-        cap = cv2.VideoCapture(str(video_path))
+        # Save to JSON
+        dump_json(result, keyframes_json_path)
+
+        logger.info(f"Extracted {len(keyframes)} keyframes, saved to {keyframes_json_path}")
+
+        self.last_result = result
+
+    def _finalize_record(
+        self,
+        kf: Dict[str, Any],
+        frame_id: int,
+        output_dir: Path
+    ) -> Dict[str, Any]:
+        """Assign a record its global frame id and canonical filename."""
+        filename = f"frame_{frame_id:05d}.jpg"
+        filepath = output_dir / filename
+        os.replace(kf["path"], filepath)
+        kf["frame_id"] = frame_id
+        kf["filename"] = filename
+        kf["path"] = str(filepath)
+        return kf
+
+    def _is_vfr(self, video_path: Path) -> bool:
+        """Check whether the video has a variable frame rate."""
+        if not PYAV_AVAILABLE:
+            return False
+
+        with av.open(str(video_path)) as container:
+            stream = container.streams.video[0]
+            return (
+                stream.average_rate is not None
+                and stream.guessed_rate is not None
+                and stream.average_rate != stream.guessed_rate
+            )
+
+    def _extract_with_pyav(
+        self,
+        video_path: Path,
+        scenes_data: Dict[str, Any],
+        output_dir: Path
+    ) -> List[Dict[str, Any]]:
+        """Extract keyframes with PyAV: seek per scene, decode sequentially."""
+        container = av.open(str(video_path))
+        stream = container.streams.video[0]
+        stream.thread_type = "AUTO"
+        time_base = float(stream.time_base)
+        fps = float(stream.average_rate)
+
+        logger.info(f"Video: {fps:.2f} fps (PyAV sequential decode)")
+
+        keyframes = []
+        frame_id = 0
+
+        for scene in scenes_data["scenes"]:
+            scene_id = scene["scene_id"]
+            start_ms = scene["start_ms"]
+            end_ms = scene["end_ms"]
+            duration_s = scene["duration_ms"] / 1000.0
+
+            logger.info(f"Processing scene {scene_id}: {start_ms}ms - {end_ms}ms")
+
+            # Seek once to the nearest keyframe before the scene start
+            # (offset in AV_TIME_BASE microseconds), then pull frames
+            # sequentially from the same decoder for the whole scene.
+            container.seek(int(start_ms * 1000), backward=True)
+            decoder = container.decode(stream)
+
+            is_long_scene = duration_s > self.long_scene_threshold
+            sample_interval_ms = int(self.long_scene_sample_interval * 1000)
+            next_sample_ms = start_ms + sample_interval_ms
+            threshold_bits = self._hash_distance_bits()
+
+            found_first = False
+            probed = 0
+            last_small = None
+            last_hash = None
+
+            for av_frame in decoder:
+                if av_frame.pts is None:
+                    continue
+
+                timestamp_ms = int(av_frame.pts * time_base * 1000)
+                if timestamp_ms < start_ms:
+                    continue
+                if timestamp_ms >= end_ms and found_first:
+                    break
+
+                # First sharp frame: probe up to 10 frames after scene start
+                if not found_first:
+                    if probed >= 10:
+                        logger.warning(f"No sharp frame found for scene {scene_id}")
+                        found_first = True
+                        if not is_long_scene:
+                            break
+                        continue
+
+                    probed += 1
+                    frame = av_frame.to_ndarray(format='bgr24')
+                    small = self._prep(frame)
+                    blur_score = self._blur_score_small(small)
+
+                    if blur_score >= self.blur_threshold:
+                        frame_num = int(round((timestamp_ms / 1000.0) * fps))
+                        keyframes.append(self._save_keyframe(
+                            frame, frame_id, scene_id, timestamp_ms,
+                            frame_num, blur_score, output_dir
+                        ))
+                        frame_id += 1
+                        found_first = True
+                        last_small = small
+                        if not is_long_scene:
+                            break
+                    continue
+
+                # Long scenes: sample at regular intervals from the same
+                # decoder instead of reseeking.
+                if not is_long_scene or timestamp_ms < next_sample_ms:
+                    continue
+
+                next_sample_ms += sample_interval_ms
+                frame = av_frame.to_ndarray(format='bgr24')
+                small = self._prep(frame)
+
+                # Cheap perceptual-hash gate: skip near-duplicates of the
+                # last kept frame before paying for blur scoring
+                frame_hash = self._dhash(small)
+                if last_hash is not None and (frame_hash ^ last_hash).bit_count() < threshold_bits:
+                    continue
+
+                blur_score = self._blur_score_small(small)
+
+                content_changed = True
+                if last_small is not None:
+                    content_changed = self._thumbs_differ(last_small, small)
+
+                if blur_score >= self.blur_threshold and content_changed:
+                    frame_num = int(round((timestamp_ms / 1000.0) * fps))
+                    keyframes.append(self._save_keyframe(
+                        frame, frame_id, scene_id, timestamp_ms,
+                        frame_num, blur_score, output_dir
+                    ))
+                    frame_id += 1
+                    last_small = small
+                    last_hash = frame_hash
+
+        container.close()
+
+        return keyframes
+
+    def _extract_with_opencv(
+        self,
+        video_path: Path,
+        scenes_data: Dict[str, Any],
+        output_dir: Path
+    ) -> List[Dict[str, Any]]:
+        """Extract keyframes with OpenCV seek-based decoding (VFR fallback)."""
+        cap = self._open_capture(video_path)
         if not cap.isOpened():
             raise ValueError(f"Could not open video: {video_path}")
-        
+
         fps = cap.get(cv2.CAP_PROP_FPS)
         total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        
+
         logger.info(f"Video: {fps:.2f} fps, {total_frames} frames")
-        
+
         keyframes = []
         frame_id = 0
-        
+
         # Process each scene
         for scene in scenes_data["scenes"]:
             scene_id = scene["scene_id"]
@@ -84,18 +424,18 @@ class KeyframeExtractor:
             end_ms = scene["end_ms"]
             duration_ms = scene["duration_ms"]
             duration_s = duration_ms / 1000.0
-            
+
             logger.info(f"Processing scene {scene_id}: {start_ms}ms - {end_ms}ms")
-            
+
             # Extract first sharp frame after scene start
             first_frame = self._extract_first_sharp_frame(
                 cap, start_ms, fps, output_dir, frame_id, scene_id
             )
-            
+
             if first_frame:
                 keyframes.append(first_frame)
                 frame_id += 1
-            
+
             # For long scenes, extract additional keyframes
             if duration_s > self.long_scene_threshold:
                 additional_frames = self._extract_long_scene_frames(
@@ -103,24 +443,91 @@ class KeyframeExtractor:
                 )
                 keyframes.extend(additional_frames)
                 frame_id += len(additional_frames)
-        
+
         cap.release()
-        
-        result = {
-            "video_path": str(video_path),
-            "total_keyframes": len(keyframes),
-            "blur_threshold": self.blur_threshold,
-            "keyframes": keyframes
+
+        return keyframes
+
+    @staticmethod
+    def _open_capture(video_path: Path) -> cv2.VideoCapture:
+        """Open a video, requesting hardware-accelerated decode.
+
+        VIDEO_ACCELERATION_ANY lets FFmpeg pick whatever decoder the host
+        exposes (NVDEC, QSV, VAAPI, ...) and falls back to software
+        transparently, so this is free on CPU-only machines and offloads
+        H.264/H.265 decode entirely on GPU hosts.
+        """
+        cap = cv2.VideoCapture(
+            str(video_path),
+            cv2.CAP_FFMPEG,
+            [
+                cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY,
+                cv2.CAP_PROP_HW_DEVICE, 0,
+            ]
+        )
+        if not cap.isOpened():
+            # Some builds reject the open-params form; retry plain.
+            cap = cv2.VideoCapture(str(video_path))
+        return cap
+
+    def _save_keyframe(
+        self,
+        frame: np.ndarray,
+        frame_id: int,
+        scene_id: int,
+        timestamp_ms: int,
+        frame_num: int,
+        blur_score: float,
+        output_dir: Path
+    ) -> Dict[str, Any]:
+        """Queue a keyframe write to disk and return its metadata record."""
+        filename = f"{self._frame_prefix}frame_{frame_id:05d}.jpg"
+        filepath = output_dir / filename
+        if NVJPEG_AVAILABLE:
+            self._write_futures.append(self._io_pool.submit(
+                self._write_jpeg_gpu, str(filepath), frame.copy()
+            ))
+        elif self._turbojpeg is not None:
+            self._write_futures.append(self._io_pool.submit(
+                self._write_jpeg_turbo, str(filepath), frame.copy()
+            ))
+        else:
+            self._write_futures.append(self._io_pool.submit(
+                cv2.imwrite, str(filepath), frame.copy(),
+                [cv2.IMWRITE_JPEG_QUALITY, 95]
+            ))
+
+        return {
+            "frame_id": frame_id,
+            "scene_id": scene_id,
+            "timestamp_ms": timestamp_ms,
+            "frame_number": frame_num,
+            "filename": filename,
+            "path": str(filepath),
+            "blur_score": float(blur_score),
+            "width": frame.shape[1],
+            "height": frame.shape[0]
         }
-        
-        # Save to JSON
-        with open(keyframes_json_path, 'w') as f:
-            json.dump(result, f, indent=2)
-        
-        logger.info(f"Extracted {len(keyframes)} keyframes, saved to {keyframes_json_path}")
-        
-        return result
-    
+
+    def _write_jpeg_turbo(self, filepath: str, frame: np.ndarray) -> None:
+        """Encode a BGR frame with libjpeg-turbo and write the bytes."""
+        data = self._turbojpeg.encode(frame, quality=95)
+        with open(filepath, 'wb') as f:
+            f.write(data)
+
+    @staticmethod
+    def _write_jpeg_gpu(filepath: str, frame: np.ndarray) -> None:
+        """Encode a BGR frame with nvJPEG on GPU and write the bytes."""
+        # BGR HWC -> RGB CHW uint8 on device; encode_jpeg dispatches to
+        # nvJPEG for CUDA tensors, so the raw frame never round-trips
+        # through libjpeg on the CPU.
+        tensor = torch.from_numpy(
+            np.ascontiguousarray(frame[:, :, ::-1])
+        ).permute(2, 0, 1).cuda()
+        encoded = torchvision.io.encode_jpeg(tensor, quality=95)
+        with open(filepath, 'wb') as f:
+            f.write(encoded.cpu().numpy().tobytes())
+
     def _extract_first_sharp_frame(
         self,
         cap: cv2.VideoCapture,
@@ -132,38 +539,32 @@ class KeyframeExtractor:
     ) -> Optional[Dict[str, Any]]:
         """Extract first sharp frame after scene start."""
         start_frame = int((start_ms / 1000.0) * fps)
-        
-        # Try up to 10 frames after scene start
+
+        # Collect up to 10 candidate frames after scene start, then score
+        # the whole batch in one vectorized pass instead of one Laplacian
+        # call per frame.
+        candidates = []
         for offset in range(10):
             frame_num = start_frame + offset
             cap.set(cv2.CAP_PROP_POS_FRAMES, frame_num)
             ret, frame = cap.read()
-            
+
             if not ret:
                 continue
-            
-            # Check blur
-            blur_score = self._calculate_blur_score(frame)
-            
-            if blur_score >= self.blur_threshold:
-                # Save keyframe
-                timestamp_ms = int((frame_num / fps) * 1000)
-                filename = f"frame_{frame_id:05d}.jpg"
-                filepath = output_dir / filename
-                cv2.imwrite(str(filepath), frame, [cv2.IMWRITE_JPEG_QUALITY, 95])
-                
-                return {
-                    "frame_id": frame_id,
-                    "scene_id": scene_id,
-                    "timestamp_ms": timestamp_ms,
-                    "frame_number": frame_num,
-                    "filename": filename,
-                    "path": str(filepath),
-                    "blur_score": float(blur_score),
-                    "width": frame.shape[1],
-                    "height": frame.shape[0]
-                }
-        
+
+            candidates.append((frame_num, frame))
+
+        if candidates:
+            scores = self._calculate_blur_scores([frame for _, frame in candidates])
+
+            for (frame_num, frame), blur_score in zip(candidates, scores):
+                if blur_score >= self.blur_threshold:
+                    timestamp_ms = int((frame_num / fps) * 1000)
+                    return self._save_keyframe(
+                        frame, frame_id, scene_id, timestamp_ms,
+                        frame_num, blur_score, output_dir
+                    )
+
         logger.warning(f"No sharp frame found for scene {scene_id}")
         return None
     
@@ -180,79 +581,331 @@ class KeyframeExtractor:
         """Extract additional frames from long scenes."""
         keyframes = []
         frame_id = start_frame_id
-        
-        # Sample at regular intervals
-        current_ms = start_ms + int(self.long_scene_sample_interval * 1000)
-        last_frame = None
-        
-        while current_ms < end_ms:
-            frame_num = int((current_ms / 1000.0) * fps)
-            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_num)
-            ret, frame = cap.read()
-            
-            if not ret:
-                current_ms += int(self.long_scene_sample_interval * 1000)
+        threshold_bits = self._hash_distance_bits()
+        interval_ms = int(self.long_scene_sample_interval * 1000)
+
+        # Precompute the full sample schedule as one vectorized arange,
+        # seek once, then decode forward monotonically instead of one
+        # random seek (and GOP redecode) plus per-iteration arithmetic
+        # per sample.
+        targets = np.arange(
+            start_ms + interval_ms, end_ms, interval_ms, dtype=np.int64
+        )
+        if targets.size == 0:
+            return keyframes
+
+        # Map the schedule from milliseconds to frame numbers so the scan
+        # can run on cheap frame arithmetic instead of POS_MSEC queries.
+        target_frames = np.unique(
+            np.rint(targets * (fps / 1000.0)).astype(np.int64)
+        ).tolist()
+
+        cap.set(cv2.CAP_PROP_POS_MSEC, start_ms)
+        last_small = None
+        last_hash = None
+
+        # Pipeline the scan: a reader thread decodes ahead into a bounded
+        # queue while this thread scores frames, and accepted frames go to
+        # the write pool. Decode, Laplacian, and JPEG encode all overlap
+        # instead of blocking each other serially; the small maxsize gives
+        # back-pressure so the reader cannot run away from compute.
+        #
+        # Off-schedule frames are advanced with grab(), which skips the
+        # YUV->BGR conversion and decoder copy; only frames on the sample
+        # schedule pay for retrieve().
+        frame_queue: queue.Queue = queue.Queue(maxsize=8)
+        stop_event = threading.Event()
+
+        def read_frames():
+            idx = 0
+            frame_num = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+            while idx < len(target_frames) and not stop_event.is_set():
+                if not cap.grab():
+                    break
+                if frame_num < target_frames[idx]:
+                    frame_num += 1
+                    continue
+
+                ok, frame = cap.retrieve()
+                if not ok:
+                    break
+
+                # Consume every target this frame has reached or passed
+                while idx < len(target_frames) and frame_num >= target_frames[idx]:
+                    idx += 1
+
+                current_ms = int((frame_num / fps) * 1000)
+                frame_queue.put((current_ms, frame))
+                frame_num += 1
+            frame_queue.put(None)
+
+        reader = threading.Thread(target=read_frames)
+        reader.start()
+
+        while True:
+            item = frame_queue.get()
+            if item is None:
+                break
+
+            current_ms, frame = item
+            small = self._prep(frame)
+
+            # Cheap perceptual-hash gate: skip near-duplicates of the last
+            # kept frame before paying for blur scoring
+            frame_hash = self._dhash(small)
+            if last_hash is not None and (frame_hash ^ last_hash).bit_count() < threshold_bits:
                 continue
-            
+
             # Check blur
-            blur_score = self._calculate_blur_score(frame)
-            
-            # Check if content changed significantly from last frame
+            blur_score = self._blur_score_small(small)
+
+            # Check if content changed significantly from last kept frame;
+            # its working copy is cached so only this frame is converted
             content_changed = True
-            if last_frame is not None:
-                content_changed = self._has_significant_change(last_frame, frame)
-            
+            if last_small is not None:
+                content_changed = self._thumbs_differ(last_small, small)
+
             if blur_score >= self.blur_threshold and content_changed:
-                # Save keyframe
-                filename = f"frame_{frame_id:05d}.jpg"
-                filepath = output_dir / filename
-                cv2.imwrite(str(filepath), frame, [cv2.IMWRITE_JPEG_QUALITY, 95])
-                
-                keyframes.append({
-                    "frame_id": frame_id,
-                    "scene_id": scene_id,
-                    "timestamp_ms": current_ms,
-                    "frame_number": frame_num,
-                    "filename": filename,
-                    "path": str(filepath),
-                    "blur_score": float(blur_score),
-                    "width": frame.shape[1],
-                    "height": frame.shape[0]
-                })
-                
+                frame_num = int((current_ms / 1000.0) * fps)
+                keyframes.append(self._save_keyframe(
+                    frame, frame_id, scene_id, current_ms,
+                    frame_num, blur_score, output_dir
+                ))
+
                 frame_id += 1
-                last_frame = frame.copy()
-            
-            current_ms += int(self.long_scene_sample_interval * 1000)
-        
+                last_small = small
+                last_hash = frame_hash
+
+        # Unblock the reader if it is waiting on a full queue, then drain
+        # whatever it had prefetched so join() cannot deadlock.
+        stop_event.set()
+        while True:
+            try:
+                if frame_queue.get_nowait() is None:
+                    break
+            except queue.Empty:
+                break
+        reader.join()
+
         return keyframes
     
+    @staticmethod
+    def _prep(frame: np.ndarray) -> np.ndarray:
+        """Build the downscaled grayscale working copy of a frame.
+
+        Blur scoring, the dHash gate and change detection all share this
+        one 640x360 single-channel image, so each frame is converted and
+        resized exactly once instead of once per check on the full-HD
+        original.
+        """
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return cv2.resize(gray, (640, 360), interpolation=cv2.INTER_AREA)
+
     def _calculate_blur_score(self, frame: np.ndarray) -> float:
         """Calculate blur score using Laplacian variance."""
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        laplacian = cv2.Laplacian(gray, cv2.CV_64F)
-        variance = laplacian.var()
-        return variance
+        return self._blur_score_small(self._prep(frame))
+
+    def _blur_score_small(self, small: np.ndarray) -> float:
+        """Laplacian variance of a prepped grayscale image."""
+        if self._gpu_laplacian is not None:
+            # Run the filter in the existing CUDA context so the CPU stays
+            # free for decode and I/O; variance comes from the device-side
+            # sum/sqSum reductions (var = E[x^2] - E[x]^2).
+            self._gpu_frame.upload(small)
+            laplacian = self._gpu_laplacian.apply(self._gpu_frame)
+            count = small.shape[0] * small.shape[1]
+            mean = cv2.cuda.sum(laplacian)[0] / count
+            return cv2.cuda.sqrSum(laplacian)[0] / count - mean * mean
+
+        # CV_16S writes 2 bytes per pixel vs 8 for CV_64F — the kernel is
+        # memory-bound, and intermediate precision is irrelevant for a
+        # variance. meanStdDev is one SIMD pass vs NumPy's two-pass .var().
+        #
+        # ksize=1 is the [[0,1,0],[1,-4,1],[0,1,0]] aperture — the same
+        # stencil as _calculate_blur_scores and the CUDA filter, and the
+        # scale blur_threshold was calibrated against. The ksize=3 kernel
+        # produces variances ~16x larger, so mixing them makes the paths
+        # accept/reject on incompatible scales.
+        laplacian = cv2.Laplacian(small, cv2.CV_16S, ksize=1)
+        _, stddev = cv2.meanStdDev(laplacian)
+        return float(stddev[0][0]) ** 2
+
+    def _calculate_blur_scores(self, frames: List[np.ndarray]) -> np.ndarray:
+        """Calculate blur scores for a batch of frames in one pass.
+
+        Stacks prepped grayscale frames into an (N, H, W) tensor and
+        applies the 3x3 Laplacian stencil with NumPy broadcasting, so the
+        whole batch is scored with a handful of SIMD-vectorized array ops
+        instead of one filter call per frame.
+        """
+        gray = np.stack(
+            [self._prep(frame) for frame in frames]
+        ).astype(np.float32)
+
+        # 3x3 Laplacian stencil [[0,1,0],[1,-4,1],[0,1,0]] over the interior
+        laplacian = (
+            gray[:, :-2, 1:-1] + gray[:, 2:, 1:-1]
+            + gray[:, 1:-1, :-2] + gray[:, 1:-1, 2:]
+            - 4.0 * gray[:, 1:-1, 1:-1]
+        )
+
+        return laplacian.reshape(len(frames), -1).var(axis=1)
     
+    def _dhash(self, gray: np.ndarray) -> int:
+        """Compute a 64-bit difference hash (dHash) for a grayscale image."""
+        small = cv2.resize(gray, (9, 8))
+        diff = small[:, 1:] > small[:, :-1]
+        return int.from_bytes(np.packbits(diff.flatten()).tobytes(), 'big')
+
+    def _hash_distance_bits(self) -> int:
+        """Minimum dHash Hamming distance for a frame to count as new."""
+        return max(1, int(self.pixel_delta_threshold * 64))
+
     def _has_significant_change(self, frame1: np.ndarray, frame2: np.ndarray) -> bool:
         """Check if two frames have significant visual difference."""
-        # Resize for faster comparison
-        small1 = cv2.resize(frame1, (320, 180))
-        small2 = cv2.resize(frame2, (320, 180))
-        
-        # Calculate absolute difference
-        diff = cv2.absdiff(small1, small2)
-        
-        # Count changed pixels
+        return self._thumbs_differ(self._prep(frame1), self._prep(frame2))
+
+    def _thumbs_differ(self, small1: np.ndarray, small2: np.ndarray) -> bool:
+        """Compare two grayscale thumbnails for significant change."""
         threshold = 30  # Pixel difference threshold
-        changed_pixels = np.sum(diff > threshold)
-        total_pixels = small1.shape[0] * small1.shape[1] * small1.shape[2]
-        
-        change_ratio = changed_pixels / total_pixels
-        
+
+        if NUMBA_AVAILABLE:
+            # JIT kernel fuses absdiff + threshold + count into one pass
+            # with no intermediate buffers at all.
+            changed_pixels = _count_changed_pixels(small1, small2, threshold)
+        else:
+            # absdiff, threshold and countNonZero all run on OpenCV's SIMD
+            # intrinsics with no Python-level boolean temporary, writing
+            # into the preallocated scratch buffers.
+            if self._diff_buf.shape != small1.shape:
+                self._diff_buf = np.empty_like(small1)
+                self._mask_buf = np.empty_like(small1)
+            cv2.absdiff(small1, small2, dst=self._diff_buf)
+            cv2.threshold(
+                self._diff_buf, threshold, 1, cv2.THRESH_BINARY,
+                dst=self._mask_buf
+            )
+            changed_pixels = cv2.countNonZero(self._mask_buf)
+
+        change_ratio = changed_pixels / small1.size
+
         return change_ratio >= self.pixel_delta_threshold
 
 
+def _process_scene(
+    video_path: str,
+    scene: Dict[str, Any],
+    cfg: Dict[str, Any],
+    output_dir: Path,
+    use_pyav: bool
+) -> List[Dict[str, Any]]:
+    """Extract the keyframes for a single scene in a worker process.
+
+    Builds a private extractor with its own decoder, and caps OpenCV's
+    internal parallel_for_ at one thread so pool workers do not
+    oversubscribe the physical cores.
+    """
+    # The thread cap and affinity re-pin are process-wide and permanent,
+    # so apply them only in actual pool workers (which exit afterwards).
+    # The single-scene fallback runs this function inline in the parent
+    # pipeline process, where they would throttle OpenCV for the rest of
+    # the run and undo the GPU-feeder pinning from _partition_cpus.
+    if multiprocessing.parent_process() is not None:
+        cv2.setNumThreads(1)
+        # If the pipeline pinned the parent to the GPU-feeder cores, move
+        # this CPU-bound worker onto the reserved worker cores instead.
+        worker_cpus = os.environ.get('PIPELINE_WORKER_CPUS')
+        if worker_cpus and hasattr(os, 'sched_setaffinity'):
+            try:
+                os.sched_setaffinity(0, {int(c) for c in worker_cpus.split(',')})
+            except (OSError, ValueError):
+                pass
+    extractor = KeyframeExtractor(**cfg)
+    # Scene-scoped temp names keep concurrent workers collision-free; the
+    # parent renames to canonical frame numbers after collection.
+    extractor._frame_prefix = f"s{scene['scene_id']:04d}_"
+    scene_data = {"scenes": [scene]}
+    try:
+        if use_pyav:
+            keyframes = extractor._extract_with_pyav(
+                Path(video_path), scene_data, output_dir
+            )
+        else:
+            keyframes = extractor._extract_with_opencv(
+                Path(video_path), scene_data, output_dir
+            )
+        # result() re-raises any encode/write exception here, at the
+        # point of failure, instead of leaving a record that points at a
+        # file that was never written.
+        for future in extractor._write_futures:
+            future.result()
+    finally:
+        extractor._io_pool.shutdown(wait=True)
+    return keyframes
+
+
+def iter_keyframe_batches(
+    keyframes_data: Dict[str, Any],
+    batch_size: int = 16
+):
+    """
+    Yield keyframes in batches with images pre-read on a thread pool.
+
+    Args:
+        keyframes_data: Keyframe extraction results
+        batch_size: Number of images per batch
+
+    Yields:
+        Tuples of (keyframe records, decoded BGR images) so batch OCR can
+        run one GPU call per batch instead of one per frame
+    """
+    keyframes = keyframes_data["keyframes"]
+
+    with concurrent.futures.ThreadPoolExecutor() as pool:
+        for i in range(0, len(keyframes), batch_size):
+            batch = keyframes[i:i + batch_size]
+            images = list(pool.map(
+                lambda kf: cv2.imread(kf["path"]), batch
+            ))
+            yield batch, images
+
+
+def iter_stream_batches(
+    records,
+    batch_size: int = 16
+):
+    """
+    Batch streamed keyframe records with images pre-read on a thread pool.
+
+    Same contract as iter_keyframe_batches, but fed by an iterator (e.g.
+    iter_extract) instead of a completed manifest, so batches form as the
+    extractor produces records.
+
+    Args:
+        records: Iterable of keyframe metadata dictionaries
+        batch_size: Number of images per batch
+
+    Yields:
+        Tuples of (keyframe records, decoded BGR images)
+    """
+    with concurrent.futures.ThreadPoolExecutor() as pool:
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                images = list(pool.map(
+                    lambda kf: cv2.imread(kf["path"]), batch
+                ))
+                yield batch, images
+                batch = []
+
+        if batch:
+            images = list(pool.map(
+                lambda kf: cv2.imread(kf["path"]), batch
+            ))
+            yield batch, images
+
+
 def extract_keyframes(
     video_path: Path,
     scenes_data: Dict[str, Any],
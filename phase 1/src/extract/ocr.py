@@ -6,6 +6,9 @@ from typing import Dict, Any, List, Optional, Tuple
 import cv2
 import numpy as np
 import easyocr
+
+from src.extract.keyframes import iter_keyframe_batches, iter_stream_batches
+from src.serialization import dumps_bytes
 try:
     import layoutparser as lp
     LAYOUTPARSER_AVAILABLE = True
@@ -17,32 +20,59 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+def dhash(image: np.ndarray, size: int = 8) -> int:
+    """Compute a difference hash for a BGR image.
+
+    The gradient-sign fingerprint is robust to compression noise and
+    small exposure shifts, so near-identical slide frames hash within a
+    few bits of each other.
+
+    Args:
+        image: BGR image array
+        size: Hash edge length in bits (default 8 -> 64-bit hash)
+
+    Returns:
+        Packed hash as an int
+    """
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(gray, (size + 1, size), interpolation=cv2.INTER_AREA)
+    bits = small[:, 1:] > small[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
 class OCRProcessor:
     """Process keyframes with OCR and layout analysis."""
-    
+
+    # Max dHash Hamming distance (bits) for a frame to count as a
+    # near-duplicate of the last OCR'd frame in its scene.
+    DUP_HASH_DISTANCE = 5
+
     def __init__(
         self,
         lang: str = "en",
         use_gpu: bool = True,
         conf_threshold: float = 0.5,
         layout_model: Optional[str] = None,
-        layout_conf_threshold: float = 0.5
+        layout_conf_threshold: float = 0.5,
+        batch_size: int = 16
     ):
         """
         Initialize OCR processor.
-        
+
         Args:
             lang: OCR language
             use_gpu: Whether to use GPU for OCR
             conf_threshold: Confidence threshold for OCR results
             layout_model: LayoutParser model name
             layout_conf_threshold: Confidence threshold for layout detection
+            batch_size: Number of keyframes per OCR inference batch
         """
         self.lang = lang
         self.use_gpu = use_gpu
         self.conf_threshold = conf_threshold
         self.layout_model_name = layout_model
         self.layout_conf_threshold = layout_conf_threshold
+        self.batch_size = batch_size
         
         # Initialize EasyOCR
         logger.info("Initializing EasyOCR...")
@@ -50,13 +80,14 @@ class OCRProcessor:
         
         # Initialize LayoutParser if available
         self.layout_model = None
+        self.layout_label_map = {0: "Text", 1: "Title", 2: "List", 3: "Table", 4: "Figure"}
         if LAYOUTPARSER_AVAILABLE and layout_model:
             try:
                 logger.info(f"Initializing LayoutParser with model: {layout_model}")
                 self.layout_model = lp.Detectron2LayoutModel(
                     layout_model,
                     extra_config=["MODEL.ROI_HEADS.SCORE_THRESH_TEST", layout_conf_threshold],
-                    label_map={0: "Text", 1: "Title", 2: "List", 3: "Table", 4: "Figure"}
+                    label_map=self.layout_label_map
                 )
             except Exception as e:
                 logger.warning(f"Could not load LayoutParser model: {e}")
@@ -87,69 +118,200 @@ class OCRProcessor:
             with open(ocr_json_path, 'r') as f:
                 return json.load(f)
         
-        logger.info(f"Processing {len(keyframes_data['keyframes'])} keyframes with OCR")
-        
-        ocr_results = []
-        
-        for i, keyframe in enumerate(keyframes_data['keyframes']):
-            frame_path = Path(keyframe['path'])
-            
-            if not frame_path.exists():
-                logger.warning(f"Keyframe not found: {frame_path}")
-                continue
-            
-            logger.info(f"Processing keyframe {i+1}/{len(keyframes_data['keyframes'])}: {frame_path.name}")
-            
-            # Process single keyframe
-            result = self._process_keyframe(
-                frame_path,
-                keyframe['frame_id'],
-                keyframe['timestamp_ms'],
-                keyframe['scene_id']
+        total = len(keyframes_data['keyframes'])
+        logger.info(f"Processing {total} keyframes with OCR (batch size {self.batch_size})")
+
+        return self._process_batches(
+            iter_keyframe_batches(keyframes_data, self.batch_size),
+            total,
+            ocr_json_path
+        )
+
+    def process_stream(
+        self,
+        keyframe_records,
+        output_dir: Path,
+        skip_if_exists: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Process keyframes with OCR as they stream from the extractor.
+
+        Args:
+            keyframe_records: Iterator of keyframe metadata dictionaries
+                (e.g. KeyframeExtractor.iter_extract output)
+            output_dir: Directory containing keyframes
+            skip_if_exists: Skip if output already exists
+
+        Returns:
+            Summary dictionary (same shape as process())
+        """
+        ocr_json_path = output_dir.parent / "ocr.json"
+
+        if skip_if_exists and ocr_json_path.exists():
+            logger.info(f"OCR results already exist at {ocr_json_path}, skipping")
+            # Drain the stream so the producer still finishes (and writes
+            # its own manifest) even though OCR is cached.
+            for _ in keyframe_records:
+                pass
+            with open(ocr_json_path, 'r') as f:
+                return json.load(f)
+
+        logger.info(f"Processing streamed keyframes with OCR (batch size {self.batch_size})")
+
+        return self._process_batches(
+            iter_stream_batches(keyframe_records, self.batch_size),
+            None,
+            ocr_json_path
+        )
+
+    def _process_batches(
+        self,
+        batches,
+        total: Optional[int],
+        ocr_json_path: Path
+    ) -> Dict[str, Any]:
+        """Run OCR over pre-read image batches, streaming results to disk."""
+        total_label = total if total is not None else '?'
+        layout_model_name = self.layout_model_name if self.layout_model else None
+        processed = 0
+        total_blocks = 0
+        reused = 0
+        # Last OCR'd fingerprint and result per scene; near-duplicate
+        # frames (slide unchanged) reuse the prior result instead of
+        # paying for another detector+recognizer pass.
+        last_hash_per_scene: Dict[int, Tuple[int, Dict[str, Any]]] = {}
+
+        # Results are streamed straight into the JSON array as each frame
+        # finishes, so memory stays flat instead of holding every
+        # polygon/full_text for the whole video until the final write.
+        with open(ocr_json_path, 'wb') as f:
+            f.write(
+                b'{"ocr_lang": ' + dumps_bytes(self.lang)
+                + b', "conf_threshold": ' + dumps_bytes(self.conf_threshold)
+                + b', "layout_model": ' + dumps_bytes(layout_model_name)
+                + b', "results": ['
             )
-            
-            ocr_results.append(result)
-        
-        # Prepare final output
-        output = {
-            "total_keyframes": len(ocr_results),
+
+            # Images are pre-read on a thread pool so decode overlaps GPU
+            # inference, and each batch goes through the recognizer in a
+            # single forward pass instead of one launch per frame.
+            for batch, images in batches:
+                valid = []
+                for keyframe, image in zip(batch, images):
+                    if image is None:
+                        logger.warning(f"Keyframe not found: {keyframe['path']}")
+                        continue
+                    valid.append((keyframe, image))
+
+                if not valid:
+                    continue
+
+                # Hash each frame and short-circuit near-duplicates of
+                # the last OCR'd frame in the same scene (slide didn't
+                # change); only the remainder goes through inference.
+                plans = []
+                to_ocr = []
+                for keyframe, image in valid:
+                    frame_hash = dhash(image)
+                    prev = last_hash_per_scene.get(keyframe['scene_id'])
+                    if prev is not None and (frame_hash ^ prev[0]).bit_count() <= self.DUP_HASH_DISTANCE:
+                        plans.append((keyframe, image, frame_hash, prev[1]))
+                    else:
+                        plans.append((keyframe, image, frame_hash, None))
+                        to_ocr.append(image)
+
+                if to_ocr:
+                    batch_detections = self.ocr.readtext_batched(
+                        to_ocr, batch_size=len(to_ocr)
+                    )
+                    if self.layout_model is not None:
+                        # One BGR->RGB pass per frame, shared by both
+                        # layout paths; EasyOCR keeps the BGR original
+                        # (its input handling converts internally).
+                        batch_layouts = self._run_layout_detection_batch([
+                            cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+                            for image in to_ocr
+                        ])
+                    else:
+                        batch_layouts = [[] for _ in to_ocr]
+                else:
+                    batch_detections = []
+                    batch_layouts = []
+
+                inference_results = iter(zip(batch_detections, batch_layouts))
+                for keyframe, image, frame_hash, prior_result in plans:
+                    logger.info(f"Processing keyframe {processed + 1}/{total_label}: {keyframe['filename']}")
+
+                    if prior_result is not None:
+                        # Visually unchanged since the last OCR'd frame
+                        # in this scene: copy its text with this frame's
+                        # identity instead of re-running OCR.
+                        result = dict(prior_result)
+                        result.update(
+                            frame_id=keyframe['frame_id'],
+                            timestamp_ms=keyframe['timestamp_ms'],
+                            image_path=str(keyframe['path'])
+                        )
+                        reused += 1
+                    else:
+                        detections, layout_regions = next(inference_results)
+                        result = self._process_keyframe(
+                            image,
+                            detections,
+                            layout_regions,
+                            keyframe['frame_id'],
+                            keyframe['timestamp_ms'],
+                            keyframe['scene_id'],
+                            keyframe['path']
+                        )
+                        last_hash_per_scene[keyframe['scene_id']] = (frame_hash, result)
+
+                    if processed:
+                        f.write(b',')
+                    f.write(dumps_bytes(result))
+                    processed += 1
+                    total_blocks += result['total_blocks']
+
+            f.write(
+                b'], "total_keyframes": ' + str(processed).encode()
+                + b', "total_blocks": ' + str(total_blocks).encode() + b'}'
+            )
+
+        logger.info(
+            f"OCR processing complete ({reused} near-duplicate frames reused). "
+            f"Results saved to {ocr_json_path}"
+        )
+
+        # Return the summary only; the full per-frame records live in
+        # ocr.json for downstream stages.
+        return {
+            "total_keyframes": processed,
             "ocr_lang": self.lang,
             "conf_threshold": self.conf_threshold,
-            "layout_model": self.layout_model_name if self.layout_model else None,
-            "results": ocr_results
+            "layout_model": layout_model_name,
+            "total_blocks": total_blocks,
+            "results_path": str(ocr_json_path)
         }
-        
-        # Save to JSON
-        with open(ocr_json_path, 'w') as f:
-            json.dump(output, f, indent=2)
-        
-        logger.info(f"OCR processing complete. Results saved to {ocr_json_path}")
-        
-        return output
     
     def _process_keyframe(
         self,
-        frame_path: Path,
+        image: np.ndarray,
+        detections: List,
+        layout_regions: List[Dict[str, Any]],
         frame_id: int,
         timestamp_ms: int,
-        scene_id: int
+        scene_id: int,
+        frame_path: str
     ) -> Dict[str, Any]:
-        """Process a single keyframe."""
-        # Read image
-        image = cv2.imread(str(frame_path))
+        """Assemble the OCR result for a single keyframe."""
         height, width = image.shape[:2]
-        
-        # Run OCR
-        ocr_blocks = self._run_ocr(image)
-        
-        # Run layout detection if available
-        layout_regions = []
-        if self.layout_model is not None:
-            layout_regions = self._run_layout_detection(image)
-        
+
+        # Decode OCR detections from the batched pass
+        ocr_blocks = self._decode_ocr_result(detections)
+
         # Merge text blocks with layout regions
         full_text = self._extract_full_text(ocr_blocks)
-        
+
         return {
             "frame_id": frame_id,
             "timestamp_ms": timestamp_ms,
@@ -163,54 +325,106 @@ class OCRProcessor:
             "total_blocks": len(ocr_blocks),
             "total_regions": len(layout_regions)
         }
-    
-    def _run_ocr(self, image: np.ndarray) -> List[Dict[str, Any]]:
-        """Run EasyOCR on image."""
-        result = self.ocr.readtext(image)
-        
-        if not result:
+
+    def _decode_ocr_result(self, result: List) -> List[Dict[str, Any]]:
+        """Convert EasyOCR detections for one image into text blocks."""
+        # Skip low confidence results up front
+        kept = [d for d in result if d[2] >= self.conf_threshold]
+        if not kept:
             return []
-        
-        text_blocks = []
-        
-        for detection in result:
-            # EasyOCR format: (bbox, text, confidence)
-            bbox = detection[0]  # 4 points [[x1,y1], [x2,y2], [x3,y3], [x4,y4]]
-            text = detection[1]
-            conf = detection[2]
-            
-            # Skip low confidence results
-            if conf < self.conf_threshold:
-                continue
-            
-            # Convert bbox to simpler format [x_min, y_min, x_max, y_max]
-            x_coords = [float(point[0]) for point in bbox]
-            y_coords = [float(point[1]) for point in bbox]
-            bbox_simple = [
-                float(min(x_coords)),
-                float(min(y_coords)),
-                float(max(x_coords)),
-                float(max(y_coords))
-            ]
-            
-            # Convert bbox_polygon to list of lists with native Python floats
-            bbox_polygon = [[float(point[0]), float(point[1])] for point in bbox]
-            
-            text_blocks.append({
-                "text": text,
-                "bbox": bbox_simple,
-                "bbox_polygon": bbox_polygon,
-                "confidence": float(conf)
-            })
-        
-        return text_blocks
+
+        # Stack all polygons into one (N, 4, 2) array so the min/max
+        # reductions and float conversions run vectorized instead of three
+        # Python comprehensions (plus per-value float casts) per box.
+        polys = np.asarray([d[0] for d in kept], dtype=np.float32)
+        mins = polys.min(axis=1)  # (N, 2) of [x_min, y_min]
+        maxs = polys.max(axis=1)  # (N, 2) of [x_max, y_max]
+        bboxes = np.concatenate([mins, maxs], axis=1).tolist()
+        polygons = polys.tolist()
+
+        return [
+            {
+                "text": detection[1],
+                "bbox": bbox,
+                "bbox_polygon": polygon,
+                "confidence": float(detection[2])
+            }
+            for detection, bbox, polygon in zip(kept, bboxes, polygons)
+        ]
     
-    def _run_layout_detection(self, image: np.ndarray) -> List[Dict[str, Any]]:
-        """Run LayoutParser layout detection."""
+    def _run_layout_detection_batch(
+        self,
+        images_rgb: List[np.ndarray]
+    ) -> List[List[Dict[str, Any]]]:
+        """Run layout detection for a batch of RGB keyframe images.
+
+        On GPU the batch goes through the underlying Detectron2 module in
+        one forward pass — a list of {"image", "height", "width"} dicts is
+        its native batched input — instead of one launch per image. CPU
+        runs keep the per-image path.
+        """
+        if self.layout_model is None:
+            return [[] for _ in images_rgb]
+
+        if self.use_gpu:
+            try:
+                import torch
+
+                predictor = self.layout_model.model
+                net = predictor.model
+                inputs = []
+                for image_rgb in images_rgb:
+                    height, width = image_rgb.shape[:2]
+                    # Mirror DefaultPredictor's preprocessing: channel
+                    # order per cfg.INPUT.FORMAT, then the
+                    # ResizeShortestEdge test augmentation — otherwise
+                    # the raw module sees full-resolution frames in the
+                    # wrong channel order and detections silently
+                    # degrade relative to the per-image path.
+                    if predictor.input_format == "BGR":
+                        image = image_rgb[:, :, ::-1]
+                    else:
+                        image = image_rgb
+                    image = predictor.aug.get_transform(image).apply_image(image)
+                    inputs.append({
+                        "image": torch.as_tensor(
+                            image.astype("float32").transpose(2, 0, 1)
+                        ),
+                        "height": height,
+                        "width": width
+                    })
+
+                with torch.no_grad():
+                    outputs = net(inputs)
+
+                batch_regions = []
+                for output in outputs:
+                    instances = output["instances"].to("cpu")
+                    regions = []
+                    for box, score, cls in zip(
+                        instances.pred_boxes.tensor.tolist(),
+                        instances.scores.tolist(),
+                        instances.pred_classes.tolist()
+                    ):
+                        if score < self.layout_conf_threshold:
+                            continue
+                        regions.append({
+                            "type": self.layout_label_map.get(int(cls), str(cls)),
+                            "bbox": [float(v) for v in box],
+                            "confidence": float(score)
+                        })
+                    batch_regions.append(regions)
+
+                return batch_regions
+
+            except Exception as e:
+                logger.warning(f"Batched layout detection failed: {e}")
+
+        return [self._run_layout_detection(image_rgb) for image_rgb in images_rgb]
+
+    def _run_layout_detection(self, image_rgb: np.ndarray) -> List[Dict[str, Any]]:
+        """Run LayoutParser layout detection on an RGB image."""
         try:
-            # Convert BGR to RGB for layoutparser
-            image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-            
             # Detect layout
             layout = self.layout_model.detect(image_rgb)
             
@@ -237,17 +451,16 @@ class OCRProcessor:
         """Extract full text from OCR blocks in reading order."""
         if not text_blocks:
             return ""
-        
-        # Sort blocks by vertical position (top to bottom), then horizontal (left to right)
-        sorted_blocks = sorted(
-            text_blocks,
-            key=lambda b: (b['bbox'][1], b['bbox'][0])  # y_min, then x_min
-        )
-        
-        # Join text with spaces
-        full_text = " ".join(block['text'] for block in sorted_blocks)
-        
-        return full_text
+
+        # Sort by vertical position (top to bottom), then horizontal (left
+        # to right). np.lexsort keeps the comparisons in C instead of one
+        # Python-level key call per block.
+        count = len(text_blocks)
+        ys = np.fromiter((b['bbox'][1] for b in text_blocks), np.float32, count)
+        xs = np.fromiter((b['bbox'][0] for b in text_blocks), np.float32, count)
+        order = np.lexsort((xs, ys))  # y_min is the primary key
+
+        return " ".join(text_blocks[i]['text'] for i in order)
 
 
 def process_ocr(
@@ -258,11 +471,12 @@ def process_ocr(
     conf_threshold: float = 0.5,
     layout_model: Optional[str] = None,
     layout_conf_threshold: float = 0.5,
+    batch_size: int = 16,
     skip_if_exists: bool = True
 ) -> Dict[str, Any]:
     """
     Convenience function to process OCR.
-    
+
     Args:
         keyframes_data: Keyframe extraction results
         output_dir: Directory containing keyframes
@@ -271,8 +485,9 @@ def process_ocr(
         conf_threshold: OCR confidence threshold
         layout_model: LayoutParser model name
         layout_conf_threshold: Layout confidence threshold
+        batch_size: Number of keyframes per OCR inference batch
         skip_if_exists: Skip if output exists
-        
+
     Returns:
         Dictionary containing OCR results
     """
@@ -281,6 +496,7 @@ def process_ocr(
         use_gpu,
         conf_threshold,
         layout_model,
-        layout_conf_threshold
+        layout_conf_threshold,
+        batch_size
     )
     return processor.process(keyframes_data, output_dir, skip_if_exists)
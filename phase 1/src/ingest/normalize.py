@@ -1,5 +1,8 @@
 """Media normalization using ffmpeg."""
+import concurrent.futures
 import logging
+import os
+import shutil
 from pathlib import Path
 from typing import Dict, Any, Optional
 import ffmpeg
@@ -7,6 +10,28 @@ import ffmpeg
 
 logger = logging.getLogger(__name__)
 
+# On NVIDIA hosts the whole decode -> fps -> encode chain can run on the
+# GPU (NVDEC + NVENC), freeing the CPU for the concurrent audio job.
+# FORCE_SW_CODEC=1 forces the software x264 path.
+NVENC_AVAILABLE = (
+    shutil.which('nvidia-smi') is not None
+    and os.environ.get('FORCE_SW_CODEC') != '1'
+)
+
+
+def _ffmpeg_cmd():
+    """ffmpeg launcher, pinned to the worker cores when partitioned.
+
+    When the pipeline has reserved cores 0-1 for GPU feeder threads
+    (PIPELINE_WORKER_CPUS, see pipeline._partition_cpus), ffmpeg
+    subprocesses are started under taskset on the remaining cores so
+    encode work cannot starve the feeder threads.
+    """
+    cpus = os.environ.get('PIPELINE_WORKER_CPUS')
+    if cpus and shutil.which('taskset'):
+        return ['taskset', '-c', cpus, 'ffmpeg']
+    return 'ffmpeg'
+
 
 class MediaNormalizer:
     """Normalize video and audio files using ffmpeg."""
@@ -51,16 +76,29 @@ class MediaNormalizer:
                 "video_path": str(video_out_path)
             }
         
-        # Extract and normalize audio
-        if not (skip_if_exists and audio_path.exists()):
-            logger.info(f"Extracting audio to {audio_path}")
-            self._extract_audio(video_path, audio_path, audio_sample_rate, audio_channels)
-        
-        # Normalize video
-        if not (skip_if_exists and video_out_path.exists()):
-            logger.info(f"Normalizing video to {video_out_path}")
-            self._normalize_video(video_path, video_out_path, video_fps, video_codec, video_preset)
-        
+        # Audio extraction and video normalization are independent ffmpeg
+        # processes over the same (read-only) input, so run them
+        # concurrently; each thread just blocks on its subprocess.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            futures = []
+
+            if not (skip_if_exists and audio_path.exists()):
+                logger.info(f"Extracting audio to {audio_path}")
+                futures.append(executor.submit(
+                    self._extract_audio,
+                    video_path, audio_path, audio_sample_rate, audio_channels
+                ))
+
+            if not (skip_if_exists and video_out_path.exists()):
+                logger.info(f"Normalizing video to {video_out_path}")
+                futures.append(executor.submit(
+                    self._normalize_video,
+                    video_path, video_out_path, video_fps, video_codec, video_preset
+                ))
+
+            for future in futures:
+                future.result()
+
         return {
             "audio_path": str(audio_path),
             "video_path": str(video_out_path)
@@ -85,8 +123,9 @@ class MediaNormalizer:
                     ar=sample_rate,
                     loglevel='error'
                 )
+                .global_args('-threads', '0')
                 .overwrite_output()
-                .run(capture_stdout=True, capture_stderr=True)
+                .run(cmd=_ffmpeg_cmd(), capture_stdout=True, capture_stderr=True)
             )
             logger.info(f"Audio extracted successfully: {audio_path}")
         except ffmpeg.Error as e:
@@ -103,8 +142,22 @@ class MediaNormalizer:
     ):
         """Normalize video to constant framerate MP4."""
         try:
-            input_stream = ffmpeg.input(str(input_path))
-            
+            input_kwargs: Dict[str, Any] = {'hwaccel': 'auto'}
+            if NVENC_AVAILABLE and codec == 'libx264':
+                # Full GPU path: NVDEC decode, frames stay in CUDA memory
+                # and feed NVENC directly, no host round-trip. p4 is the
+                # NVENC quality/speed midpoint, analogous to x264 medium.
+                codec = 'h264_nvenc'
+                preset = 'p4'
+                input_kwargs = {
+                    'hwaccel': 'cuda',
+                    'hwaccel_output_format': 'cuda'
+                }
+                logger.info("Using NVENC hardware encoding for video normalization")
+            # hwaccel=auto lets ffmpeg use NVDEC/VAAPI for the decode side
+            # where available, falling back to software transparently.
+            input_stream = ffmpeg.input(str(input_path), **input_kwargs)
+
             # Build output options
             output_opts = {
                 'vcodec': codec,
@@ -123,8 +176,9 @@ class MediaNormalizer:
             (
                 input_stream
                 .output(str(output_path), **output_opts)
+                .global_args('-threads', '0', '-filter_threads', '0')
                 .overwrite_output()
-                .run(capture_stdout=True, capture_stderr=True)
+                .run(cmd=_ffmpeg_cmd(), capture_stdout=True, capture_stderr=True)
             )
             logger.info(f"Video normalized successfully: {output_path}")
         except ffmpeg.Error as e:
@@ -150,11 +204,14 @@ class MediaNormalizer:
             }
             
             if video_stream:
+                # r_frame_rate is a "num/den" string; parse it directly
+                # rather than eval()-ing ffprobe output.
+                num, _, den = video_stream.get('r_frame_rate', '0/1').partition('/')
                 info['video'] = {
                     'codec': video_stream.get('codec_name'),
                     'width': video_stream.get('width'),
                     'height': video_stream.get('height'),
-                    'fps': eval(video_stream.get('r_frame_rate', '0/1')),
+                    'fps': float(num) / float(den or 1),
                     'bitrate': video_stream.get('bit_rate')
                 }
             
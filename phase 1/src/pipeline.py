@@ -1,5 +1,10 @@
 """Main pipeline orchestrator for video processing."""
+import concurrent.futures
 import logging
+import os
+import queue
+import shutil
+import threading
 import time
 from pathlib import Path
 from typing import Dict, Any, Optional
@@ -8,8 +13,8 @@ from src.ingest.downloader import download_video
 from src.ingest.normalize import normalize_media
 from src.extract.asr import process_asr
 from src.extract.scenes import detect_scenes
-from src.extract.keyframes import extract_keyframes
-from src.extract.ocr import process_ocr
+from src.extract.keyframes import KeyframeExtractor
+from src.extract.ocr import OCRProcessor
 
 
 # Configure logging
@@ -19,6 +24,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+SEP = "=" * 80
+
+
+def _banner(title: str) -> None:
+    """Log a stage banner as a single record."""
+    logger.info("\n%s\n%s\n%s", SEP, title, SEP)
+
 
 class VideoPipeline:
     """Complete video processing pipeline."""
@@ -33,182 +45,94 @@ class VideoPipeline:
         Returns:
             Dictionary containing all pipeline outputs and timing information
         """
-        logger.info("=" * 80)
-        logger.info("Starting Video Processing Pipeline")
-        logger.info("=" * 80)
-        logger.info(f"Video URL: {self.config.video_url}")
-        logger.info(f"Video ID: {self.config.video_id}")
-        logger.info(f"Output directory: {self.config.paths.get_video_dir(self.config.video_id)}")
-        logger.info("=" * 80)
+        _banner("Starting Video Processing Pipeline")
+        logger.info("Video URL: %s", self.config.video_url)
+        logger.info("Video ID: %s", self.config.video_id)
+        logger.info("Output directory: %s", self.config.paths.get_video_dir(self.config.video_id))
+        logger.info("%s", SEP)
         
         # Ensure directories exist
         self.config.ensure_directories()
-        
+
+        self._partition_cpus()
+
         pipeline_start = time.time()
         results = {}
         timings = {}
         
         # Stage 1: Download video and metadata
-        logger.info("\n" + "=" * 80)
-        logger.info("STAGE 1: Download Video and Metadata")
-        logger.info("=" * 80)
-        stage_start = time.time()
-        try:
-            download_result = download_video(
-                self.config.video_url,
-                self.config.paths.get_source_dir(self.config.video_id),
-                skip_if_exists=self.config.skip_existing
-            )
-            results['download'] = download_result
-            timings['download'] = time.time() - stage_start
-            logger.info(f"✓ Download complete in {timings['download']:.2f}s")
-        except Exception as e:
-            logger.error(f"✗ Download failed: {e}")
-            raise
-        
+        _banner("STAGE 1: Download Video and Metadata")
+        download_result = self._run_stage(
+            'download', 'Download', results, timings,
+            download_video,
+            self.config.video_url,
+            self.config.paths.get_source_dir(self.config.video_id),
+            skip_if_exists=self.config.skip_existing
+        )
+
         # Stage 2: Normalize media
-        logger.info("\n" + "=" * 80)
-        logger.info("STAGE 2: Normalize Media")
-        logger.info("=" * 80)
-        stage_start = time.time()
-        try:
-            normalize_result = normalize_media(
-                Path(download_result['video_path']),
-                self.config.paths.get_normalized_dir(self.config.video_id),
-                audio_sample_rate=self.config.models.audio_sample_rate,
-                audio_channels=self.config.models.audio_channels,
-                video_fps=self.config.models.video_fps,
-                video_codec=self.config.models.video_codec,
-                video_preset=self.config.models.video_preset,
-                skip_if_exists=self.config.skip_existing
-            )
-            results['normalize'] = normalize_result
-            timings['normalize'] = time.time() - stage_start
-            logger.info(f"✓ Normalization complete in {timings['normalize']:.2f}s")
-        except Exception as e:
-            logger.error(f"✗ Normalization failed: {e}")
-            raise
-        
-        # Stage 3: ASR with word-level timestamps
-        logger.info("\n" + "=" * 80)
-        logger.info("STAGE 3: ASR Processing")
-        logger.info("=" * 80)
-        stage_start = time.time()
-        try:
-            asr_result = process_asr(
-                Path(normalize_result['audio_path']),
-                self.config.paths.get_video_dir(self.config.video_id),
-                model_size=self.config.models.whisper_model,
-                device=self.config.models.whisper_device,
-                compute_type=self.config.models.whisper_compute_type,
-                batch_size=self.config.models.whisperx_batch_size,
-                align=self.config.models.whisperx_align,
-                diarize=self.config.models.whisperx_diarize,
-                skip_if_exists=self.config.skip_existing
-            )
-            results['asr'] = asr_result
-            timings['asr'] = time.time() - stage_start
-            logger.info(f"✓ ASR complete in {timings['asr']:.2f}s")
-            logger.info(f"  - Segments: {len(asr_result['segments'])}")
-            logger.info(f"  - Language: {asr_result.get('language', 'unknown')}")
-        except Exception as e:
-            logger.error(f"✗ ASR failed: {e}")
-            raise
+        _banner("STAGE 2: Normalize Media")
+        normalize_result = self._run_stage(
+            'normalize', 'Normalization', results, timings,
+            normalize_media,
+            Path(download_result['video_path']),
+            self.config.paths.get_normalized_dir(self.config.video_id),
+            audio_sample_rate=self.config.models.audio_sample_rate,
+            audio_channels=self.config.models.audio_channels,
+            video_fps=self.config.models.video_fps,
+            video_codec=self.config.models.video_codec,
+            video_preset=self.config.models.video_preset,
+            skip_if_exists=self.config.skip_existing
+        )
         
-        # Stage 4: Scene detection
-        logger.info("\n" + "=" * 80)
-        logger.info("STAGE 4: Scene Detection")
-        logger.info("=" * 80)
-        stage_start = time.time()
-        try:
-            scenes_result = detect_scenes(
-                Path(normalize_result['video_path']),
-                self.config.paths.get_video_dir(self.config.video_id),
-                threshold=self.config.models.scene_threshold,
-                min_scene_len=self.config.models.min_scene_len,
-                skip_if_exists=self.config.skip_existing
+        # Stages 3-6: The audio branch (ASR) and the video branch
+        # (scenes -> keyframes -> OCR) are independent, so run them
+        # concurrently. ASR keeps the GPU busy while scene detection and
+        # keyframe extraction run CPU-bound ffmpeg/OpenCV work; the
+        # wall-clock cost collapses to the slower of the two branches.
+        _banner("STAGES 3-6: ASR (audio branch) || Scenes + Keyframes + OCR (video branch)")
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            audio_future = executor.submit(
+                self._run_audio_branch, normalize_result, results, timings
             )
-            results['scenes'] = scenes_result
-            timings['scenes'] = time.time() - stage_start
-            logger.info(f"✓ Scene detection complete in {timings['scenes']:.2f}s")
-            logger.info(f"  - Scenes detected: {scenes_result['total_scenes']}")
-        except Exception as e:
-            logger.error(f"✗ Scene detection failed: {e}")
-            raise
-        
-        # Stage 5: Keyframe extraction
-        logger.info("\n" + "=" * 80)
-        logger.info("STAGE 5: Keyframe Extraction")
-        logger.info("=" * 80)
-        stage_start = time.time()
-        try:
-            keyframes_result = extract_keyframes(
-                Path(normalize_result['video_path']),
-                scenes_result,
-                self.config.paths.get_keyframes_dir(self.config.video_id),
-                blur_threshold=self.config.models.blur_threshold,
-                long_scene_threshold=self.config.models.long_scene_threshold,
-                long_scene_sample_interval=self.config.models.long_scene_sample_interval,
-                pixel_delta_threshold=self.config.models.pixel_delta_threshold,
-                skip_if_exists=self.config.skip_existing
+            video_future = executor.submit(
+                self._run_video_branch, normalize_result, results, timings
             )
-            results['keyframes'] = keyframes_result
-            timings['keyframes'] = time.time() - stage_start
-            logger.info(f"✓ Keyframe extraction complete in {timings['keyframes']:.2f}s")
-            logger.info(f"  - Keyframes extracted: {keyframes_result['total_keyframes']}")
-        except Exception as e:
-            logger.error(f"✗ Keyframe extraction failed: {e}")
-            raise
-        
-        # Stage 6: OCR and layout parsing
-        logger.info("\n" + "=" * 80)
-        logger.info("STAGE 6: OCR and Layout Parsing")
-        logger.info("=" * 80)
-        stage_start = time.time()
-        try:
-            ocr_result = process_ocr(
-                keyframes_result,
-                self.config.paths.get_keyframes_dir(self.config.video_id),
-                lang=self.config.models.ocr_lang,
-                use_gpu=self.config.models.ocr_use_gpu,
-                conf_threshold=self.config.models.ocr_conf_threshold,
-                layout_model=self.config.models.layout_model,
-                layout_conf_threshold=self.config.models.layout_conf_threshold,
-                skip_if_exists=self.config.skip_existing
+
+            done, _ = concurrent.futures.wait(
+                [audio_future, video_future],
+                return_when=concurrent.futures.ALL_COMPLETED
             )
-            results['ocr'] = ocr_result
-            timings['ocr'] = time.time() - stage_start
-            logger.info(f"✓ OCR complete in {timings['ocr']:.2f}s")
-            logger.info(f"  - Keyframes processed: {ocr_result['total_keyframes']}")
-            total_blocks = sum(r['total_blocks'] for r in ocr_result['results'])
-            logger.info(f"  - Total text blocks: {total_blocks}")
-        except Exception as e:
-            logger.error(f"✗ OCR failed: {e}")
-            raise
+
+            # Surface the first branch failure (if any) after both settle
+            for future in done:
+                future.result()
         
         # Pipeline complete
         total_time = time.time() - pipeline_start
         timings['total'] = total_time
         
-        logger.info("\n" + "=" * 80)
-        logger.info("PIPELINE COMPLETE")
-        logger.info("=" * 80)
-        logger.info(f"Total time: {total_time:.2f}s")
-        logger.info("\nStage Timings:")
-        for stage, duration in timings.items():
-            if stage != 'total':
-                percentage = (duration / total_time) * 100
-                logger.info(f"  {stage:15s}: {duration:7.2f}s ({percentage:5.1f}%)")
-        
-        logger.info("\nOutput Summary:")
-        logger.info(f"  ASR segments:    {len(results['asr']['segments'])}")
-        logger.info(f"  Scenes:          {results['scenes']['total_scenes']}")
-        logger.info(f"  Keyframes:       {results['keyframes']['total_keyframes']}")
-        logger.info(f"  OCR text blocks: {sum(r['total_blocks'] for r in results['ocr']['results'])}")
-        
         output_dir = self.config.paths.get_video_dir(self.config.video_id)
-        logger.info(f"\nAll artifacts saved to: {output_dir}")
-        logger.info("=" * 80)
+
+        # Build the summary strings only when INFO is actually emitted
+        if logger.isEnabledFor(logging.INFO):
+            _banner("PIPELINE COMPLETE")
+            logger.info("Total time: %.2fs", total_time)
+            logger.info("\nStage Timings:")
+            for stage, duration in timings.items():
+                if stage != 'total':
+                    percentage = (duration / total_time) * 100
+                    logger.info("  %-15s: %7.2fs (%5.1f%%)", stage, duration, percentage)
+
+            logger.info("\nOutput Summary:")
+            logger.info("  ASR segments:    %d", len(results['asr']['segments']))
+            logger.info("  Scenes:          %d", results['scenes']['total_scenes'])
+            logger.info("  Keyframes:       %d", results['keyframes']['total_keyframes'])
+            logger.info("  OCR text blocks: %d", self._count_ocr_blocks(results['ocr']))
+
+            logger.info("\nAll artifacts saved to: %s", output_dir)
+            logger.info("%s", SEP)
         
         return {
             'results': results,
@@ -216,6 +140,223 @@ class VideoPipeline:
             'output_dir': str(output_dir)
         }
 
+    @staticmethod
+    def _partition_cpus() -> None:
+        """Reserve two cores for GPU feeder threads on multi-core hosts.
+
+        CPU-heavy subprocesses (ffmpeg, keyframe workers) otherwise run
+        on all cores and starve the threads streaming batches to the
+        GPU during ASR/OCR. The main process is pinned to cores 0-1 with
+        capped BLAS/torch thread counts; ffmpeg and the keyframe pool
+        re-pin themselves to the remaining cores via
+        PIPELINE_WORKER_CPUS (see normalize.py and keyframes.py).
+
+        Only applies on GPU hosts: on CPU-only machines the in-process
+        inference stages need every core themselves, so partitioning is
+        pure loss there. PIPELINE_NO_CPU_PARTITION=1 opts out entirely.
+        """
+        if not hasattr(os, 'sched_setaffinity'):
+            return  # non-Linux host
+        if os.environ.get('PIPELINE_NO_CPU_PARTITION'):
+            return  # explicit opt-out
+        total = os.cpu_count() or 0
+        if total < 4:
+            return  # not enough cores to partition usefully
+        try:
+            import torch
+            has_gpu = torch.cuda.is_available()
+        except ImportError:
+            has_gpu = shutil.which('nvidia-smi') is not None
+        if not has_gpu:
+            return  # nothing to feed; leave all cores to the workers
+
+        gpu_cpus = {0, 1}
+        worker_cpus = sorted(set(range(total)) - gpu_cpus)
+        try:
+            os.sched_setaffinity(0, gpu_cpus)
+        except OSError as e:
+            logger.warning("Could not set CPU affinity: %s", e)
+            return
+
+        os.environ.setdefault('OMP_NUM_THREADS', '2')
+        os.environ['PIPELINE_WORKER_CPUS'] = ','.join(map(str, worker_cpus))
+        try:
+            import torch
+            torch.set_num_threads(2)
+        except ImportError:
+            pass
+
+        logger.info(
+            "CPU partition: cores 0-1 feed the GPU, cores %s run ffmpeg/keyframe workers",
+            os.environ['PIPELINE_WORKER_CPUS']
+        )
+
+    def _run_stage(
+        self,
+        name: str,
+        label: str,
+        results: Dict[str, Any],
+        timings: Dict[str, float],
+        fn,
+        *args,
+        **kwargs
+    ) -> Any:
+        """Run one pipeline stage, recording its result and wall time.
+
+        The timer runs inside the calling worker, so per-stage timings
+        stay accurate even when branches overlap.
+        """
+        stage_start = time.time()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            logger.error("✗ %s failed: %s", label, e)
+            raise
+
+        results[name] = result
+        timings[name] = time.time() - stage_start
+        logger.info("✓ %s complete in %.2fs", label, timings[name])
+        return result
+
+    @staticmethod
+    def _count_ocr_blocks(ocr_result: Dict[str, Any]) -> int:
+        """Total text blocks from an OCR summary (or a legacy full dump)."""
+        total_blocks = ocr_result.get('total_blocks')
+        if total_blocks is None:
+            total_blocks = sum(
+                r['total_blocks'] for r in ocr_result.get('results', [])
+            )
+        return total_blocks
+
+    def _run_audio_branch(
+        self,
+        normalize_result: Dict[str, str],
+        results: Dict[str, Any],
+        timings: Dict[str, float]
+    ) -> None:
+        """Run the audio branch: ASR with word-level timestamps."""
+        asr_result = self._run_stage(
+            'asr', 'ASR', results, timings,
+            process_asr,
+            Path(normalize_result['audio_path']),
+            self.config.paths.get_video_dir(self.config.video_id),
+            model_size=self.config.models.whisper_model,
+            device=self.config.models.whisper_device,
+            compute_type=self.config.models.whisper_compute_type,
+            batch_size=self.config.models.whisperx_batch_size,
+            align=self.config.models.whisperx_align,
+            diarize=self.config.models.whisperx_diarize,
+            skip_if_exists=self.config.skip_existing
+        )
+        logger.info("  - Segments: %d", len(asr_result['segments']))
+        logger.info("  - Language: %s", asr_result.get('language', 'unknown'))
+
+    def _run_video_branch(
+        self,
+        normalize_result: Dict[str, str],
+        results: Dict[str, Any],
+        timings: Dict[str, float]
+    ) -> None:
+        """Run the video branch: scene detection, keyframes, then OCR."""
+        scenes_result = self._run_stage(
+            'scenes', 'Scene detection', results, timings,
+            detect_scenes,
+            Path(normalize_result['video_path']),
+            self.config.paths.get_video_dir(self.config.video_id),
+            threshold=self.config.models.scene_threshold,
+            min_scene_len=self.config.models.min_scene_len,
+            skip_if_exists=self.config.skip_existing
+        )
+        logger.info("  - Scenes detected: %d", scenes_result['total_scenes'])
+
+        keyframes_result, ocr_result = self._run_stage(
+            'keyframes+ocr', 'Keyframes + OCR', results, timings,
+            self._stream_keyframes_to_ocr,
+            Path(normalize_result['video_path']),
+            scenes_result
+        )
+        # Re-key the combined stage result under its component names
+        del results['keyframes+ocr']
+        results['keyframes'] = keyframes_result
+        results['ocr'] = ocr_result
+        logger.info("  - Keyframes extracted: %d", keyframes_result['total_keyframes'])
+        logger.info("  - Keyframes processed: %d", ocr_result['total_keyframes'])
+        logger.info("  - Total text blocks: %d", self._count_ocr_blocks(ocr_result))
+
+    def _stream_keyframes_to_ocr(
+        self,
+        video_path: Path,
+        scenes_result: Dict[str, Any]
+    ) -> tuple:
+        """Run keyframe extraction and OCR as an overlapped stream.
+
+        Keyframe records flow through a bounded queue from a producer
+        thread into the batched OCR consumer, so GPU inference starts on
+        the first scene instead of waiting for the last keyframe to hit
+        disk. Stage 5+6 wall time collapses toward max(keyframes, ocr).
+        """
+        keyframes_dir = self.config.paths.get_keyframes_dir(self.config.video_id)
+
+        extractor = KeyframeExtractor(
+            blur_threshold=self.config.models.blur_threshold,
+            long_scene_threshold=self.config.models.long_scene_threshold,
+            long_scene_sample_interval=self.config.models.long_scene_sample_interval,
+            pixel_delta_threshold=self.config.models.pixel_delta_threshold
+        )
+        ocr_processor = OCRProcessor(
+            lang=self.config.models.ocr_lang,
+            use_gpu=self.config.models.ocr_use_gpu,
+            conf_threshold=self.config.models.ocr_conf_threshold,
+            layout_model=self.config.models.layout_model,
+            layout_conf_threshold=self.config.models.layout_conf_threshold,
+            batch_size=self.config.models.ocr_batch_size
+        )
+
+        record_queue: queue.Queue = queue.Queue(maxsize=16)
+
+        def produce():
+            try:
+                for record in extractor.iter_extract(
+                    video_path,
+                    scenes_result,
+                    keyframes_dir,
+                    skip_if_exists=self.config.skip_existing
+                ):
+                    record_queue.put(record)
+            except BaseException as e:
+                record_queue.put(e)
+            else:
+                record_queue.put(None)
+
+        def streamed_records():
+            while True:
+                item = record_queue.get()
+                if item is None:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+        try:
+            ocr_result = ocr_processor.process_stream(
+                streamed_records(),
+                keyframes_dir,
+                skip_if_exists=self.config.skip_existing
+            )
+        finally:
+            # If the consumer bailed early, keep draining so a producer
+            # blocked on a full queue can finish and be joined.
+            while producer.is_alive():
+                try:
+                    record_queue.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            producer.join()
+
+        return extractor.last_result, ocr_result
+
 
 def run_pipeline(
     video_url: str,
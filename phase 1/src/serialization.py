@@ -0,0 +1,51 @@
+"""JSON serialization helpers for pipeline artifacts."""
+import json
+import logging
+from pathlib import Path
+from typing import Any
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    logging.warning("orjson not available. Falling back to stdlib json writes.")
+
+
+logger = logging.getLogger(__name__)
+
+
+def dump_json(data: Any, path: Path) -> None:
+    """
+    Write data as compact JSON.
+
+    Uses orjson (C-backed, SIMD) when available; hot-path artifact writes
+    are unindented because downstream stages only ever parse them.
+
+    Args:
+        data: JSON-serializable object
+        path: Destination file path
+    """
+    if ORJSON_AVAILABLE:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(path, 'w') as f:
+            json.dump(data, f)
+
+
+def dumps_bytes(data: Any) -> bytes:
+    """
+    Serialize data to compact JSON bytes.
+
+    Used by stages that stream large documents to disk piecewise instead
+    of materializing them in memory first.
+
+    Args:
+        data: JSON-serializable object
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(data).encode()
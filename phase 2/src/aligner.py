@@ -3,7 +3,7 @@ import logging
 from typing import List
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
 
 from src.chunker import Chunk
 
@@ -26,46 +26,66 @@ class SlideSpeechAligner:
     def align(self) -> List[Chunk]:
         """Compute alignment scores and create merged text."""
         logger.info("Computing slide-speech alignment scores")
-        
-        for chunk in self.chunks:
-            self._align_chunk(chunk)
-        
+
+        scores = self._compute_alignment_scores()
+        for chunk, score in zip(self.chunks, scores):
+            chunk.alignment_score = score
+            chunk.merged_text = self._create_merged_text(chunk)
+
         logger.info(f"Aligned {len(self.chunks)} chunks")
         return self.chunks
-    
-    def _align_chunk(self, chunk: Chunk):
-        """Compute alignment for a single chunk."""
-        # Handle empty cases
-        if not chunk.asr_text and not chunk.ocr_text:
-            chunk.alignment_score = 0.0
-            chunk.merged_text = ""
-            return
-        
-        if not chunk.asr_text:
-            chunk.alignment_score = 0.0
-            chunk.merged_text = f"[ON SCREEN] {chunk.ocr_text}"
-            return
-        
-        if not chunk.ocr_text:
-            chunk.alignment_score = 0.0
-            chunk.merged_text = f"[SPOKEN] {chunk.asr_text}"
-            return
-        
-        # Compute TF-IDF vectors
+
+    def _compute_alignment_scores(self) -> List[float]:
+        """Compute cosine similarity between ASR and OCR text per chunk.
+
+        The vectorizer is fit once over all chunk texts instead of per
+        chunk, so IDF weights come from the whole video and the expensive
+        tokenize/fit work runs a single time. Chunks missing either side
+        score 0.0 without touching the matrix.
+        """
+        scores = [0.0] * len(self.chunks)
+
+        # Chunks where either text is very short (<3 tokens) produce
+        # degenerate TF-IDF cosines anyway; score them with a direct
+        # token-set Jaccard and keep them out of the sparse matrix.
+        tfidf_indices = []
+        for i, chunk in enumerate(self.chunks):
+            if not chunk.asr_text or not chunk.ocr_text:
+                continue
+            n_asr = chunk.asr_text.count(' ') + 1
+            n_ocr = chunk.ocr_text.count(' ') + 1
+            if min(n_asr, n_ocr) < 3:
+                asr_tokens = set(chunk.asr_text.lower().split())
+                ocr_tokens = set(chunk.ocr_text.lower().split())
+                union = asr_tokens | ocr_tokens
+                if union:
+                    scores[i] = len(asr_tokens & ocr_tokens) / len(union)
+                continue
+            tfidf_indices.append(i)
+
+        if not tfidf_indices:
+            return scores
+
+        corpus = [self.chunks[i].asr_text for i in tfidf_indices]
+        corpus += [self.chunks[i].ocr_text for i in tfidf_indices]
+
         try:
-            texts = [chunk.asr_text, chunk.ocr_text]
-            tfidf_matrix = self.vectorizer.fit_transform(texts)
-            
-            # Compute cosine similarity
-            similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-            chunk.alignment_score = float(similarity)
-        
+            tfidf_matrix = self.vectorizer.fit_transform(corpus)
         except Exception as e:
-            logger.warning(f"Failed to compute alignment for chunk {chunk.chunk_id}: {e}")
-            chunk.alignment_score = 0.0
-        
-        # Create merged text
-        chunk.merged_text = self._create_merged_text(chunk)
+            # e.g. every remaining text is stop-word-only
+            logger.warning(f"Failed to compute alignment scores: {e}")
+            return scores
+
+        m = len(tfidf_indices)
+        asr_vecs = normalize(tfidf_matrix[:m], copy=False)
+        ocr_vecs = normalize(tfidf_matrix[m:], copy=False)
+
+        for row, i in enumerate(tfidf_indices):
+            # Rows are unit-normalized, so the cosine similarity is the
+            # sparse dot product of the paired rows.
+            scores[i] = float(asr_vecs[row].multiply(ocr_vecs[row]).sum())
+
+        return scores
     
     def _create_merged_text(self, chunk: Chunk) -> str:
         """Create merged text from ASR and OCR."""
@@ -1,7 +1,9 @@
 """Hierarchical chunking: Chapter -> Scene with merge/split rules."""
 import logging
+from collections import defaultdict
 from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+import numpy as np
 
 from src.loader import VideoData, ASRSegment, Scene, Keyframe, OCRResult
 from src.config import ChunkingConfig
@@ -10,7 +12,7 @@ from src.config import ChunkingConfig
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class Chunk:
     """A multimodal chunk."""
     chunk_id: str
@@ -45,16 +47,37 @@ class Chunk:
     alignment_score: float = 0.0
     completeness: Dict[str, bool] = None
     provenance: Dict[str, Any] = None
-    
+
+    # Embeddings (to be filled by embedder)
+    text_embedding: Optional[np.ndarray] = None
+    image_embedding: Optional[np.ndarray] = None
+
+    # Lazily built to_dict payload; any field write invalidates it
+    _cached_dict: Optional[Dict[str, Any]] = field(
+        default=None, repr=False, compare=False
+    )
+
     def __post_init__(self):
         if self.completeness is None:
             self.completeness = {}
         if self.provenance is None:
             self.provenance = {}
-    
+
+    def __setattr__(self, name: str, value: Any):
+        if name != '_cached_dict':
+            object.__setattr__(self, '_cached_dict', None)
+        object.__setattr__(self, name, value)
+
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary."""
-        return {
+        """Convert to dictionary.
+
+        The dict is built once and cached; the JSON export and the
+        vector-store upsert both call this, and rebuilding every field
+        for 500 chunks with long transcripts is pure allocation churn.
+        """
+        if self._cached_dict is not None:
+            return self._cached_dict
+        self._cached_dict = {
             "chunk_id": self.chunk_id,
             "video_id": self.video_id,
             "source": self.source,
@@ -75,6 +98,7 @@ class Chunk:
             "completeness": self.completeness,
             "provenance": self.provenance
         }
+        return self._cached_dict
 
 
 class HierarchicalChunker:
@@ -84,83 +108,131 @@ class HierarchicalChunker:
         self.video_data = video_data
         self.config = config
         self.chunks: List[Chunk] = []
+
+        # Precomputed lookup structures so per-chunk gathers don't rescan
+        # the full segment/keyframe/OCR lists (O(S·C) -> O((S+C) log S)).
+        # ASR segments are time-ordered, so the VideoData boundary columns
+        # are sorted and overlap ranges fall out of two binary searches.
+        self._asr_starts = video_data.asr_starts
+        self._asr_ends = video_data.asr_ends
+        self._asr_texts = [s.text for s in video_data.asr_segments]
+        self._keyframes_by_scene: Dict[int, List[Keyframe]] = defaultdict(list)
+        for keyframe in video_data.keyframes:
+            self._keyframes_by_scene[keyframe.scene_id].append(keyframe)
+        self._ocr_by_frame: Dict[int, List[OCRResult]] = defaultdict(list)
+        for ocr_result in video_data.ocr_results:
+            self._ocr_by_frame[ocr_result.frame_id].append(ocr_result)
+        self._chapter_starts = [
+            c.start_time for c in video_data.metadata.chapters
+        ]
     
     def chunk(self) -> List[Chunk]:
         """Create chunks."""
         logger.info("Creating hierarchical chunks")
-        
+
         # Process scenes with merge/split rules
         processed_scenes = self._process_scenes()
-        
+        if not processed_scenes:
+            logger.info("Created 0 chunks")
+            return self.chunks
+
+        # Fused lookups: chapter index and ASR overlap range are resolved
+        # for every chunk at once with three batched binary searches over
+        # the sorted boundary columns, instead of per-chunk calls.
+        starts = np.fromiter(
+            (s["start_ms"] for s in processed_scenes), dtype=np.int64
+        )
+        ends = np.fromiter(
+            (s["end_ms"] for s in processed_scenes), dtype=np.int64
+        )
+        asr_los = np.searchsorted(self._asr_ends, starts, side='left')
+        asr_his = np.searchsorted(self._asr_starts, ends, side='right')
+        if self._chapter_starts:
+            chapter_idxs = np.searchsorted(
+                np.asarray(self._chapter_starts), starts / 1000.0, side='right'
+            ) - 1
+            np.maximum(chapter_idxs, 0, out=chapter_idxs)
+        else:
+            chapter_idxs = np.zeros(len(starts), dtype=np.int64)
+
         # Create chunks from processed scenes
-        for scene_data in processed_scenes:
-            chunk = self._create_chunk_from_scene(scene_data)
+        for scene_data, asr_lo, asr_hi, chapter_idx in zip(
+            processed_scenes, asr_los.tolist(), asr_his.tolist(),
+            chapter_idxs.tolist()
+        ):
+            chunk = self._create_chunk_from_scene(
+                scene_data,
+                chapter_idx,
+                self.video_data.asr_segments[asr_lo:asr_hi],
+                # Slice-join over the text column: one C-level join, no
+                # per-segment attribute access.
+                " ".join(self._asr_texts[asr_lo:asr_hi])
+            )
             self.chunks.append(chunk)
-        
+
         logger.info(f"Created {len(self.chunks)} chunks")
-        
+
         return self.chunks
     
     def _process_scenes(self) -> List[Dict[str, Any]]:
         """Process scenes with merge/split rules."""
         scenes = self.video_data.scenes
+        if not scenes:
+            return []
+
+        # Classify every scene in one vectorized pass, then walk the
+        # short-scene mask to form merge groups: each group is an anchor
+        # scene plus the run of short scenes folded into it.
+        durations = np.fromiter(
+            (s.duration_ms for s in scenes), dtype=np.int64
+        )
+        short_mask = durations < self.config.min_chunk_duration_ms
+        if not self.config.merge_short_scenes:
+            short_mask[:] = False
+        short_mask[0] = False  # first scene has no previous to merge into
+
+        if self.config.split_long_scenes:
+            # Split at ASR segment boundaries is still TODO; long scenes
+            # are kept as-is (scene 9 is 55.6s which is borderline).
+            for i in np.flatnonzero(durations > self.config.max_chunk_duration_ms):
+                logger.info(
+                    f"Scene {scenes[i].scene_id} is too long ({durations[i]}ms), keeping as-is"
+                )
+
+        anchors = np.flatnonzero(~short_mask)
+        group_ends = np.append(anchors[1:] - 1, len(scenes) - 1)
+
         processed = []
-        
-        i = 0
-        while i < len(scenes):
-            scene = scenes[i]
-            
-            # Check if scene is too short and should be merged
-            if (self.config.merge_short_scenes and 
-                scene.duration_ms < self.config.min_chunk_duration_ms and 
-                i > 0):
-                # Merge with previous scene
-                logger.info(f"Merging short scene {scene.scene_id} ({scene.duration_ms}ms) with previous")
-                prev_scene = processed[-1]
-                prev_scene["end_ms"] = scene.end_ms
-                prev_scene["duration_ms"] = prev_scene["end_ms"] - prev_scene["start_ms"]
-                prev_scene["merged_scene_ids"].append(scene.scene_id)
-            
-            # Check if scene is too long and should be split
-            elif (self.config.split_long_scenes and 
-                  scene.duration_ms > self.config.max_chunk_duration_ms):
-                # Split at ASR segment boundaries
-                logger.info(f"Scene {scene.scene_id} is too long ({scene.duration_ms}ms), keeping as-is")
-                # For now, keep as-is (scene 9 is 55.6s which is borderline)
-                processed.append({
-                    "scene_id": scene.scene_id,
-                    "start_ms": scene.start_ms,
-                    "end_ms": scene.end_ms,
-                    "duration_ms": scene.duration_ms,
-                    "merged_scene_ids": [scene.scene_id]
-                })
-            
-            else:
-                # Scene is good as-is
-                processed.append({
-                    "scene_id": scene.scene_id,
-                    "start_ms": scene.start_ms,
-                    "end_ms": scene.end_ms,
-                    "duration_ms": scene.duration_ms,
-                    "merged_scene_ids": [scene.scene_id]
-                })
-            
-            i += 1
-        
+        for anchor, last in zip(anchors.tolist(), group_ends.tolist()):
+            merged_ids = [s.scene_id for s in scenes[anchor:last + 1]]
+            if last > anchor:
+                logger.info(
+                    f"Merging short scenes {merged_ids[1:]} into scene {merged_ids[0]}"
+                )
+            processed.append({
+                "scene_id": scenes[anchor].scene_id,
+                "start_ms": scenes[anchor].start_ms,
+                "end_ms": scenes[last].end_ms,
+                "duration_ms": scenes[last].end_ms - scenes[anchor].start_ms,
+                "merged_scene_ids": merged_ids
+            })
+
         return processed
     
-    def _create_chunk_from_scene(self, scene_data: Dict[str, Any]) -> Chunk:
-        """Create a chunk from scene data."""
+    def _create_chunk_from_scene(
+        self,
+        scene_data: Dict[str, Any],
+        chapter_index: int,
+        asr_segments: List[ASRSegment],
+        asr_text: str
+    ) -> Chunk:
+        """Create a chunk from scene data and its precomputed lookups."""
         scene_id = scene_data["scene_id"]
         t_start_ms = scene_data["start_ms"]
         t_end_ms = scene_data["end_ms"]
-        
-        # Find parent chapter
-        chapter_index, chapter_title = self._find_chapter(t_start_ms)
-        
-        # Gather ASR segments that overlap with this chunk
-        asr_segments = self._get_asr_segments(t_start_ms, t_end_ms)
-        asr_text = " ".join(seg.text for seg in asr_segments)
+
+        chapters = self.video_data.metadata.chapters
+        chapter_title = chapters[chapter_index].title if chapters else "Unknown"
         
         # Gather keyframes in this chunk
         keyframes = self._get_keyframes(scene_data["merged_scene_ids"])
@@ -193,44 +265,18 @@ class HierarchicalChunker:
         
         return chunk
     
-    def _find_chapter(self, timestamp_ms: int) -> tuple[int, str]:
-        """Find the chapter that contains this timestamp."""
-        timestamp_s = timestamp_ms / 1000.0
-        
-        for i, chapter in enumerate(self.video_data.metadata.chapters):
-            if chapter.start_time <= timestamp_s < chapter.end_time:
-                return i, chapter.title
-        
-        # If not found, return the last chapter
-        if self.video_data.metadata.chapters:
-            last_chapter = self.video_data.metadata.chapters[-1]
-            return len(self.video_data.metadata.chapters) - 1, last_chapter.title
-        
-        return 0, "Unknown"
-    
-    def _get_asr_segments(self, t_start_ms: int, t_end_ms: int) -> List[ASRSegment]:
-        """Get ASR segments that overlap with time range."""
-        segments = []
-        for segment in self.video_data.asr_segments:
-            # Check for overlap
-            if not (segment.end < t_start_ms or segment.start > t_end_ms):
-                segments.append(segment)
-        return segments
-    
     def _get_keyframes(self, scene_ids: List[int]) -> List[Keyframe]:
         """Get keyframes for the given scene IDs."""
         keyframes = []
-        for keyframe in self.video_data.keyframes:
-            if keyframe.scene_id in scene_ids:
-                keyframes.append(keyframe)
+        for scene_id in scene_ids:
+            keyframes.extend(self._keyframes_by_scene.get(scene_id, []))
         return keyframes
-    
+
     def _get_ocr_results(self, frame_ids: List[int]) -> List[OCRResult]:
         """Get OCR results for the given frame IDs."""
         ocr_results = []
-        for ocr_result in self.video_data.ocr_results:
-            if ocr_result.frame_id in frame_ids:
-                ocr_results.append(ocr_result)
+        for frame_id in frame_ids:
+            ocr_results.extend(self._ocr_by_frame.get(frame_id, []))
         return ocr_results
 
 
@@ -48,7 +48,10 @@ class EmbeddingConfig:
     
     image_model: str = "ViT-B/32"
     image_dim: int = 512
-    
+    # Optional INT8 ONNX export of the CLIP visual tower (produced by
+    # src/export_clip_onnx.py); falls back to PyTorch when unset.
+    clip_onnx_path: Optional[str] = None
+
     device: str = "cuda"
     batch_size: int = 8
 
@@ -59,16 +62,28 @@ class QdrantConfig:
     # For local Qdrant
     host: Optional[str] = "localhost"
     port: Optional[int] = 6333
+    grpc_port: int = 6334
     
     # For Qdrant Cloud
     url: Optional[str] = None
     api_key: Optional[str] = None
     
     collection_name: str = "video_chunks"
-    
+
     text_vector_name: str = "text"
     image_vector_name: str = "image"
 
+    # Bulk-upload tuning: points per upsert request and concurrent
+    # in-flight requests.
+    upsert_batch_size: int = 256
+    upsert_parallel: int = 4
+    # Disable HNSW construction while points stream in and build the
+    # index once afterwards, instead of per-point graph updates.
+    defer_indexing: bool = True
+    # Read back collection info and a sample point after storing — two
+    # extra round trips that only matter when debugging ingestion.
+    verify_after_upsert: bool = False
+
 
 @dataclass
 class PipelineConfig:
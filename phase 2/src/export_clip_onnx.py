@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Export the CLIP visual tower to an INT8-quantized ONNX model.
+
+Run once per machine; ChunkEmbedder picks the quantized model up through
+EmbeddingConfig.clip_onnx_path and serves image embeddings with ONNX
+Runtime instead of the fp32 PyTorch tower (~4x smaller weights, 2-4x
+throughput for inference-only batches).
+
+Usage:
+    python -m src.export_clip_onnx --output models/vitb32.int8.onnx
+"""
+import argparse
+import logging
+from pathlib import Path
+
+import torch
+import open_clip
+from onnxruntime.quantization import quantize_dynamic, QuantType
+
+
+logging.basicConfig(level=logging.INFO, format='%(levelname)s %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def export_clip_onnx(
+    model_name: str = "ViT-B/32",
+    output_path: Path = Path("models/vitb32.int8.onnx"),
+    image_size: int = 224
+) -> Path:
+    """
+    Export the CLIP image encoder to ONNX and quantize it to INT8.
+
+    Args:
+        model_name: open_clip model name
+        output_path: Destination for the quantized model
+        image_size: Input resolution of the visual tower
+
+    Returns:
+        Path to the quantized ONNX model
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    fp32_path = output_path.with_suffix('.fp32.onnx')
+
+    logger.info(f"Loading CLIP model: {model_name}")
+    model, _, _ = open_clip.create_model_and_transforms(
+        model_name, pretrained='openai'
+    )
+    model.eval()
+
+    logger.info(f"Exporting visual tower to {fp32_path}")
+    dummy = torch.zeros(1, 3, image_size, image_size)
+    torch.onnx.export(
+        model.visual,
+        dummy,
+        str(fp32_path),
+        input_names=['input'],
+        output_names=['features'],
+        dynamic_axes={'input': {0: 'batch'}, 'features': {0: 'batch'}},
+        opset_version=17
+    )
+
+    logger.info(f"Quantizing weights to INT8: {output_path}")
+    quantize_dynamic(
+        str(fp32_path),
+        str(output_path),
+        weight_type=QuantType.QInt8
+    )
+    fp32_path.unlink()
+
+    logger.info(f"Quantized model ready at {output_path}")
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export CLIP image encoder to INT8 ONNX"
+    )
+    parser.add_argument(
+        "--model",
+        default="ViT-B/32",
+        help="open_clip model name (default: ViT-B/32)"
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("models/vitb32.int8.onnx"),
+        help="Output path for the quantized model"
+    )
+    args = parser.parse_args()
+    export_clip_onnx(args.model, args.output)
+
+
+if __name__ == "__main__":
+    main()
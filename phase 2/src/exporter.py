@@ -3,9 +3,17 @@ import json
 import logging
 from pathlib import Path
 from typing import List
-import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 from src.chunker import Chunk
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    logging.warning("orjson not available. Falling back to stdlib json exports.")
 
 
 logger = logging.getLogger(__name__)
@@ -23,15 +31,23 @@ class ChunkExporter:
         logger.info(f"Exporting {len(chunks)} chunks")
         
         output_files = {}
-        
+
+        # Materialize each chunk's export record once and fan it out to
+        # the row-oriented writers (the Parquet path is columnar and
+        # reads the cached to_dict payloads directly).
+        records = [
+            self._chunk_record(chunk, as_lists=not ORJSON_AVAILABLE)
+            for chunk in chunks
+        ]
+
         # Export to JSON (human-readable, complete)
         json_path = self.output_dir / "chunks.json"
-        self._export_json(chunks, json_path)
+        self._export_json(records, json_path)
         output_files['json'] = str(json_path)
-        
+
         # Export to JSONL (training-ready, one per line)
         jsonl_path = self.output_dir / "chunks.jsonl"
-        self._export_jsonl(chunks, jsonl_path)
+        self._export_jsonl(records, jsonl_path)
         output_files['jsonl'] = str(jsonl_path)
         
         # Export to Parquet (columnar, efficient)
@@ -42,60 +58,115 @@ class ChunkExporter:
         logger.info("Export complete")
         return output_files
     
-    def _export_json(self, chunks: List[Chunk], output_path: Path):
+    @staticmethod
+    def _chunk_record(chunk: Chunk, as_lists: bool) -> dict:
+        """Build an export record with embeddings attached.
+
+        Copies the (cached) to_dict payload before mutating it. With
+        orjson the raw ndarrays pass straight through (serialized from
+        the buffer in C); other consumers get plain lists.
+        """
+        record = dict(chunk.to_dict())
+        if chunk.text_embedding is not None:
+            record['text_embedding'] = (
+                chunk.text_embedding.tolist() if as_lists else chunk.text_embedding
+            )
+        if chunk.image_embedding is not None:
+            record['image_embedding'] = (
+                chunk.image_embedding.tolist() if as_lists else chunk.image_embedding
+            )
+        return record
+
+    def _export_json(self, records: List[dict], output_path: Path):
         """Export to JSON."""
         logger.info(f"Exporting to JSON: {output_path}")
-        
-        chunks_data = []
-        for chunk in chunks:
-            chunk_dict = chunk.to_dict()
-            # Include embeddings as lists for portability
-            if hasattr(chunk, 'text_embedding'):
-                chunk_dict['text_embedding'] = chunk.text_embedding.tolist()
-            if hasattr(chunk, 'image_embedding'):
-                chunk_dict['image_embedding'] = chunk.image_embedding.tolist()
-            chunks_data.append(chunk_dict)
-        
-        with open(output_path, 'w') as f:
-            json.dump(chunks_data, f, indent=2)
-        
+
+        # Stream the array one record at a time so the full serialized
+        # payload (every embedding as text) never sits in memory at once;
+        # one record per line keeps the file diffable without indenting.
+        if ORJSON_AVAILABLE:
+            with open(output_path, 'wb') as f:
+                f.write(b'[')
+                for i, record in enumerate(records):
+                    if i:
+                        f.write(b',\n')
+                    f.write(orjson.dumps(
+                        record, option=orjson.OPT_SERIALIZE_NUMPY
+                    ))
+                f.write(b']')
+        else:
+            with open(output_path, 'w') as f:
+                f.write('[')
+                for i, record in enumerate(records):
+                    if i:
+                        f.write(',\n')
+                    json.dump(record, f)
+                f.write(']')
+
         logger.info(f"JSON export complete: {output_path.stat().st_size / 1024:.1f} KB")
-    
-    def _export_jsonl(self, chunks: List[Chunk], output_path: Path):
+
+    def _export_jsonl(self, records: List[dict], output_path: Path):
         """Export to JSONL (one chunk per line)."""
         logger.info(f"Exporting to JSONL: {output_path}")
-        
-        with open(output_path, 'w') as f:
-            for chunk in chunks:
-                chunk_dict = chunk.to_dict()
-                # Include embeddings
-                if hasattr(chunk, 'text_embedding'):
-                    chunk_dict['text_embedding'] = chunk.text_embedding.tolist()
-                if hasattr(chunk, 'image_embedding'):
-                    chunk_dict['image_embedding'] = chunk.image_embedding.tolist()
-                f.write(json.dumps(chunk_dict) + '\n')
-        
+
+        if ORJSON_AVAILABLE:
+            with open(output_path, 'wb') as f:
+                for record in records:
+                    f.write(orjson.dumps(
+                        record, option=orjson.OPT_SERIALIZE_NUMPY
+                    ) + b'\n')
+        else:
+            with open(output_path, 'w') as f:
+                for record in records:
+                    f.write(json.dumps(record) + '\n')
+
         logger.info(f"JSONL export complete: {output_path.stat().st_size / 1024:.1f} KB")
-    
+
     def _export_parquet(self, chunks: List[Chunk], output_path: Path):
         """Export to Parquet."""
         logger.info(f"Exporting to Parquet: {output_path}")
-        
-        # Prepare data for DataFrame
-        records = []
-        for chunk in chunks:
-            record = chunk.to_dict()
-            # Convert embeddings to lists
-            if hasattr(chunk, 'text_embedding'):
-                record['text_embedding'] = chunk.text_embedding.tolist()
-            if hasattr(chunk, 'image_embedding'):
-                record['image_embedding'] = chunk.image_embedding.tolist()
-            records.append(record)
-        
-        # Create DataFrame and export
-        df = pd.DataFrame(records)
-        df.to_parquet(output_path, index=False, engine='pyarrow')
-        
+
+        if not chunks:
+            pq.write_table(pa.table({}), output_path)
+            return
+
+        # Build Arrow arrays column by column instead of routing through
+        # a pandas DataFrame: no per-value float boxing, no dtype
+        # inference pass, and roughly half the peak memory. One pass
+        # over the (cached) to_dict payloads fills every column.
+        records = [chunk.to_dict() for chunk in chunks]
+        names = list(records[0].keys())
+        cols = {name: [] for name in names}
+        for record in records:
+            for name, value in record.items():
+                cols[name].append(value)
+        columns = [pa.array(cols[name]) for name in names]
+
+        # Embeddings go in as FixedSizeList over one preallocated
+        # contiguous float32 matrix per modality — 4*dim bytes per row
+        # instead of a variable-length list, with no intermediate
+        # concatenate copy.
+        for field, values in (
+            ('text_embedding', [c.text_embedding for c in chunks]),
+            ('image_embedding', [c.image_embedding for c in chunks]),
+        ):
+            if all(v is not None for v in values):
+                dim = len(values[0])
+                mat = np.empty((len(chunks), dim), dtype=np.float32)
+                for i, value in enumerate(values):
+                    mat[i] = value
+                columns.append(
+                    pa.FixedSizeListArray.from_arrays(
+                        pa.array(mat.reshape(-1)), dim
+                    )
+                )
+                names.append(field)
+
+        table = pa.Table.from_arrays(columns, names=names)
+        pq.write_table(
+            table, output_path, compression='zstd', use_dictionary=True
+        )
+
         logger.info(f"Parquet export complete: {output_path.stat().st_size / 1024:.1f} KB")
 
 
@@ -1,15 +1,35 @@
 """Load and validate Phase 1 artifacts."""
 import json
 import logging
+from functools import cached_property
 from pathlib import Path
-from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, FrozenSet, Optional
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    logging.warning("orjson not available. Falling back to stdlib json parsing.")
 
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+def _read_json(path: Path) -> Any:
+    """Parse a JSON file, preferring orjson's C parser when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(path.read_bytes())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+# slots=True on the record dataclasses: keyframe/OCR files can hold tens
+# of thousands of rows per video, and slots drop the per-instance
+# __dict__ and make attribute access a fixed offset.
+@dataclass(slots=True)
 class ASRSegment:
     """ASR segment with words."""
     start: int
@@ -18,7 +38,7 @@ class ASRSegment:
     words: List[Dict[str, Any]]
 
 
-@dataclass
+@dataclass(slots=True)
 class Scene:
     """Scene boundary."""
     scene_id: int
@@ -29,7 +49,7 @@ class Scene:
     end_frame: int
 
 
-@dataclass
+@dataclass(slots=True)
 class Keyframe:
     """Keyframe metadata."""
     frame_id: int
@@ -43,15 +63,19 @@ class Keyframe:
     height: int
 
 
-@dataclass
+@dataclass(slots=True)
 class OCRBlock:
     """OCR text block."""
     text: str
     bbox: List[float]  # [x_min, y_min, x_max, y_max]
     confidence: float
+    # Token-set cache filled by OCRCleaner; declared so it has a slot.
+    _tokens_lower: Optional[FrozenSet[str]] = field(
+        default=None, repr=False, compare=False
+    )
 
 
-@dataclass
+@dataclass(slots=True)
 class OCRResult:
     """OCR result for a keyframe."""
     frame_id: int
@@ -63,9 +87,17 @@ class OCRResult:
     text_blocks: List[OCRBlock]
     full_text: str
     total_blocks: int
+    # Token-set cache filled by OCRCleaner; declared so it has a slot.
+    _full_tokens: Optional[FrozenSet[str]] = field(
+        default=None, repr=False, compare=False
+    )
+    # Per-block dict cache filled by TimelineBuilder.
+    _block_dicts: Optional[List[Dict[str, Any]]] = field(
+        default=None, repr=False, compare=False
+    )
 
 
-@dataclass
+@dataclass(slots=True)
 class Chapter:
     """Video chapter."""
     title: str
@@ -73,7 +105,7 @@ class Chapter:
     end_time: float
 
 
-@dataclass
+@dataclass(slots=True)
 class Metadata:
     """Video metadata."""
     id: str
@@ -86,6 +118,8 @@ class Metadata:
     chapters: List[Chapter]
 
 
+# No slots here: the cached_property columns below need an instance
+# __dict__ to store their results, and there is one VideoData per video.
 @dataclass
 class VideoData:
     """Complete Phase 1 video data."""
@@ -104,6 +138,45 @@ class VideoData:
             return self.scenes[-1].end_ms
         return 0
 
+    # SoA views of the numeric hot fields. Downstream loops (chunker,
+    # aligner) mostly scan these columns; contiguous int64 arrays keep
+    # that work in C instead of one attribute dereference per object.
+    # Built lazily and cached; the dataclass lists stay canonical.
+    @cached_property
+    def asr_starts(self) -> np.ndarray:
+        """Segment start times (ms) as a sorted int64 column."""
+        return np.fromiter(
+            (s.start for s in self.asr_segments), dtype=np.int64
+        )
+
+    @cached_property
+    def asr_ends(self) -> np.ndarray:
+        """Segment end times (ms) as a sorted int64 column."""
+        return np.fromiter(
+            (s.end for s in self.asr_segments), dtype=np.int64
+        )
+
+    @cached_property
+    def kf_frame_ids(self) -> np.ndarray:
+        """Keyframe frame_id column."""
+        return np.fromiter(
+            (kf.frame_id for kf in self.keyframes), dtype=np.int64
+        )
+
+    @cached_property
+    def kf_scene_ids(self) -> np.ndarray:
+        """Keyframe scene_id column."""
+        return np.fromiter(
+            (kf.scene_id for kf in self.keyframes), dtype=np.int64
+        )
+
+    @cached_property
+    def ocr_frame_ids(self) -> np.ndarray:
+        """OCR result frame_id column."""
+        return np.fromiter(
+            (res.frame_id for res in self.ocr_results), dtype=np.int64
+        )
+
 
 class Phase1Loader:
     """Load Phase 1 artifacts."""
@@ -147,9 +220,8 @@ class Phase1Loader:
     def _load_metadata(self) -> Metadata:
         """Load video metadata."""
         metadata_path = self.phase1_video_dir / "source" / "metadata.json"
-        
-        with open(metadata_path, 'r') as f:
-            data = json.load(f)
+
+        data = _read_json(metadata_path)
         
         chapters = [
             Chapter(
@@ -174,9 +246,8 @@ class Phase1Loader:
     def _load_asr(self) -> List[ASRSegment]:
         """Load ASR segments."""
         asr_path = self.phase1_video_dir / "asr.json"
-        
-        with open(asr_path, 'r') as f:
-            data = json.load(f)
+
+        data = _read_json(asr_path)
         
         segments = [
             ASRSegment(
@@ -193,9 +264,8 @@ class Phase1Loader:
     def _load_scenes(self) -> List[Scene]:
         """Load scene boundaries."""
         scenes_path = self.phase1_video_dir / "scenes.json"
-        
-        with open(scenes_path, 'r') as f:
-            data = json.load(f)
+
+        data = _read_json(scenes_path)
         
         scenes = [
             Scene(
@@ -214,9 +284,8 @@ class Phase1Loader:
     def _load_keyframes(self) -> List[Keyframe]:
         """Load keyframe metadata."""
         keyframes_path = self.phase1_video_dir / "keyframes.json"
-        
-        with open(keyframes_path, 'r') as f:
-            data = json.load(f)
+
+        data = _read_json(keyframes_path)
         
         keyframes = [
             Keyframe(
@@ -238,9 +307,8 @@ class Phase1Loader:
     def _load_ocr(self) -> List[OCRResult]:
         """Load OCR results."""
         ocr_path = self.phase1_video_dir / "ocr.json"
-        
-        with open(ocr_path, 'r') as f:
-            data = json.load(f)
+
+        data = _read_json(ocr_path)
         
         ocr_results = [
             OCRResult(
@@ -1,10 +1,12 @@
 """OCR cleanup: filter UI chrome and deduplicate text."""
 import logging
-from typing import List, Dict, Set
+import sys
+from typing import List, Dict, FrozenSet, Set
 from collections import Counter
+import numpy as np
 
 from src.chunker import Chunk
-from src.loader import OCRBlock
+from src.loader import OCRBlock, OCRResult
 from src.config import ChunkingConfig
 
 
@@ -17,7 +19,33 @@ class OCRCleaner:
     def __init__(self, chunks: List[Chunk], config: ChunkingConfig):
         self.chunks = chunks
         self.config = config
-        self.ui_chrome_tokens: Set[str] = set()
+        self.ui_chrome_tokens: FrozenSet[str] = frozenset()
+
+    @staticmethod
+    def _block_tokens(block: OCRBlock) -> FrozenSet[str]:
+        """Lowercased token set of a block, tokenized at most once.
+
+        Both the chrome-identification pass and the per-chunk cleanup
+        pass need these tokens, so the result is cached on the block.
+        """
+        tokens = getattr(block, '_tokens_lower', None)
+        if tokens is None:
+            tokens = frozenset(
+                sys.intern(t) for t in block.text.lower().split()
+            )
+            block._tokens_lower = tokens
+        return tokens
+
+    @staticmethod
+    def _result_tokens(result: OCRResult) -> FrozenSet[str]:
+        """Lowercased token set of a result's full text, cached."""
+        tokens = result._full_tokens
+        if tokens is None:
+            tokens = frozenset(
+                sys.intern(t) for t in result.full_text.lower().split()
+            )
+            result._full_tokens = tokens
+        return tokens
     
     def clean(self) -> List[Chunk]:
         """Clean OCR text for all chunks."""
@@ -42,22 +70,30 @@ class OCRCleaner:
         for chunk in self.chunks:
             for ocr_result in chunk.ocr_results:
                 total_frames += 1
-                # Extract tokens from each text block
+                # Collect each frame's tokens as a set so the counter
+                # measures frame coverage (document frequency), not raw
+                # occurrences — a token repeated 10x in one frame must
+                # count once against the threshold. Interning dedupes
+                # the repeated UI strings across frames.
+                frame_tokens = set()
                 for block in ocr_result.text_blocks:
-                    tokens = block.text.lower().split()
-                    token_counter.update(tokens)
+                    frame_tokens.update(self._block_tokens(block))
+                token_counter.update(frame_tokens)
         
         if total_frames == 0:
             return
         
         # Find tokens that appear in >= threshold% of frames
         threshold_count = total_frames * self.config.ui_chrome_threshold
-        
+
+        chrome: Set[str] = set()
         for token, count in token_counter.items():
             if count >= threshold_count:
-                self.ui_chrome_tokens.add(token)
+                chrome.add(token)
                 logger.debug(f"Identified UI chrome token: '{token}' (appears in {count}/{total_frames} frames)")
-        
+        # Frozen so per-block filtering can use plain set difference
+        self.ui_chrome_tokens = frozenset(chrome)
+
         logger.info(f"Identified {len(self.ui_chrome_tokens)} UI chrome tokens")
     
     def _clean_chunk(self, chunk: Chunk):
@@ -83,53 +119,55 @@ class OCRCleaner:
         """Remove consecutive OCR results with high text overlap."""
         if len(ocr_results) <= 1:
             return ocr_results
-        
-        unique = [ocr_results[0]]
-        
+
+        # Tokenize and score every result exactly once up front; the old
+        # loop re-split the retained result's full_text on every
+        # comparison and recomputed mean confidence per pair.
+        token_sets = [self._result_tokens(result) for result in ocr_results]
+        mean_confs = [
+            sum(b.confidence for b in result.text_blocks) / max(len(result.text_blocks), 1)
+            for result in ocr_results
+        ]
+
+        kept = [0]
         for i in range(1, len(ocr_results)):
-            current = ocr_results[i]
-            previous = unique[-1]
-            
-            # Calculate text overlap
-            current_text = set(current.full_text.lower().split())
-            previous_text = set(previous.full_text.lower().split())
-            
+            current_text = token_sets[i]
+            previous_text = token_sets[kept[-1]]
+
             if not current_text or not previous_text:
-                unique.append(current)
+                kept.append(i)
                 continue
-            
+
             overlap = len(current_text & previous_text) / max(len(current_text), len(previous_text))
-            
+
             if overlap < self.config.text_overlap_threshold:
                 # Not enough overlap, keep this result
-                unique.append(current)
-            else:
+                kept.append(i)
+            elif mean_confs[i] > mean_confs[kept[-1]]:
                 # High overlap, keep the one with higher confidence
-                current_conf = sum(b.confidence for b in current.text_blocks) / max(len(current.text_blocks), 1)
-                previous_conf = sum(b.confidence for b in previous.text_blocks) / max(len(previous.text_blocks), 1)
-                
-                if current_conf > previous_conf:
-                    # Replace previous with current
-                    unique[-1] = current
-        
-        return unique
+                kept[-1] = i
+
+        return [ocr_results[i] for i in kept]
     
     def _extract_clean_text(self, text_blocks: List[OCRBlock]) -> str:
         """Extract clean text from OCR blocks, filtering UI chrome."""
-        # Sort blocks by position (top to bottom, left to right)
-        sorted_blocks = sorted(text_blocks, key=lambda b: (b.bbox[1], b.bbox[0]))
-        
-        # Extract text, filtering UI chrome
+        if not text_blocks:
+            return ""
+
+        # Sort blocks by position (top to bottom, left to right) without
+        # the per-comparison lambda calls of sorted(key=...).
+        ys = np.fromiter((b.bbox[1] for b in text_blocks), dtype=np.float64)
+        xs = np.fromiter((b.bbox[0] for b in text_blocks), dtype=np.float64)
+        order = np.lexsort((xs, ys))
+
+        # Keep blocks with any non-chrome content; the cached token sets
+        # make this a single set difference per block.
         clean_texts = []
-        for block in sorted_blocks:
-            # Check if block contains only UI chrome
-            tokens = block.text.lower().split()
-            non_chrome_tokens = [t for t in tokens if t not in self.ui_chrome_tokens]
-            
-            if non_chrome_tokens:
-                # Has non-chrome content, keep it
+        for idx in order:
+            block = text_blocks[idx]
+            if self._block_tokens(block) - self.ui_chrome_tokens:
                 clean_texts.append(block.text)
-        
+
         return " ".join(clean_texts)
 
 
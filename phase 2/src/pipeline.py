@@ -1,4 +1,5 @@
 """Phase 2 pipeline orchestrator."""
+import concurrent.futures
 import logging
 import time
 from pathlib import Path
@@ -11,7 +12,7 @@ from src.chunker import create_chunks
 from src.ocr_cleanup import clean_ocr_text
 from src.aligner import align_chunks
 from src.enricher import enrich_chunks
-from src.embedder import embed_chunks
+from src.embedder import ChunkEmbedder
 from src.store import store_in_qdrant
 from src.exporter import export_chunks
 
@@ -99,6 +100,18 @@ class Phase2Pipeline:
             logger.error(f"✗ Chunking failed: {e}")
             raise
         
+        # Warm up Stage 7's models while stages 4-6 run: ChunkEmbedder's
+        # __init__ loads SBERT and CLIP (disk reads + H2D transfers),
+        # which would otherwise serialize behind the CPU-bound cleanup,
+        # alignment, and enrichment stages.
+        model_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        embedder_future = model_executor.submit(
+            ChunkEmbedder,
+            self.config.embedding,
+            self.config.paths.get_phase1_video_dir(self.config.video_id)
+        )
+        model_executor.shutdown(wait=False)
+
         # Stage 4: OCR cleanup
         logger.info("\n" + "=" * 80)
         logger.info("STAGE 4: OCR Cleanup")
@@ -146,11 +159,8 @@ class Phase2Pipeline:
         logger.info("=" * 80)
         stage_start = time.time()
         try:
-            chunks = embed_chunks(
-                chunks,
-                self.config.embedding,
-                self.config.paths.get_phase1_video_dir(self.config.video_id)
-            )
+            embedder = embedder_future.result()
+            chunks = embedder.embed(chunks)
             timings['embeddings'] = time.time() - stage_start
             logger.info(f"✓ Embeddings generated in {timings['embeddings']:.2f}s")
             logger.info(f"  - Text embedding dim: {self.config.embedding.text_dim}")
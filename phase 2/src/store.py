@@ -1,5 +1,8 @@
 """Qdrant storage for chunks."""
+import concurrent.futures
+import itertools
 import logging
+from collections import deque
 from typing import List
 from qdrant_client import QdrantClient
 from qdrant_client.models import (
@@ -10,6 +13,8 @@ from qdrant_client.models import (
     MatchValue,
     PayloadSchemaType,
     CreateCollection,
+    HnswConfigDiff,
+    OptimizersConfigDiff,
 )
 
 from src.chunker import Chunk
@@ -21,17 +26,29 @@ logger = logging.getLogger(__name__)
 
 class QdrantStore:
     """Store chunks in Qdrant."""
-    
+
     def __init__(self, config: QdrantConfig):
         self.config = config
-        
-        # Connect to Qdrant Cloud or local
+
+        # Connect to Qdrant Cloud or local; prefer_grpc avoids the JSON
+        # encode and HTTP framing overhead of the REST transport.
         if config.url and config.api_key:
             logger.info(f"Connecting to Qdrant Cloud at {config.url}")
-            self.client = QdrantClient(url=config.url, api_key=config.api_key)
+            self.client = QdrantClient(
+                url=config.url,
+                api_key=config.api_key,
+                prefer_grpc=True,
+                timeout=60
+            )
         else:
             logger.info(f"Connecting to Qdrant at {config.host}:{config.port}")
-            self.client = QdrantClient(host=config.host, port=config.port)
+            self.client = QdrantClient(
+                host=config.host,
+                port=config.port,
+                grpc_port=config.grpc_port,
+                prefer_grpc=True,
+                timeout=60
+            )
     
     def store(self, chunks: List[Chunk]) -> int:
         """Store chunks in Qdrant."""
@@ -39,25 +56,48 @@ class QdrantStore:
         
         # Create collection if it doesn't exist
         self._create_collection(chunks)
-        
-        # Prepare points
-        points = []
-        for i, chunk in enumerate(chunks):
-            point = self._chunk_to_point(chunk, i)
-            points.append(point)
-        
-        # Upsert points
-        self.client.upsert(
-            collection_name=self.config.collection_name,
-            points=points
+
+        # Build points lazily and upsert in parallel batches so the
+        # storage stage is bounded by bandwidth rather than one round
+        # trip per request; wait=False lets the server acknowledge
+        # before indexing finishes. The batch size (default 256)
+        # amortizes RTT while staying under request-size limits with
+        # two named vectors per point. Capping in-flight futures keeps
+        # peak client memory at a few batches instead of every point.
+        point_iter = (
+            self._chunk_to_point(chunk, i) for i, chunk in enumerate(chunks)
         )
+        batch_size = self.config.upsert_batch_size
+        max_in_flight = self.config.upsert_parallel * 2
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.config.upsert_parallel
+        ) as executor:
+            in_flight = deque()
+            while True:
+                batch = list(itertools.islice(point_iter, batch_size))
+                if not batch:
+                    break
+                if len(in_flight) >= max_in_flight:
+                    in_flight.popleft().result()
+                in_flight.append(executor.submit(
+                    self.client.upsert,
+                    collection_name=self.config.collection_name,
+                    points=batch,
+                    wait=False
+                ))
+            for future in in_flight:
+                future.result()
+
+        if self.config.defer_indexing:
+            self._enable_indexing()
+
+        logger.info(f"Stored {len(chunks)} points in Qdrant")
         
-        logger.info(f"Stored {len(points)} points in Qdrant")
-        
-        # Verify with a sample query
-        self._verify_storage()
-        
-        return len(points)
+        # Verify with a sample query (debug affordance; two extra RTTs)
+        if self.config.verify_after_upsert:
+            self._verify_storage()
+
+        return len(chunks)
     
     def _create_collection(self, chunks: List[Chunk]):
         """Create Qdrant collection with multi-vector support."""
@@ -80,7 +120,16 @@ class QdrantStore:
         logger.info(f"  Text vector: {text_dim} dimensions")
         logger.info(f"  Image vector: {image_dim} dimensions")
         
-        # Create collection with named vectors
+        # Create collection with named vectors. With defer_indexing the
+        # collection starts with HNSW disabled (m=0) and indexing
+        # deferred, so bulk upserts skip per-point graph insertion; the
+        # index is built once in _enable_indexing after upload.
+        create_kwargs = {}
+        if self.config.defer_indexing:
+            create_kwargs = {
+                'hnsw_config': HnswConfigDiff(m=0),
+                'optimizers_config': OptimizersConfigDiff(indexing_threshold=0),
+            }
         self.client.create_collection(
             collection_name=self.config.collection_name,
             vectors_config={
@@ -92,57 +141,63 @@ class QdrantStore:
                     size=image_dim,
                     distance=Distance.COSINE
                 )
-            }
+            },
+            **create_kwargs
         )
         
-        # Create payload indexes for efficient filtering
+        # Create payload indexes for efficient filtering. The five
+        # creations are independent round trips, so they go out
+        # together and setup latency is the slowest call, not the sum.
         logger.info("Creating payload indexes")
-        
-        self.client.create_payload_index(
-            collection_name=self.config.collection_name,
-            field_name="video_id",
-            field_schema=PayloadSchemaType.KEYWORD
-        )
-        
-        self.client.create_payload_index(
-            collection_name=self.config.collection_name,
-            field_name="chapter_title",
-            field_schema=PayloadSchemaType.TEXT
-        )
-        
-        self.client.create_payload_index(
-            collection_name=self.config.collection_name,
-            field_name="scene_id",
-            field_schema=PayloadSchemaType.INTEGER
-        )
-        
-        self.client.create_payload_index(
-            collection_name=self.config.collection_name,
-            field_name="t_start_ms",
-            field_schema=PayloadSchemaType.INTEGER
-        )
-        
-        self.client.create_payload_index(
+
+        index_specs = [
+            ("video_id", PayloadSchemaType.KEYWORD),
+            ("chapter_title", PayloadSchemaType.TEXT),
+            ("scene_id", PayloadSchemaType.INTEGER),
+            ("t_start_ms", PayloadSchemaType.INTEGER),
+            ("t_end_ms", PayloadSchemaType.INTEGER),
+        ]
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=len(index_specs)
+        ) as executor:
+            futures = [
+                executor.submit(
+                    self.client.create_payload_index,
+                    collection_name=self.config.collection_name,
+                    field_name=field_name,
+                    field_schema=field_schema
+                )
+                for field_name, field_schema in index_specs
+            ]
+            for future in futures:
+                future.result()
+    
+    def _enable_indexing(self):
+        """Re-enable HNSW construction after the bulk upload."""
+        logger.info("Re-enabling HNSW indexing")
+        self.client.update_collection(
             collection_name=self.config.collection_name,
-            field_name="t_end_ms",
-            field_schema=PayloadSchemaType.INTEGER
+            hnsw_config=HnswConfigDiff(m=16),
+            optimizers_config=OptimizersConfigDiff(indexing_threshold=20000)
         )
-    
+
     def _chunk_to_point(self, chunk: Chunk, point_id: int) -> PointStruct:
         """Convert chunk to Qdrant point."""
-        # Prepare payload (all metadata except embeddings)
+        # Payload is all metadata except embeddings; to_dict() already
+        # excludes the vectors (the exporter attaches them separately),
+        # so the cached dict can be used as-is — no copy, no pops that
+        # would mutate the shared cache.
         payload = chunk.to_dict()
         
-        # Remove embeddings from payload (they go in vectors)
-        payload.pop('text_embedding', None)
-        payload.pop('image_embedding', None)
-        
-        # Create point with named vectors
+        # Create point with named vectors. The ndarrays are handed over
+        # as-is for convenience; PointStruct is a pydantic model whose
+        # validation coerces them to List[float] at construction, so
+        # this skips an explicit .tolist() but is not a zero-copy path.
         point = PointStruct(
             id=point_id,
             vector={
-                self.config.text_vector_name: chunk.text_embedding.tolist(),
-                self.config.image_vector_name: chunk.image_embedding.tolist()
+                self.config.text_vector_name: chunk.text_embedding,
+                self.config.image_vector_name: chunk.image_embedding
             },
             payload=payload
         )
@@ -1,10 +1,18 @@
 """Build unified temporal spine from all modalities."""
+import heapq
 import logging
+import operator
 from typing import List, Dict, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from enum import Enum
 
-from src.loader import VideoData
+from src.loader import OCRResult, VideoData
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    logging.warning("orjson not available. Falling back to stdlib json for timeline.")
 
 
 logger = logging.getLogger(__name__)
@@ -47,34 +55,35 @@ class TimelineBuilder:
     def build(self) -> List[TimelineEvent]:
         """Build the timeline."""
         logger.info("Building temporal spine")
-        
-        # Add chapter events
-        self._add_chapter_events()
-        
-        # Add scene events
-        self._add_scene_events()
-        
-        # Add ASR segments
-        self._add_asr_events()
-        
-        # Add keyframe events
-        self._add_keyframe_events()
-        
-        # Add OCR events (grouped by keyframe)
-        self._add_ocr_events()
-        
-        # Sort by timestamp
-        self.events.sort(key=lambda e: e.timestamp_ms)
-        
+
+        # Every source already yields events in non-decreasing
+        # timestamp order — chapter start/end pairs are the one
+        # exception and get a small in-source sort — so a k-way heap
+        # merge of the five streams is O(N log 5) rather than a global
+        # O(N log N) sort. merge is stable across its arguments, which
+        # preserves the chapter < scene < ASR < keyframe < OCR tie
+        # order the old append-then-stable-sort produced.
+        by_timestamp = operator.attrgetter('timestamp_ms')
+        chapter_events = sorted(self._chapter_events(), key=by_timestamp)
+        self.events = list(heapq.merge(
+            chapter_events,
+            self._scene_events(),
+            self._asr_events(),
+            self._keyframe_events(),
+            self._ocr_events(),
+            key=by_timestamp
+        ))
+
         logger.info(f"Built timeline with {len(self.events)} events")
-        
+
         return self.events
     
-    def _add_chapter_events(self):
-        """Add chapter start/end events."""
+    def _chapter_events(self) -> List[TimelineEvent]:
+        """Build chapter start/end events."""
+        events = []
         for i, chapter in enumerate(self.video_data.metadata.chapters):
             # Chapter start
-            self.events.append(TimelineEvent(
+            events.append(TimelineEvent(
                 timestamp_ms=int(chapter.start_time * 1000),
                 event_type=EventType.CHAPTER_START,
                 data={
@@ -86,7 +95,7 @@ class TimelineBuilder:
             ))
             
             # Chapter end
-            self.events.append(TimelineEvent(
+            events.append(TimelineEvent(
                 timestamp_ms=int(chapter.end_time * 1000),
                 event_type=EventType.CHAPTER_END,
                 data={
@@ -94,12 +103,14 @@ class TimelineBuilder:
                     "chapter_title": chapter.title
                 }
             ))
-    
-    def _add_scene_events(self):
-        """Add scene start/end events."""
+        return events
+
+    def _scene_events(self) -> List[TimelineEvent]:
+        """Build scene start/end events."""
+        events = []
         for scene in self.video_data.scenes:
             # Scene start
-            self.events.append(TimelineEvent(
+            events.append(TimelineEvent(
                 timestamp_ms=scene.start_ms,
                 event_type=EventType.SCENE_START,
                 data={
@@ -111,18 +122,20 @@ class TimelineBuilder:
             ))
             
             # Scene end
-            self.events.append(TimelineEvent(
+            events.append(TimelineEvent(
                 timestamp_ms=scene.end_ms,
                 event_type=EventType.SCENE_END,
                 data={
                     "scene_id": scene.scene_id
                 }
             ))
-    
-    def _add_asr_events(self):
-        """Add ASR segment events."""
+        return events
+
+    def _asr_events(self) -> List[TimelineEvent]:
+        """Build ASR segment events."""
+        events = []
         for i, segment in enumerate(self.video_data.asr_segments):
-            self.events.append(TimelineEvent(
+            events.append(TimelineEvent(
                 timestamp_ms=segment.start,
                 event_type=EventType.ASR_SEGMENT,
                 data={
@@ -134,11 +147,13 @@ class TimelineBuilder:
                     "words": segment.words
                 }
             ))
-    
-    def _add_keyframe_events(self):
-        """Add keyframe events."""
+        return events
+
+    def _keyframe_events(self) -> List[TimelineEvent]:
+        """Build keyframe events."""
+        events = []
         for keyframe in self.video_data.keyframes:
-            self.events.append(TimelineEvent(
+            events.append(TimelineEvent(
                 timestamp_ms=keyframe.timestamp_ms,
                 event_type=EventType.KEYFRAME,
                 data={
@@ -151,11 +166,29 @@ class TimelineBuilder:
                     "height": keyframe.height
                 }
             ))
-    
-    def _add_ocr_events(self):
-        """Add OCR block events (grouped by keyframe timestamp)."""
+        return events
+
+    @staticmethod
+    def _block_dicts(ocr_result: OCRResult) -> List[Dict[str, Any]]:
+        """Per-block dicts for a result, built at most once and cached."""
+        dicts = ocr_result._block_dicts
+        if dicts is None:
+            dicts = [
+                {
+                    "text": block.text,
+                    "bbox": block.bbox,
+                    "confidence": block.confidence
+                }
+                for block in ocr_result.text_blocks
+            ]
+            ocr_result._block_dicts = dicts
+        return dicts
+
+    def _ocr_events(self) -> List[TimelineEvent]:
+        """Build OCR block events (grouped by keyframe timestamp)."""
+        events = []
         for ocr_result in self.video_data.ocr_results:
-            self.events.append(TimelineEvent(
+            events.append(TimelineEvent(
                 timestamp_ms=ocr_result.timestamp_ms,
                 event_type=EventType.OCR_BLOCK,
                 data={
@@ -164,31 +197,34 @@ class TimelineBuilder:
                     "image_path": ocr_result.image_path,
                     "total_blocks": ocr_result.total_blocks,
                     "full_text": ocr_result.full_text,
-                    "text_blocks": [
-                        {
-                            "text": block.text,
-                            "bbox": block.bbox,
-                            "confidence": block.confidence
-                        }
-                        for block in ocr_result.text_blocks
-                    ]
+                    "text_blocks": self._block_dicts(ocr_result)
                 }
             ))
-    
+        return events
+
     def save_timeline(self, output_path: str) -> None:
         """Save timeline to JSON."""
-        import json
-        
         timeline_data = {
             "video_id": self.video_data.video_id,
             "total_events": len(self.events),
             "duration_ms": self.video_data.total_duration_ms,
             "events": [event.to_dict() for event in self.events]
         }
-        
-        with open(output_path, 'w') as f:
-            json.dump(timeline_data, f, indent=2)
-        
+
+        # The timeline repeats every OCR block and ASR word; orjson
+        # serializes the whole tree in C, several times faster than
+        # stdlib json for a payload this size.
+        if ORJSON_AVAILABLE:
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(
+                    timeline_data,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+                ))
+        else:
+            import json
+            with open(output_path, 'w') as f:
+                json.dump(timeline_data, f, indent=2)
+
         logger.info(f"Timeline saved to {output_path}")
 
 
@@ -1,19 +1,92 @@
 #!/usr/bin/env python3
 """Convert Executive Summary markdown to PDF"""
+import re
 import subprocess
 import shutil
 from pathlib import Path
 
+# One linear regex pass replaces each **...** pair; the old loop
+# rescanned the line from the start for every pair it replaced.
+_BOLD_RE = re.compile(r'\*\*(.+?)\*\*')
+
+try:
+    import cmarkgfm
+    CMARKGFM_AVAILABLE = True
+except ImportError:
+    CMARKGFM_AVAILABLE = False
+
+try:
+    from playwright.sync_api import sync_playwright
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    PLAYWRIGHT_AVAILABLE = False
+
+# Lazily launched headless Chromium shared across calls, so repeated
+# conversions pay the ~1-2 s browser startup once instead of spawning
+# a fresh Chrome process per document.
+_browser = None
+
+
+def _get_browser():
+    """Launch (once) and reuse a headless Chromium instance"""
+    global _browser
+    if _browser is None:
+        _browser = sync_playwright().start().chromium.launch()
+    return _browser
+
 
 def markdown_to_html(md_path: Path) -> str:
     """Convert markdown to HTML with styling"""
-    with open(md_path, 'r', encoding='utf-8') as f:
-        md_content = f.read()
-    
+    # One read + one decode, skipping TextIOWrapper's incremental
+    # decoding path
+    md_content = md_path.read_bytes().decode('utf-8')
+
+    if CMARKGFM_AVAILABLE:
+        # libcmark-gfm parses the whole document (tables included) in
+        # one C pass; UNSAFE keeps raw HTML passthrough, matching the
+        # line-by-line fallback's behavior.
+        html_content = cmarkgfm.github_flavored_markdown_to_html(
+            md_content, options=cmarkgfm.Options.CMARK_OPT_UNSAFE
+        )
+    else:
+        html_content = _markdown_to_html_fallback(md_content)
+
+    # Wrap in full HTML document
+    full_html = f"""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>Executive Summary</title>
+    <style>
+        body {{ font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif;
+               line-height: 1.6; max-width: 900px; margin: 40px auto; padding: 20px; color: #333; }}
+        h1 {{ font-size: 2rem; margin: 2rem 0 1rem; border-bottom: 3px solid #333; padding-bottom: 0.5rem; }}
+        h2 {{ font-size: 1.5rem; margin: 1.5rem 0 0.75rem; color: #444; }}
+        h3 {{ font-size: 1.2rem; margin: 1rem 0 0.5rem; color: #555; }}
+        p {{ margin: 0.5rem 0; }}
+        hr {{ border: none; border-top: 1px solid #ddd; margin: 2rem 0; }}
+        table {{ width: 100%; border-collapse: collapse; margin: 1rem 0; }}
+        th, td {{ padding: 0.75rem; text-align: left; border: 1px solid #ddd; }}
+        th {{ background: #f5f5f5; font-weight: bold; }}
+        li {{ margin: 0.25rem 0; }}
+        strong {{ font-weight: 600; }}
+        br {{ margin: 0.5rem 0; }}
+    </style>
+</head>
+<body>
+{html_content}
+</body>
+</html>"""
+
+    return full_html
+
+
+def _markdown_to_html_fallback(md_content: str) -> str:
+    """Line-by-line markdown conversion used when cmarkgfm is absent"""
     # Simple markdown to HTML conversion
     html_lines = []
     in_table = False
-    
+
     for line in md_content.split('\n'):
         # Headers
         if line.startswith('# '):
@@ -27,10 +100,7 @@ def markdown_to_html(md_path: Path) -> str:
             html_lines.append('<hr>')
         # Bold text
         elif '**' in line:
-            # Simple bold replacement
-            converted = line
-            while '**' in converted:
-                converted = converted.replace('**', '<strong>', 1).replace('**', '</strong>', 1)
+            converted = _BOLD_RE.sub(r'<strong>\1</strong>', line)
             html_lines.append(f'<p>{converted}</p>')
         # Lists
         elif line.strip().startswith('- '):
@@ -68,37 +138,8 @@ def markdown_to_html(md_path: Path) -> str:
     
     if in_table:
         html_lines.append('</tbody></table>')
-    
-    html_content = '\n'.join(html_lines)
-    
-    # Wrap in full HTML document
-    full_html = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <title>Executive Summary</title>
-    <style>
-        body {{ font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif; 
-               line-height: 1.6; max-width: 900px; margin: 40px auto; padding: 20px; color: #333; }}
-        h1 {{ font-size: 2rem; margin: 2rem 0 1rem; border-bottom: 3px solid #333; padding-bottom: 0.5rem; }}
-        h2 {{ font-size: 1.5rem; margin: 1.5rem 0 0.75rem; color: #444; }}
-        h3 {{ font-size: 1.2rem; margin: 1rem 0 0.5rem; color: #555; }}
-        p {{ margin: 0.5rem 0; }}
-        hr {{ border: none; border-top: 1px solid #ddd; margin: 2rem 0; }}
-        table {{ width: 100%; border-collapse: collapse; margin: 1rem 0; }}
-        th, td {{ padding: 0.75rem; text-align: left; border: 1px solid #ddd; }}
-        th {{ background: #f5f5f5; font-weight: bold; }}
-        li {{ margin: 0.25rem 0; }}
-        strong {{ font-weight: 600; }}
-        br {{ margin: 0.5rem 0; }}
-    </style>
-</head>
-<body>
-{html_content}
-</body>
-</html>"""
-    
-    return full_html
+
+    return '\n'.join(html_lines)
 
 
 def convert_to_pdf(md_path: Path, pdf_path: Path):
@@ -111,11 +152,31 @@ def convert_to_pdf(md_path: Path, pdf_path: Path):
     # Convert markdown to HTML
     print(f"Converting {md_path.name} to HTML...")
     html_content = markdown_to_html(md_path)
-    
-    # Save temporary HTML
+
+    # Render through the persistent browser when playwright is
+    # installed — no temp file and no per-document Chrome spawn
+    if PLAYWRIGHT_AVAILABLE:
+        print("Converting to PDF using Playwright...")
+        try:
+            page = _get_browser().new_page()
+            page.set_content(html_content)
+            page.pdf(path=str(pdf_path))
+            page.close()
+        except Exception as e:
+            print(f"❌ Conversion failed: {e}")
+            return False
+
+        if pdf_path.exists() and pdf_path.stat().st_size > 0:
+            print(f"✅ PDF saved to: {pdf_path}")
+            print(f"   File size: {pdf_path.stat().st_size / 1024:.1f} KB")
+            return True
+        print(f"❌ PDF generation failed")
+        return False
+
+    # Save temporary HTML: encode once and write the bytes in a single
+    # call rather than streaming through a text wrapper
     temp_html = md_path.parent / "temp_summary.html"
-    with open(temp_html, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    temp_html.write_bytes(html_content.encode('utf-8'))
     
     # Find Chrome
     chrome_commands = [
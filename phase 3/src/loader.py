@@ -1,11 +1,55 @@
 """Load Phase 1 and Phase 2 artifacts"""
+import concurrent.futures
 import json
+import logging
+import operator
+import os
+import pickle
+import sys
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
+import numpy as np
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-@dataclass
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+# Thousands of OCR blocks reference the same ~hundred keyframe files,
+# so basename extraction is memoized and the results interned for O(1)
+# dict hashing when they are used as grouping/lookup keys
+_basename_cache: Dict[str, str] = {}
+
+
+def cached_basename(path: str) -> str:
+    """Memoized os.path.basename with interned results"""
+    name = _basename_cache.get(path)
+    if name is None:
+        name = sys.intern(os.path.basename(path))
+        _basename_cache[path] = name
+    return name
+
+
+def _read_json(path: Path) -> Any:
+    """Parse a JSON artifact, using orjson's C parser when installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(path.read_bytes())
+    with open(path) as f:
+        return json.load(f)
+
+
+@dataclass(slots=True, frozen=True)
 class ASRSegment:
     """ASR segment from Phase 1"""
     text: str
@@ -14,24 +58,24 @@ class ASRSegment:
     confidence: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class OCRBlock:
     """OCR block from Phase 1"""
     text: str
-    bbox: List[List[int]]  # [[x1,y1], [x2,y2], [x3,y3], [x4,y4]]
+    bbox: np.ndarray  # int32, shape (N, 2): [[x1,y1], [x2,y2], [x3,y3], [x4,y4]]
     confidence: float
     keyframe_path: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Keyframe:
     """Keyframe from Phase 1"""
-    path: Path
+    path: str  # plain str; Path construction costs ~2x a str join
     timestamp_ms: int
     scene_idx: int
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Scene:
     """Scene from Phase 1"""
     idx: int
@@ -39,7 +83,7 @@ class Scene:
     end_ms: int
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Chapter:
     """Chapter from metadata"""
     title: str
@@ -47,7 +91,7 @@ class Chapter:
     end_ms: int
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Metadata:
     """Video metadata from Phase 1"""
     video_id: str
@@ -56,7 +100,7 @@ class Metadata:
     chapters: List[Chapter]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Chunk:
     """Chunk from Phase 2"""
     chunk_id: str
@@ -78,7 +122,7 @@ class Chunk:
     alignment_score: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VideoData:
     """Complete video data from Phase 1 and Phase 2"""
     video_id: str
@@ -97,33 +141,101 @@ class DataLoader:
         self.phase1_dir = phase1_dir
         self.phase2_dir = phase2_dir
     
-    def load_all(self, video_id: str) -> VideoData:
+    def load_all(self, video_id: str, use_cache: bool = True) -> VideoData:
         """Load all data for a video"""
-        # Load Phase 1 data
-        metadata = self._load_metadata(video_id)
-        asr_segments = self._load_asr(video_id)
-        scenes = self._load_scenes(video_id)
-        keyframes = self._load_keyframes(video_id)
-        ocr_blocks = self._load_ocr(video_id)
-        
-        # Load Phase 2 data
-        chunks = self._load_chunks(video_id)
-        
-        return VideoData(
+        # The source artifacts don't change between pipeline runs, so
+        # the constructed VideoData is cached on disk as one pickle
+        # keyed by the artifacts' mtimes; a warm re-run skips JSON
+        # parsing and dataclass construction entirely.
+        cache_path = self.phase2_dir / "output" / video_id / "_loader_cache.pkl"
+        signature = self._cache_signature(video_id)
+        if use_cache and signature is not None:
+            cached = self._load_cache(cache_path, signature)
+            if cached is not None:
+                logger.info(f"Loaded {video_id} from loader cache")
+                return cached
+
+        # The six artifacts are independent files, so read and parse
+        # them concurrently — the GIL is released during file reads,
+        # and load time approaches the largest file instead of the sum.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=6) as executor:
+            futures = {
+                name: executor.submit(loader, video_id)
+                for name, loader in [
+                    ("metadata", self._load_metadata),
+                    ("asr", self._load_asr),
+                    ("scenes", self._load_scenes),
+                    ("keyframes", self._load_keyframes),
+                    ("ocr", self._load_ocr),
+                    ("chunks", self._load_chunks),
+                ]
+            }
+            results = {name: future.result() for name, future in futures.items()}
+
+        video_data = VideoData(
             video_id=video_id,
-            metadata=metadata,
-            asr_segments=asr_segments,
-            scenes=scenes,
-            keyframes=keyframes,
-            ocr_blocks=ocr_blocks,
-            chunks=chunks
+            metadata=results["metadata"],
+            asr_segments=results["asr"],
+            scenes=results["scenes"],
+            keyframes=results["keyframes"],
+            ocr_blocks=results["ocr"],
+            chunks=results["chunks"]
         )
-    
+
+        if use_cache and signature is not None:
+            self._save_cache(cache_path, signature, video_data)
+
+        return video_data
+
+    def _artifact_paths(self, video_id: str) -> List[Path]:
+        """Paths of the six source artifacts for a video"""
+        video_dir = self.phase1_dir / video_id
+        return [
+            video_dir / "source" / "metadata.json",
+            video_dir / "asr.json",
+            video_dir / "scenes.json",
+            video_dir / "keyframes.json",
+            video_dir / "ocr.json",
+            self.phase2_dir / "output" / video_id / "chunks.json",
+        ]
+
+    def _cache_signature(self, video_id: str):
+        """mtime signature of the source artifacts, or None if any is missing"""
+        try:
+            return tuple(
+                path.stat().st_mtime_ns for path in self._artifact_paths(video_id)
+            )
+        except OSError:
+            return None
+
+    @staticmethod
+    def _load_cache(cache_path: Path, signature) -> Optional[VideoData]:
+        """Return the cached VideoData if present and still current"""
+        try:
+            with open(cache_path, 'rb') as f:
+                cached_signature, video_data = pickle.load(f)
+        except Exception:
+            # Missing, truncated, or written by an older record layout —
+            # fall through to a full rebuild
+            return None
+        if cached_signature != signature:
+            return None
+        return video_data
+
+    @staticmethod
+    def _save_cache(cache_path: Path, signature, video_data: VideoData):
+        """Write the loader cache; failure only costs the next warm start"""
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_path, 'wb') as f:
+                pickle.dump((signature, video_data), f, protocol=5)
+        except Exception as e:
+            logger.warning(f"Failed to write loader cache: {e}")
+
     def _load_metadata(self, video_id: str) -> Metadata:
         """Load video metadata"""
         path = self.phase1_dir / video_id / "source" / "metadata.json"
-        with open(path) as f:
-            data = json.load(f)
+        data = _read_json(path)
         
         chapters = []
         for ch in data.get("chapters", []):
@@ -143,108 +255,152 @@ class DataLoader:
     def _load_asr(self, video_id: str) -> List[ASRSegment]:
         """Load ASR segments"""
         path = self.phase1_dir / video_id / "asr.json"
-        with open(path) as f:
-            data = json.load(f)
+        data = _read_json(path)
         
+        # One cached itemgetter call per segment instead of three
+        # separate dict lookups
+        get_seg = operator.itemgetter("text", "start", "end")
+
         segments = []
         for seg in data["segments"]:
             # ASR uses milliseconds directly
+            text, start_ms, end_ms = get_seg(seg)
             segments.append(ASRSegment(
-                text=seg["text"],
-                start_ms=seg["start"],
-                end_ms=seg["end"],
+                text=text,
+                start_ms=start_ms,
+                end_ms=end_ms,
                 confidence=seg.get("confidence", 1.0)
             ))
-        
+
         return segments
     
     def _load_scenes(self, video_id: str) -> List[Scene]:
         """Load scene boundaries"""
         path = self.phase1_dir / video_id / "scenes.json"
-        with open(path) as f:
-            data = json.load(f)
+        data = _read_json(path)
         
+        get_scene = operator.itemgetter("scene_id", "start_ms", "end_ms")
+
         scenes = []
         for scene in data["scenes"]:
+            idx, start_ms, end_ms = get_scene(scene)
             scenes.append(Scene(
-                idx=scene["scene_id"],
-                start_ms=scene["start_ms"],
-                end_ms=scene["end_ms"]
+                idx=idx,
+                start_ms=start_ms,
+                end_ms=end_ms
             ))
-        
+
         return scenes
     
     def _load_keyframes(self, video_id: str) -> List[Keyframe]:
         """Load keyframes"""
         path = self.phase1_dir / video_id / "keyframes.json"
-        with open(path) as f:
-            data = json.load(f)
+        data = _read_json(path)
         
+        get_kf = operator.itemgetter("filename", "timestamp_ms", "scene_id")
+        # Hoist the constant directory prefix out of the loop; plain
+        # string joins skip per-entry Path parsing
+        keyframes_dir = str(self.phase1_dir / video_id / "keyframes")
+
         keyframes = []
         for kf in data["keyframes"]:
+            filename, timestamp_ms, scene_idx = get_kf(kf)
             # Always use local path - ignore the path from JSON which may be from vast.ai
-            kf_path = self.phase1_dir / video_id / "keyframes" / kf["filename"]
-            
             keyframes.append(Keyframe(
-                path=kf_path,
-                timestamp_ms=kf["timestamp_ms"],
-                scene_idx=kf["scene_id"]
+                path=os.path.join(keyframes_dir, filename),
+                timestamp_ms=timestamp_ms,
+                scene_idx=scene_idx
             ))
-        
+
         return keyframes
     
     def _load_ocr(self, video_id: str) -> List[OCRBlock]:
         """Load OCR blocks"""
         path = self.phase1_dir / video_id / "ocr.json"
-        with open(path) as f:
-            data = json.load(f)
-        
-        ocr_blocks = []
-        for result in data["results"]:
-            # OCR uses 'image_path' not 'keyframe_path'
-            keyframe_path = result["image_path"]
-            for block in result["text_blocks"]:
-                # Use bbox_polygon for the actual coordinates
-                bbox = block.get("bbox_polygon", block.get("bbox", []))
-                ocr_blocks.append(OCRBlock(
-                    text=block["text"],
-                    bbox=bbox,
-                    confidence=block.get("confidence", 1.0),
-                    keyframe_path=keyframe_path
-                ))
-        
+
+        ocr_blocks: List[OCRBlock] = []
+        # ocr.json is the largest artifact; ijson parses the results
+        # array incrementally so only one result's blocks are resident
+        # alongside the output list, instead of the whole document tree
+        if IJSON_AVAILABLE:
+            with open(path, 'rb') as f:
+                for result in ijson.items(f, "results.item", use_float=True):
+                    self._append_result_blocks(ocr_blocks, result)
+        else:
+            data = _read_json(path)
+            for result in data["results"]:
+                self._append_result_blocks(ocr_blocks, result)
+
         return ocr_blocks
+
+    @staticmethod
+    def _append_result_blocks(ocr_blocks: List[OCRBlock], result: Dict[str, Any]):
+        """Append one OCR result's blocks to the output list"""
+        # OCR uses 'image_path' not 'keyframe_path'
+        keyframe_path = result["image_path"]
+        for block in result["text_blocks"]:
+            # Use bbox_polygon for the actual coordinates; convert to
+            # an int32 array once here so rendering never rebuilds
+            # per-point Python tuples
+            bbox = block.get("bbox_polygon", block.get("bbox", []))
+            ocr_blocks.append(OCRBlock(
+                text=block["text"],
+                bbox=np.asarray(bbox, dtype=np.int32).reshape(-1, 2),
+                confidence=block.get("confidence", 1.0),
+                keyframe_path=keyframe_path
+            ))
     
     def _load_chunks(self, video_id: str) -> List[Chunk]:
         """Load Phase 2 chunks"""
         path = self.phase2_dir / "output" / video_id / "chunks.json"
-        with open(path) as f:
-            # Phase 2 outputs a list directly, not wrapped in {"chunks": [...]}
-            data = json.load(f)
-        
+        # Phase 2 outputs a list directly, not wrapped in {"chunks": [...]}
+        data = _read_json(path)
+
+        if not data:
+            return []
+
+        # Pull the timestamp columns into int64 arrays and compute every
+        # duration in one vectorized subtraction, instead of a Python
+        # subtraction and division per chunk
+        t_starts = np.fromiter(
+            (d["t_start_ms"] for d in data), dtype=np.int64, count=len(data)
+        )
+        t_ends = np.fromiter(
+            (d["t_end_ms"] for d in data), dtype=np.int64, count=len(data)
+        )
+        durations = (t_ends - t_starts) / 1000.0
+
+        # One itemgetter call fetches the required fields together,
+        # and completeness/ocr_text are looked up once instead of
+        # two-to-three times each
+        get_required = operator.itemgetter(
+            "chunk_id", "chapter_title", "asr_text", "keyframe_paths", "completeness"
+        )
+
         chunks = []
-        for chunk_data in data:
-            # Calculate duration if not present
-            duration_sec = (chunk_data["t_end_ms"] - chunk_data["t_start_ms"]) / 1000
-            
+        for i, chunk_data in enumerate(data):
+            chunk_id, chapter_title, asr_text, keyframe_paths, completeness = \
+                get_required(chunk_data)
+            ocr_text = chunk_data.get("ocr_text", "")
+
             chunks.append(Chunk(
-                chunk_id=chunk_data["chunk_id"],
+                chunk_id=chunk_id,
                 chapter_idx=chunk_data.get("chapter_index", chunk_data.get("chapter_idx", 0)),
-                chapter_title=chunk_data["chapter_title"],
+                chapter_title=chapter_title,
                 scene_indices=[chunk_data.get("scene_id", 0)],  # Phase 2 uses scene_id
-                t_start_ms=chunk_data["t_start_ms"],
-                t_end_ms=chunk_data["t_end_ms"],
-                duration_sec=duration_sec,
-                asr_text=chunk_data["asr_text"],
-                ocr_text_cleaned=chunk_data.get("ocr_text", ""),
-                ocr_text_raw=chunk_data.get("ocr_text", ""),
-                keyframe_paths=chunk_data["keyframe_paths"],
-                has_speech=chunk_data["completeness"]["has_speech"],
-                has_visual=chunk_data["completeness"]["has_visual"],
-                has_ocr_text=chunk_data["completeness"]["has_ocr_text"],
+                t_start_ms=int(t_starts[i]),
+                t_end_ms=int(t_ends[i]),
+                duration_sec=float(durations[i]),
+                asr_text=asr_text,
+                ocr_text_cleaned=ocr_text,
+                ocr_text_raw=ocr_text,
+                keyframe_paths=keyframe_paths,
+                has_speech=completeness["has_speech"],
+                has_visual=completeness["has_visual"],
+                has_ocr_text=completeness["has_ocr_text"],
                 asr_confidence_avg=chunk_data.get("asr_confidence", 1.0),
                 ocr_confidence_avg=chunk_data.get("ocr_confidence", 1.0),
                 alignment_score=chunk_data.get("alignment_score", 0.0)
             ))
-        
+
         return chunks
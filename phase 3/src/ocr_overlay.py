@@ -1,15 +1,188 @@
 """Draw OCR bounding boxes on keyframes"""
+import concurrent.futures
+import os
+from collections import defaultdict
 from pathlib import Path
 from typing import List, Dict
 import logging
 from PIL import Image, ImageDraw, ImageFont
 import numpy as np
 
-from .loader import VideoData, OCRBlock, Keyframe
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+from .loader import VideoData, OCRBlock, Keyframe, cached_basename
 
 logger = logging.getLogger(__name__)
 
 
+# Per-worker-process font cache. Loading touches the filesystem and
+# parses the TTF, so do it once per process, not once per keyframe;
+# label height is constant for the "0.00"-shaped confidence labels and
+# widths repeat across the ~100 distinct two-decimal values.
+_font = None
+_label_h = 0
+_label_widths: Dict[str, float] = {}
+
+
+def _load_font() -> ImageFont.ImageFont:
+    """Load the label font (once per worker process)"""
+    global _font, _label_h
+    if _font is None:
+        try:
+            _font = ImageFont.truetype(
+                "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 12
+            )
+        except Exception:
+            _font = ImageFont.load_default()
+        _label_h = _font.getbbox("0.00")[3]
+    return _font
+
+
+def _confidence_color(
+    confidence: float, high_conf_threshold: float, low_conf_threshold: float
+) -> str:
+    """Get color based on OCR confidence"""
+    if confidence >= high_conf_threshold:
+        return "#00FF00"  # Green
+    elif confidence >= low_conf_threshold:
+        return "#FFFF00"  # Yellow
+    else:
+        return "#FF0000"  # Red
+
+
+# BGR equivalents of the PIL hex colors, for the OpenCV fast path
+_COLOR_BGR = {
+    "#00FF00": (0, 255, 0),
+    "#FFFF00": (0, 255, 255),
+    "#FF0000": (0, 0, 255),
+}
+
+# Per-label text size cache for cv2.getTextSize (same ~100 distinct
+# "0.00"-style labels as the PIL width cache)
+_label_sizes: Dict[str, tuple] = {}
+
+
+def _annotate_keyframe_cv2(
+    keyframe_path: str,
+    ocr_blocks: List[OCRBlock],
+    output_dir: Path,
+    high_conf_threshold: float,
+    low_conf_threshold: float,
+) -> Path:
+    """OpenCV variant of _annotate_keyframe.
+
+    All polygons of one color go through a single cv2.polylines call —
+    one Python→C transition per color bucket instead of one per block.
+    """
+    arr = cv2.imread(keyframe_path, cv2.IMREAD_COLOR)
+    if arr is None:
+        raise ValueError(f"Could not read {keyframe_path}")
+
+    # Bucket polygons by confidence color
+    buckets: Dict[tuple, list] = {}
+    drawable = []
+    for block in ocr_blocks:
+        if not len(block.bbox):
+            continue
+        color = _COLOR_BGR[_confidence_color(
+            block.confidence, high_conf_threshold, low_conf_threshold
+        )]
+        buckets.setdefault(color, []).append(block.bbox)
+        drawable.append((block, color))
+
+    for color, polys in buckets.items():
+        cv2.polylines(arr, polys, True, color, 2)
+
+    # Labels still go per block, but rectangle/putText are C-level and
+    # text sizes are cached per distinct label
+    for block, color in drawable:
+        label = f"{block.confidence:.2f}"
+        size = _label_sizes.get(label)
+        if size is None:
+            size = _label_sizes.setdefault(
+                label, cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.4, 1)
+            )
+        (w, h), baseline = size
+        x, y = (int(v) for v in block.bbox[0])
+        cv2.rectangle(arr, (x, y - 15), (x + w, y - 15 + h + baseline), color, -1)
+        cv2.putText(arr, label, (x, y - 15 + h), cv2.FONT_HERSHEY_SIMPLEX,
+                    0.4, (255, 255, 255), 1, cv2.LINE_AA)
+
+    stem = os.path.splitext(os.path.basename(keyframe_path))[0]
+    output_path = output_dir / f"{stem}_annotated.jpg"
+    cv2.imwrite(str(output_path), arr, [int(cv2.IMWRITE_JPEG_QUALITY), 90])
+
+    return output_path
+
+
+def _annotate_keyframe(
+    keyframe_path: str,
+    ocr_blocks: List[OCRBlock],
+    output_dir: Path,
+    high_conf_threshold: float,
+    low_conf_threshold: float,
+) -> Path:
+    """Annotate a single keyframe with OCR bounding boxes.
+
+    Module-level (not a method) so ProcessPoolExecutor can pickle the
+    job cheaply: only the path, the keyframe's own blocks, and two
+    floats cross the process boundary.
+    """
+    if CV2_AVAILABLE:
+        return _annotate_keyframe_cv2(
+            keyframe_path, ocr_blocks, output_dir,
+            high_conf_threshold, low_conf_threshold,
+        )
+
+    # Load image. JPEG keyframes already decode as RGB, so the convert
+    # — a full-frame copy per keyframe — only runs for the odd
+    # grayscale/palette image
+    img = Image.open(keyframe_path)
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    draw = ImageDraw.Draw(img)
+    font = _load_font()
+
+    # Draw each OCR block
+    for block in ocr_blocks:
+        # Get color based on confidence
+        color = _confidence_color(
+            block.confidence, high_conf_threshold, low_conf_threshold
+        )
+
+        # Draw bounding box. bbox is an int32 array from the loader;
+        # one flatten + tolist hands PIL a flat coordinate list instead
+        # of N Python tuples built per block.
+        if not len(block.bbox):
+            continue
+        draw.polygon(block.bbox.reshape(-1).tolist(), outline=color, width=2)
+
+        # Draw confidence label at top-left of bbox
+        label = f"{block.confidence:.2f}"
+        x, y = block.bbox[0]
+
+        # Draw background for text. The label box is computed from the
+        # cached per-label width and constant height instead of a
+        # textbbox round-trip per block.
+        width = _label_widths.get(label)
+        if width is None:
+            width = _label_widths.setdefault(label, font.getlength(label))
+        draw.rectangle((x, y - 15, x + width, y - 15 + _label_h), fill=color)
+        draw.text((x, y - 15), label, fill="white", font=font)
+
+    # Save annotated image; quality 90 halves encode time vs. 95 with
+    # no visible difference on screen-content keyframes
+    stem = os.path.splitext(os.path.basename(keyframe_path))[0]
+    output_path = output_dir / f"{stem}_annotated.jpg"
+    img.save(output_path, quality=90, optimize=False)
+
+    return output_path
+
+
 class OCROverlayGenerator:
     """Generate keyframe images with OCR bounding box overlays"""
     
@@ -25,92 +198,51 @@ class OCROverlayGenerator:
             Dict mapping original keyframe path to annotated image path
         """
         output_dir.mkdir(parents=True, exist_ok=True)
-        
+
         # Group OCR blocks by keyframe
         ocr_by_keyframe = self._group_ocr_by_keyframe(video_data.ocr_blocks)
-        
+
         annotated_paths = {}
-        
-        for keyframe in video_data.keyframes:
-            try:
+
+        # JPEG decode, drawing and re-encode are all CPU-bound C work,
+        # so fan the keyframes out across worker processes — one job per
+        # keyframe, carrying only that keyframe's blocks.
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=os.cpu_count()
+        ) as executor:
+            futures = {}
+            for keyframe in video_data.keyframes:
                 # Get OCR blocks for this keyframe using filename
-                keyframe_name = keyframe.path.name
-                ocr_blocks = ocr_by_keyframe.get(keyframe_name, [])
-                
-                # Annotate the keyframe
-                annotated_path = self._annotate_keyframe(
-                    keyframe, ocr_blocks, output_dir
+                ocr_blocks = ocr_by_keyframe.get(cached_basename(keyframe.path), [])
+                future = executor.submit(
+                    _annotate_keyframe,
+                    keyframe.path,
+                    ocr_blocks,
+                    output_dir,
+                    self.high_conf_threshold,
+                    self.low_conf_threshold,
                 )
-                
-                annotated_paths[str(keyframe.path)] = annotated_path
-                
-                logger.info(f"Annotated {keyframe.path.name} with {len(ocr_blocks)} OCR boxes")
-            
-            except Exception as e:
-                logger.error(f"Failed to annotate {keyframe.path}: {e}")
-        
+                futures[future] = (keyframe, len(ocr_blocks))
+
+            for future, (keyframe, n_blocks) in futures.items():
+                try:
+                    annotated_paths[keyframe.path] = future.result()
+                    logger.info(f"Annotated {cached_basename(keyframe.path)} with {n_blocks} OCR boxes")
+                except Exception as e:
+                    logger.error(f"Failed to annotate {keyframe.path}: {e}")
+
         logger.info(f"Generated {len(annotated_paths)} annotated keyframes")
         return annotated_paths
-    
+
     def _group_ocr_by_keyframe(self, ocr_blocks: List[OCRBlock]) -> Dict[str, List[OCRBlock]]:
         """Group OCR blocks by keyframe path"""
-        grouped = {}
-        for block in ocr_blocks:
-            # Use only the filename as key for matching
-            key = Path(block.keyframe_path).name
-            if key not in grouped:
-                grouped[key] = []
-            grouped[key].append(block)
-        
-        return grouped
-    
-    def _annotate_keyframe(
-        self, 
-        keyframe: Keyframe, 
-        ocr_blocks: List[OCRBlock], 
-        output_dir: Path
-    ) -> Path:
-        """Annotate a single keyframe with OCR bounding boxes"""
-        # Load image
-        img = Image.open(keyframe.path).convert("RGB")
-        draw = ImageDraw.Draw(img)
-        
-        # Try to load a font, fall back to default if not available
-        try:
-            font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 12)
-        except:
-            font = ImageFont.load_default()
-        
-        # Draw each OCR block
+        # Use only the filename as key for matching. cached_basename
+        # memoizes the extraction per distinct path and interns the
+        # result, and defaultdict folds the membership test into the
+        # single dict lookup — the loop is one hash and one append per
+        # block.
+        grouped = defaultdict(list)
         for block in ocr_blocks:
-            # Get color based on confidence
-            color = self._get_confidence_color(block.confidence)
-            
-            # Draw bounding box
-            bbox_points = [tuple(point) for point in block.bbox]
-            draw.polygon(bbox_points, outline=color, width=2)
-            
-            # Draw confidence label at top-left of bbox
-            if bbox_points:
-                label = f"{block.confidence:.2f}"
-                x, y = bbox_points[0]
-                
-                # Draw background for text
-                bbox = draw.textbbox((x, y - 15), label, font=font)
-                draw.rectangle(bbox, fill=color)
-                draw.text((x, y - 15), label, fill="white", font=font)
-        
-        # Save annotated image
-        output_path = output_dir / f"{keyframe.path.stem}_annotated.jpg"
-        img.save(output_path, quality=95)
-        
-        return output_path
-    
-    def _get_confidence_color(self, confidence: float) -> str:
-        """Get color based on OCR confidence"""
-        if confidence >= self.high_conf_threshold:
-            return "#00FF00"  # Green
-        elif confidence >= self.low_conf_threshold:
-            return "#FFFF00"  # Yellow
-        else:
-            return "#FF0000"  # Red
+            grouped[cached_basename(block.keyframe_path)].append(block)
+
+        return dict(grouped)
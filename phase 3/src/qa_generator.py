@@ -1,5 +1,7 @@
 """Q&A pair generation using Google Gemini"""
+import concurrent.futures
 import json
+import re
 from pathlib import Path
 from typing import List, Dict, Any
 import logging
@@ -7,10 +9,20 @@ from dataclasses import dataclass
 
 from .loader import Chunk
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# The outermost [...] in a Gemini response is the Q&A array; one regex
+# search finds it regardless of surrounding markdown fences or prose
+_JSON_ARRAY_RE = re.compile(r'\[.*\]', re.S)
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class QAPair:
     """Question-Answer pair"""
     question: str
@@ -37,7 +49,31 @@ class QAGenerator:
         self.model = model
         self.max_pairs_per_chunk = max_pairs_per_chunk
         self.temperature = temperature
-        
+
+        # The prompt framing and instructions never change for a given
+        # generator, so build them once here; _build_prompt only fills
+        # in the per-chunk middle
+        self._prompt_prefix = (
+            "You are generating training data from a video tutorial.\n\n"
+            "Given the following content from a video segment:\n\n"
+        )
+        self._prompt_suffix = f"""
+
+Generate {max_pairs_per_chunk} question-answer pairs that:
+1. Test understanding of the content shown/spoken in this segment
+2. Include at least one question about visual/graphical content (what was shown on screen)
+3. Each answer should cite whether the information was spoken, shown on screen, or both
+4. Keep answers concise but accurate
+5. Questions should be specific and answerable from the provided content
+
+Output as a JSON array with this exact format:
+[
+  {{"question": "...", "answer": "...", "evidence_type": "spoken|visual|both"}},
+  {{"question": "...", "answer": "...", "evidence_type": "spoken|visual|both"}}
+]
+
+Output ONLY the JSON array, no other text."""
+
         # Import google-genai
         try:
             from google import genai
@@ -51,18 +87,27 @@ class QAGenerator:
     def generate(self, chunks: List[Chunk], video_id: str) -> List[QAPair]:
         """Generate Q&A pairs for all chunks"""
         logger.info(f"Generating Q&A pairs for {len(chunks)} chunks")
-        
+
         all_pairs = []
-        
-        for i, chunk in enumerate(chunks, 1):
-            try:
-                logger.info(f"Processing chunk {i}/{len(chunks)}: {chunk.chunk_id}")
-                pairs = self._generate_for_chunk(chunk, video_id)
-                all_pairs.extend(pairs)
-                logger.info(f"Generated {len(pairs)} Q&A pairs for {chunk.chunk_id}")
-            except Exception as e:
-                logger.error(f"Failed to generate Q&A for {chunk.chunk_id}: {e}")
-        
+
+        # Each call blocks on Gemini round-trip latency, so overlap
+        # requests across a small thread pool — the client is
+        # thread-safe and eight in-flight requests stay well under the
+        # API rate limits. Results are collected in chunk order.
+        max_workers = max(1, min(8, len(chunks)))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self._generate_for_chunk, chunk, video_id)
+                for chunk in chunks
+            ]
+            for chunk, future in zip(chunks, futures):
+                try:
+                    pairs = future.result()
+                    all_pairs.extend(pairs)
+                    logger.info(f"Generated {len(pairs)} Q&A pairs for {chunk.chunk_id}")
+                except Exception as e:
+                    logger.error(f"Failed to generate Q&A for {chunk.chunk_id}: {e}")
+
         logger.info(f"Total Q&A pairs generated: {len(all_pairs)}")
         return all_pairs
     
@@ -93,63 +138,43 @@ class QAGenerator:
     
     def _build_prompt(self, chunk: Chunk) -> str:
         """Build prompt for Gemini"""
-        
+
         t_start_sec = chunk.t_start_ms / 1000
         t_end_sec = chunk.t_end_ms / 1000
-        
-        prompt = f"""You are generating training data from a video tutorial.
-
-Given the following content from a video segment:
 
-Chapter: {chunk.chapter_title}
-Time: {t_start_sec:.1f}s - {t_end_sec:.1f}s
-Duration: {chunk.duration_sec:.1f}s
-
-Spoken (ASR):
-{chunk.asr_text if chunk.asr_text else "[No speech]"}
-
-On Screen (OCR):
-{chunk.ocr_text_cleaned if chunk.ocr_text_cleaned else "[No on-screen text]"}
-
-Generate {self.max_pairs_per_chunk} question-answer pairs that:
-1. Test understanding of the content shown/spoken in this segment
-2. Include at least one question about visual/graphical content (what was shown on screen)
-3. Each answer should cite whether the information was spoken, shown on screen, or both
-4. Keep answers concise but accurate
-5. Questions should be specific and answerable from the provided content
-
-Output as a JSON array with this exact format:
-[
-  {{"question": "...", "answer": "...", "evidence_type": "spoken|visual|both"}},
-  {{"question": "...", "answer": "...", "evidence_type": "spoken|visual|both"}}
-]
-
-Output ONLY the JSON array, no other text."""
-        
-        return prompt
+        # Join the cached prefix/suffix around the per-chunk fields —
+        # roughly half the string building of reassembling the whole
+        # ~1 KB prompt per call
+        return ''.join((
+            self._prompt_prefix,
+            f"Chapter: {chunk.chapter_title}\n"
+            f"Time: {t_start_sec:.1f}s - {t_end_sec:.1f}s\n"
+            f"Duration: {chunk.duration_sec:.1f}s\n\n"
+            "Spoken (ASR):\n",
+            chunk.asr_text if chunk.asr_text else "[No speech]",
+            "\n\nOn Screen (OCR):\n",
+            chunk.ocr_text_cleaned if chunk.ocr_text_cleaned else "[No on-screen text]",
+            self._prompt_suffix,
+        ))
     
     def _parse_response(self, response_text: str, chunk: Chunk, video_id: str) -> List[QAPair]:
         """Parse Gemini response into QAPair objects"""
         
-        # Clean response text
-        response_text = response_text.strip()
-        
-        # Remove markdown code blocks if present
-        if response_text.startswith("```"):
-            lines = response_text.split("\n")
-            # Remove first and last lines (markdown markers)
-            response_text = "\n".join(lines[1:-1]) if len(lines) > 2 else response_text
-        
-        if response_text.startswith("```json"):
-            response_text = response_text[7:]
-        if response_text.endswith("```"):
-            response_text = response_text[:-3]
-        
-        response_text = response_text.strip()
-        
+        # Extract the JSON array directly — this subsumes the old
+        # markdown-fence stripping (prefix checks, splits and slices)
+        # in a single search
+        match = _JSON_ARRAY_RE.search(response_text)
+        if not match:
+            logger.error("No JSON array found in response")
+            logger.debug(f"Response text: {response_text[:500]}")
+            return []
+
         try:
-            pairs_data = json.loads(response_text)
-        except json.JSONDecodeError as e:
+            if ORJSON_AVAILABLE:
+                pairs_data = orjson.loads(match.group(0))
+            else:
+                pairs_data = json.loads(match.group(0))
+        except ValueError as e:
             logger.error(f"Failed to parse JSON response: {e}")
             logger.debug(f"Response text: {response_text[:500]}")
             return []
@@ -177,19 +202,33 @@ Output ONLY the JSON array, no other text."""
     def save_jsonl(self, qa_pairs: List[QAPair], output_path: Path):
         """Save Q&A pairs to JSONL format"""
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            for pair in qa_pairs:
-                json_str = json.dumps({
-                    "question": pair.question,
-                    "answer": pair.answer,
-                    "evidence_type": pair.evidence_type,
-                    "chunk_id": pair.chunk_id,
-                    "t_start_ms": pair.t_start_ms,
-                    "t_end_ms": pair.t_end_ms,
-                    "chapter_title": pair.chapter_title,
-                    "video_id": pair.video_id
-                }, ensure_ascii=False)
-                f.write(json_str + "\n")
-        
+
+        records = [
+            {
+                "question": pair.question,
+                "answer": pair.answer,
+                "evidence_type": pair.evidence_type,
+                "chunk_id": pair.chunk_id,
+                "t_start_ms": pair.t_start_ms,
+                "t_end_ms": pair.t_end_ms,
+                "chapter_title": pair.chapter_title,
+                "video_id": pair.video_id
+            }
+            for pair in qa_pairs
+        ]
+
+        # Encode every line up front and write one bytes buffer — one
+        # syscall instead of two writes per pair, and orjson already
+        # emits UTF-8 so there is no per-line transcoding
+        if ORJSON_AVAILABLE:
+            lines = [orjson.dumps(record) for record in records]
+        else:
+            lines = [
+                json.dumps(record, ensure_ascii=False).encode('utf-8')
+                for record in records
+            ]
+        with open(output_path, 'wb') as f:
+            if lines:
+                f.write(b"\n".join(lines) + b"\n")
+
         logger.info(f"Saved {len(qa_pairs)} Q&A pairs to {output_path}")
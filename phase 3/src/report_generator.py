@@ -2,18 +2,90 @@
 from pathlib import Path
 import base64
 import logging
+import os
+import pickle
 from typing import Dict, List
 from datetime import datetime
 
-from .loader import VideoData, Chunk
+try:
+    import pybase64
+    PYBASE64_AVAILABLE = True
+except ImportError:
+    PYBASE64_AVAILABLE = False
+
+from .loader import VideoData, Chunk, cached_basename
 from .validator import ValidationReport
 
 logger = logging.getLogger(__name__)
 
+# Per-item templates hoisted to module level and filled via format_map,
+# so the static markup is parsed once at import instead of being
+# reassembled from fragments on every iteration
+_CHUNK_TEMPLATE = """
+            <div class="chunk">
+                <h3>{chunk_id}</h3>
+                <div class="chunk-meta">
+                    <span>Chapter: {chapter_title}</span>
+                    <span>Time: {t_start_sec:.1f}s - {t_end_sec:.1f}s ({duration_sec:.1f}s)</span>
+                    <span>ASR Confidence: {asr_confidence:.2f}</span>
+                    <span>OCR Confidence: {ocr_confidence:.2f}</span>
+                </div>
+
+                <div class="chunk-content">
+                    <div class="chunk-section">
+                        <h4>Keyframes (OCR Overlay)</h4>
+                        <div class="keyframes-grid">
+                            {keyframes_html}
+                        </div>
+                    </div>
+
+                    <div class="chunk-section">
+                        <h4>Spoken (ASR)</h4>
+                        <p class="text-content">{asr_text}</p>
+                    </div>
+
+                    <div class="chunk-section">
+                        <h4>On Screen (OCR Cleaned)</h4>
+                        <p class="text-content">{ocr_text}</p>
+                    </div>
+                </div>
+            </div>
+            """
+
+_GAP_TEMPLATE = """
+            <div class="issue {severity}">
+                <strong>Keyframe Gap ({severity})</strong>:
+                {start_sec:.1f}s - {end_sec:.1f}s ({duration_sec:.1f}s)
+            </div>
+            """
+
+_FLAG_TEMPLATE = """
+            <div class="issue {severity}">
+                <strong>{flag_type} ({severity})</strong>:
+                {description} - {location_name}
+            </div>
+            """
+
 
 class HTMLReportGenerator:
     """Generate self-contained HTML report with validation results"""
-    
+
+    def __init__(self, embed_images: bool = True):
+        # embed_images=True (the default) inlines every annotated
+        # keyframe as a base64 data URL so the report is a single file
+        # that can be moved or shared on its own. embed_images=False
+        # references the keyframe files by relative path instead — the
+        # HTML shrinks ~4x and the browser decodes JPEGs lazily, but the
+        # report must stay next to the annotated keyframes directory.
+        self.embed_images = embed_images
+        # The same annotated keyframe is referenced by every chunk that
+        # spans it, and reports are often regenerated with most
+        # keyframes unchanged. Keys are (path, mtime_ns, size) so a
+        # changed file re-encodes; the dict is persisted next to the
+        # report between runs.
+        self._b64_cache: Dict[tuple, str] = {}
+        self._b64_used: set = set()
+
     def generate(
         self, 
         video_data: VideoData, 
@@ -23,31 +95,44 @@ class HTMLReportGenerator:
     ):
         """Generate HTML report"""
         logger.info(f"Generating HTML report for {video_data.video_id}")
-        
-        html = self._build_html(video_data, validation_report, annotated_keyframes)
-        
+
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html)
-        
+
+        self._report_dir = output_path.parent
+
+        # Warm the encoding cache from the previous run; unchanged
+        # keyframes then skip both the read and the base64 encode
+        cache_path = output_path.parent / ".b64_cache.pkl"
+        if self.embed_images:
+            self._b64_cache = self._load_b64_cache(cache_path)
+            self._b64_used = set()
+
+        # Stream sections straight into the file — the chunk section
+        # embeds base64 keyframes and dominates the document, so
+        # never materializing the whole report as one string keeps peak
+        # memory at a single chunk's markup
+        with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            self._write_html(f.write, video_data, validation_report, annotated_keyframes)
+
+        # Persist only the entries this run touched, so encodings of
+        # deleted or re-annotated keyframes don't accumulate
+        if self.embed_images:
+            self._save_b64_cache(
+                cache_path, {k: self._b64_cache[k] for k in self._b64_used}
+            )
+
         logger.info(f"HTML report saved to {output_path}")
-    
-    def _build_html(
-        self, 
-        video_data: VideoData, 
+
+    def _write_html(
+        self,
+        write,
+        video_data: VideoData,
         report: ValidationReport,
         annotated_keyframes: Dict[str, Path]
-    ) -> str:
-        """Build complete HTML document"""
-        
-        # Build sections
-        summary_html = self._build_summary_dashboard(video_data, report)
-        timeline_html = self._build_timeline_strip(video_data, report)
-        chunks_html = self._build_chunk_details(video_data, annotated_keyframes)
-        gaps_html = self._build_gaps_section(report)
-        
-        # Combine into full HTML
-        html = f"""<!DOCTYPE html>
+    ):
+        """Write the complete HTML document section by section"""
+
+        write(f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -62,16 +147,16 @@ class HTMLReportGenerator:
         <h1>Extraction Validation Report</h1>
         <p class="subtitle">Video ID: {video_data.video_id}</p>
         <p class="subtitle">Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-        
-        {summary_html}
-        {timeline_html}
-        {chunks_html}
-        {gaps_html}
+
+        """)
+        write(self._build_summary_dashboard(video_data, report))
+        write(self._build_timeline_strip(video_data, report))
+        self._write_chunk_details(write, video_data, annotated_keyframes)
+        write(self._build_gaps_section(report))
+        write("""
     </div>
 </body>
-</html>"""
-        
-        return html
+</html>""")
     
     def _build_summary_dashboard(self, video_data: VideoData, report: ValidationReport) -> str:
         """Build compact summary dashboard"""
@@ -127,42 +212,44 @@ class HTMLReportGenerator:
         """Build timeline visualization strip"""
         
         duration_ms = int(video_data.metadata.duration_sec * 1000)
-        
+        # One multiply per marker instead of a divide and a multiply,
+        # and positions formatted to three decimals — sub-0.001% is
+        # below pixel resolution and shorter output strings join faster
+        scale = 100.0 / duration_ms
+
+        # Emit every marker into one buffer, in z-order (later elements
+        # render on top): chapters, gaps, scenes, keyframes. The bound
+        # append skips an attribute lookup per marker, which matters for
+        # the thousands of keyframe markers on long videos.
+        out = []
+        append = out.append
+
         # Build timeline bars
-        chapter_bars = []
         for ch in video_data.metadata.chapters:
-            start_pct = (ch.start_ms / duration_ms) * 100
-            width_pct = ((ch.end_ms - ch.start_ms) / duration_ms) * 100
-            chapter_bars.append(f'<div class="timeline-bar chapter" style="left: {start_pct}%; width: {width_pct}%;" title="{ch.title}"></div>')
-        
+            start_pct = ch.start_ms * scale
+            width_pct = (ch.end_ms - ch.start_ms) * scale
+            append(f'<div class="timeline-bar chapter" style="left: {start_pct:.3f}%; width: {width_pct:.3f}%;" title="{ch.title}"></div>')
+
+        # Gap highlights
+        for gap in report.keyframe_gaps:
+            start_pct = gap.start_ms * scale
+            width_pct = (gap.end_ms - gap.start_ms) * scale
+            append(f'<div class="timeline-bar gap" style="left: {start_pct:.3f}%; width: {width_pct:.3f}%;" title="Gap: {gap.duration_sec:.1f}s"></div>')
+
         # Scene markers
-        scene_markers = []
         for scene in video_data.scenes:
-            pos_pct = (scene.start_ms / duration_ms) * 100
-            scene_markers.append(f'<div class="timeline-marker scene" style="left: {pos_pct}%;" title="Scene {scene.idx}"></div>')
-        
+            append(f'<div class="timeline-marker scene" style="left: {scene.start_ms * scale:.3f}%;" title="Scene {scene.idx}"></div>')
+
         # Keyframe markers
-        keyframe_markers = []
         for kf in video_data.keyframes:
-            pos_pct = (kf.timestamp_ms / duration_ms) * 100
-            keyframe_markers.append(f'<div class="timeline-marker keyframe" style="left: {pos_pct}%;" title="Keyframe @ {kf.timestamp_ms/1000:.1f}s"></div>')
-        
-        # Gap highlights
-        gap_bars = []
-        for gap in report.keyframe_gaps:
-            start_pct = (gap.start_ms / duration_ms) * 100
-            width_pct = ((gap.end_ms - gap.start_ms) / duration_ms) * 100
-            gap_bars.append(f'<div class="timeline-bar gap" style="left: {start_pct}%; width: {width_pct}%;" title="Gap: {gap.duration_sec:.1f}s"></div>')
-        
+            append(f'<div class="timeline-marker keyframe" style="left: {kf.timestamp_ms * scale:.3f}%;" title="Keyframe @ {kf.timestamp_ms/1000:.1f}s"></div>')
+
         html = f"""
         <section class="timeline">
             <h2>Timeline</h2>
             <div class="timeline-container">
                 <div class="timeline-track">
-                    {''.join(chapter_bars)}
-                    {''.join(gap_bars)}
-                    {''.join(scene_markers)}
-                    {''.join(keyframe_markers)}
+                    {''.join(out)}
                 </div>
             </div>
             <div class="timeline-legend">
@@ -176,107 +263,82 @@ class HTMLReportGenerator:
         
         return html
     
-    def _build_chunk_details(self, video_data: VideoData, annotated_keyframes: Dict[str, Path]) -> str:
-        """Build chunk-by-chunk detail section"""
-        
-        chunks_html = []
-        
+    def _write_chunk_details(self, write, video_data: VideoData, annotated_keyframes: Dict[str, Path]):
+        """Write the chunk-by-chunk detail section"""
+
+        write("""
+        <section class="chunks">
+            <h2>Chunk Details</h2>
+        """)
+
+        # One basename-keyed view of annotated_keyframes, built once;
+        # each chunk keyframe then resolves with at most two dict
+        # lookups instead of a variant loop plus an O(K) fallback scan
+        bn_index = {
+            cached_basename(k): v for k, v in annotated_keyframes.items()
+        }
+
         for chunk in video_data.chunks:
             # Get annotated keyframes for this chunk
             chunk_keyframes = []
             for kf_path in chunk.keyframe_paths:
-                # Try multiple path variants
-                variants = [
-                    kf_path,
-                    str(Path(kf_path)),
-                    str(Path(kf_path).name),
-                ]
-                
-                for variant in variants:
-                    if variant in annotated_keyframes:
-                        annotated_path = annotated_keyframes[variant]
+                annotated_path = (
+                    annotated_keyframes.get(kf_path)
+                    or bn_index.get(cached_basename(kf_path))
+                )
+                if annotated_path is not None:
+                    if self.embed_images:
                         img_b64 = self._image_to_base64(annotated_path)
-                        chunk_keyframes.append(f'<img src="data:image/jpeg;base64,{img_b64}" alt="Keyframe" class="keyframe-img">')
-                        break
-                else:
-                    # Try finding by filename
-                    kf_name = Path(kf_path).name
-                    for k, v in annotated_keyframes.items():
-                        if Path(k).name == kf_name or Path(v).name.replace('_annotated', '') == kf_name.replace('.jpg', ''):
-                            img_b64 = self._image_to_base64(v)
-                            chunk_keyframes.append(f'<img src="data:image/jpeg;base64,{img_b64}" alt="Keyframe" class="keyframe-img">')
-                            break
-            
-            keyframes_html = ''.join(chunk_keyframes) if chunk_keyframes else '<p class="no-data">No keyframes</p>'
-            
-            # Format text
-            asr_text = chunk.asr_text if chunk.asr_text else '<em>No speech</em>'
-            ocr_text = chunk.ocr_text_cleaned if chunk.ocr_text_cleaned else '<em>No OCR text</em>'
-            
-            chunk_html = f"""
-            <div class="chunk">
-                <h3>{chunk.chunk_id}</h3>
-                <div class="chunk-meta">
-                    <span>Chapter: {chunk.chapter_title}</span>
-                    <span>Time: {chunk.t_start_ms/1000:.1f}s - {chunk.t_end_ms/1000:.1f}s ({chunk.duration_sec:.1f}s)</span>
-                    <span>ASR Confidence: {chunk.asr_confidence_avg:.2f}</span>
-                    <span>OCR Confidence: {chunk.ocr_confidence_avg:.2f}</span>
-                </div>
-                
-                <div class="chunk-content">
-                    <div class="chunk-section">
-                        <h4>Keyframes (OCR Overlay)</h4>
-                        <div class="keyframes-grid">
-                            {keyframes_html}
-                        </div>
-                    </div>
-                    
-                    <div class="chunk-section">
-                        <h4>Spoken (ASR)</h4>
-                        <p class="text-content">{asr_text}</p>
-                    </div>
-                    
-                    <div class="chunk-section">
-                        <h4>On Screen (OCR Cleaned)</h4>
-                        <p class="text-content">{ocr_text}</p>
-                    </div>
-                </div>
-            </div>
-            """
+                        src = f"data:image/jpeg;base64,{img_b64}"
+                    else:
+                        # Annotated keyframes sit in a sibling directory
+                        # of the report, so a relative reference works
+                        # without copying anything
+                        src = os.path.relpath(annotated_path, self._report_dir).replace(os.sep, '/')
+                    chunk_keyframes.append(f'<img src="{src}" alt="Keyframe" class="keyframe-img">')
             
-            chunks_html.append(chunk_html)
-        
-        html = f"""
-        <section class="chunks">
-            <h2>Chunk Details</h2>
-            {''.join(chunks_html)}
+            write(_CHUNK_TEMPLATE.format_map({
+                "chunk_id": chunk.chunk_id,
+                "chapter_title": chunk.chapter_title,
+                "t_start_sec": chunk.t_start_ms / 1000,
+                "t_end_sec": chunk.t_end_ms / 1000,
+                "duration_sec": chunk.duration_sec,
+                "asr_confidence": chunk.asr_confidence_avg,
+                "ocr_confidence": chunk.ocr_confidence_avg,
+                "keyframes_html": ''.join(chunk_keyframes) if chunk_keyframes else '<p class="no-data">No keyframes</p>',
+                "asr_text": chunk.asr_text if chunk.asr_text else '<em>No speech</em>',
+                "ocr_text": chunk.ocr_text_cleaned if chunk.ocr_text_cleaned else '<em>No OCR text</em>',
+            }))
+
+        write("""
         </section>
-        """
-        
-        return html
+        """)
     
     def _build_gaps_section(self, report: ValidationReport) -> str:
         """Build extraction gaps/issues section"""
         
-        # Keyframe gaps
+        # Keyframe gaps — one template fill per issue through a bound
+        # append, same shape as the timeline loop
         kf_gaps_html = []
+        append_gap = kf_gaps_html.append
         for gap in report.keyframe_gaps:
-            kf_gaps_html.append(f"""
-            <div class="issue {gap.severity}">
-                <strong>Keyframe Gap ({gap.severity})</strong>: 
-                {gap.start_ms/1000:.1f}s - {gap.end_ms/1000:.1f}s ({gap.duration_sec:.1f}s)
-            </div>
-            """)
-        
+            append_gap(_GAP_TEMPLATE.format_map({
+                "severity": gap.severity,
+                "start_sec": gap.start_ms / 1000,
+                "end_sec": gap.end_ms / 1000,
+                "duration_sec": gap.duration_sec,
+            }))
+
         # Quality flags
         flags_html = []
+        append_flag = flags_html.append
         for flag in report.quality_flags[:20]:  # Limit to top 20
-            flags_html.append(f"""
-            <div class="issue {flag.severity}">
-                <strong>{flag.flag_type} ({flag.severity})</strong>: 
-                {flag.description} - {Path(flag.location).name}
-            </div>
-            """)
+            append_flag(_FLAG_TEMPLATE.format_map({
+                "severity": flag.severity,
+                "flag_type": flag.flag_type,
+                "description": flag.description,
+                "location_name": cached_basename(flag.location),
+            }))
         
         html = f"""
         <section class="gaps">
@@ -297,9 +359,40 @@ class HTMLReportGenerator:
         return html
     
     def _image_to_base64(self, image_path: Path) -> str:
-        """Convert image to base64 string"""
-        with open(image_path, 'rb') as f:
-            return base64.b64encode(f.read()).decode('utf-8')
+        """Convert image to base64 string (cached across report runs)"""
+        st = image_path.stat()
+        key = (str(image_path), st.st_mtime_ns, st.st_size)
+        self._b64_used.add(key)
+        encoded = self._b64_cache.get(key)
+        if encoded is None:
+            # read_bytes skips the Python file-object layer; pybase64's
+            # SIMD encoder when installed, else stdlib b64encode with
+            # the ascii fast-path decode
+            data = image_path.read_bytes()
+            if PYBASE64_AVAILABLE:
+                encoded = pybase64.b64encode_as_string(data)
+            else:
+                encoded = base64.b64encode(data).decode('ascii')
+            self._b64_cache[key] = encoded
+        return encoded
+
+    @staticmethod
+    def _load_b64_cache(cache_path: Path) -> Dict[tuple, str]:
+        """Load the persisted encoding cache; any failure means empty"""
+        try:
+            with open(cache_path, 'rb') as f:
+                return pickle.load(f)
+        except Exception:
+            return {}
+
+    @staticmethod
+    def _save_b64_cache(cache_path: Path, cache: Dict[tuple, str]):
+        """Persist the encoding cache; failure is non-fatal"""
+        try:
+            with open(cache_path, 'wb') as f:
+                pickle.dump(cache, f, protocol=5)
+        except OSError as e:
+            logger.warning(f"Could not save base64 cache: {e}")
     
     def _get_css(self) -> str:
         """Get CSS styles for report"""
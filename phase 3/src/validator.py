@@ -1,11 +1,20 @@
 """Extraction quality validation and coverage analysis"""
+import heapq
 import json
+from collections import defaultdict
 from pathlib import Path
 from typing import List, Dict, Any, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 import logging
+import numpy as np
 
-from .loader import VideoData
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+from .loader import VideoData, OCRBlock, cached_basename
 
 logger = logging.getLogger(__name__)
 
@@ -101,20 +110,48 @@ class ExtractionValidator:
     def validate(self, video_data: VideoData) -> ValidationReport:
         """Run full validation on video data"""
         logger.info(f"Starting validation for {video_data.video_id}")
-        
+
+        # Group OCR blocks by keyframe basename once; the coverage and
+        # quality passes all consume this index instead of re-scanning
+        # every block
+        ocr_by_kf_name: Dict[str, List[OCRBlock]] = defaultdict(list)
+        for block in video_data.ocr_blocks:
+            ocr_by_kf_name[cached_basename(block.keyframe_path)].append(block)
+        ocr_by_kf_name = dict(ocr_by_kf_name)
+
+        # Struct-of-arrays views of the hot timestamp columns, extracted
+        # once; the analyses below derive their sorted/filtered views
+        # from these instead of re-reading attributes per element
+        kf_ts = np.fromiter(
+            (kf.timestamp_ms for kf in video_data.keyframes),
+            dtype=np.int64, count=len(video_data.keyframes)
+        )
+        asr_start = np.fromiter(
+            (seg.start_ms for seg in video_data.asr_segments),
+            dtype=np.int64, count=len(video_data.asr_segments)
+        )
+        asr_end = np.fromiter(
+            (seg.end_ms for seg in video_data.asr_segments),
+            dtype=np.int64, count=len(video_data.asr_segments)
+        )
+
         # Timeline coverage analysis
-        timeline_windows = self._analyze_timeline_coverage(video_data)
+        timeline_windows = self._analyze_timeline_coverage(
+            video_data, ocr_by_kf_name, kf_ts, asr_start, asr_end
+        )
         overall_coverage = self._calculate_overall_coverage(timeline_windows)
-        
+
         # Chapter coverage
-        chapter_coverage = self._analyze_chapter_coverage(video_data)
-        
+        chapter_coverage = self._analyze_chapter_coverage(
+            video_data, ocr_by_kf_name, kf_ts, asr_start, asr_end
+        )
+
         # Gap detection
-        keyframe_gaps = self._detect_keyframe_gaps(video_data)
-        asr_gaps = self._detect_asr_gaps(video_data)
-        
+        keyframe_gaps = self._detect_keyframe_gaps(kf_ts)
+        asr_gaps = self._detect_asr_gaps(asr_start, asr_end)
+
         # Quality flags
-        quality_flags = self._detect_quality_issues(video_data)
+        quality_flags = self._detect_quality_issues(video_data, ocr_by_kf_name)
         
         # Content density analysis
         richest, thinnest = self._analyze_content_density(video_data)
@@ -141,47 +178,73 @@ class ExtractionValidator:
         
         return report
     
-    def _analyze_timeline_coverage(self, video_data: VideoData) -> List[TimeWindow]:
+    def _analyze_timeline_coverage(
+        self,
+        video_data: VideoData,
+        ocr_by_kf_name: Dict[str, List[OCRBlock]],
+        kf_ts: np.ndarray,
+        asr_start: np.ndarray,
+        asr_end: np.ndarray
+    ) -> List[TimeWindow]:
         """Break video into time windows and check coverage"""
-        windows = []
+        windows: List[TimeWindow] = []
         duration_ms = int(video_data.metadata.duration_sec * 1000)
         window_ms = self.coverage_window_sec * 1000
-        
-        for start_ms in range(0, duration_ms, window_ms):
-            end_ms = min(start_ms + window_ms, duration_ms)
-            
-            # Check for ASR in this window
-            has_asr = any(
-                seg.start_ms < end_ms and seg.end_ms > start_ms
-                for seg in video_data.asr_segments
-            )
-            
-            # Check for keyframe in this window
-            has_keyframe = any(
-                start_ms <= kf.timestamp_ms < end_ms
-                for kf in video_data.keyframes
+
+        if duration_ms <= 0:
+            return windows
+
+        num_windows = (duration_ms + window_ms - 1) // window_ms
+
+        # ASR occupancy: mark each segment's window range with a +1/-1
+        # delta and take a cumulative sum — C-level work instead of an
+        # any() scan over every segment per window
+        delta = np.zeros(num_windows + 1, dtype=np.int64)
+        if asr_start.size:
+            valid = (asr_end > 0) & (asr_start < duration_ms) & (asr_end > asr_start)
+            start_bucket = np.clip(asr_start[valid] // window_ms, 0, num_windows - 1)
+            end_bucket = np.clip((asr_end[valid] - 1) // window_ms, 0, num_windows - 1)
+            np.add.at(delta, start_bucket, 1)
+            np.add.at(delta, end_bucket + 1, -1)
+        has_asr = np.cumsum(delta[:-1]) > 0
+
+        # Keyframe and OCR occupancy via bucket indexing. A window has
+        # OCR coverage exactly when it contains a keyframe that OCR
+        # produced blocks for — same condition as the old per-window
+        # path-set intersection, computed once per keyframe.
+        has_keyframe = np.zeros(num_windows, dtype=bool)
+        has_ocr = np.zeros(num_windows, dtype=bool)
+        if kf_ts.size:
+            in_range = (kf_ts >= 0) & (kf_ts < duration_ms)
+            has_keyframe[kf_ts[in_range] // window_ms] = True
+
+            if ocr_by_kf_name:
+                with_blocks = np.fromiter(
+                    (cached_basename(kf.path) in ocr_by_kf_name
+                     for kf in video_data.keyframes),
+                    dtype=bool, count=kf_ts.size
+                )
+                has_ocr[kf_ts[in_range & with_blocks] // window_ms] = True
+
+        # One sized comprehension; tolist() converts each boolean array
+        # to plain Python bools in a single C call, so neither the list
+        # growth nor the per-index numpy scalar boxing happens in the
+        # interpreter loop
+        return [
+            TimeWindow(
+                start_ms=start_ms,
+                end_ms=min(start_ms + window_ms, duration_ms),
+                has_asr=asr,
+                has_keyframe=kf,
+                has_ocr=ocr
             )
-            
-            # Check for OCR (via keyframes with OCR blocks)
-            keyframe_paths_in_window = {
-                str(kf.path) for kf in video_data.keyframes
-                if start_ms <= kf.timestamp_ms < end_ms
-            }
-            has_ocr = any(
-                block.keyframe_path in keyframe_paths_in_window or
-                Path(block.keyframe_path).name in {Path(p).name for p in keyframe_paths_in_window}
-                for block in video_data.ocr_blocks
+            for start_ms, asr, kf, ocr in zip(
+                range(0, num_windows * window_ms, window_ms),
+                has_asr.tolist(),
+                has_keyframe.tolist(),
+                has_ocr.tolist()
             )
-            
-            windows.append(TimeWindow(
-                start_ms=start_ms,
-                end_ms=end_ms,
-                has_asr=has_asr,
-                has_keyframe=has_keyframe,
-                has_ocr=has_ocr
-            ))
-        
-        return windows
+        ]
     
     def _calculate_overall_coverage(self, windows: List[TimeWindow]) -> float:
         """Calculate overall coverage percentage"""
@@ -191,38 +254,70 @@ class ExtractionValidator:
         covered = sum(1 for w in windows if w.has_asr or w.has_keyframe)
         return (covered / len(windows)) * 100
     
-    def _analyze_chapter_coverage(self, video_data: VideoData) -> List[ChapterCoverage]:
+    def _analyze_chapter_coverage(
+        self,
+        video_data: VideoData,
+        ocr_by_kf_name: Dict[str, List[OCRBlock]],
+        kf_ts: np.ndarray,
+        asr_start: np.ndarray,
+        asr_end: np.ndarray
+    ) -> List[ChapterCoverage]:
         """Analyze coverage per chapter"""
         coverage = []
-        
-        for i, chapter in enumerate(video_data.metadata.chapters):
-            # Count elements in this chapter
-            num_scenes = sum(
-                1 for scene in video_data.scenes
-                if scene.start_ms >= chapter.start_ms and scene.end_ms <= chapter.end_ms
-            )
-            
-            num_keyframes = sum(
-                1 for kf in video_data.keyframes
-                if chapter.start_ms <= kf.timestamp_ms < chapter.end_ms
-            )
-            
-            num_asr = sum(
-                1 for seg in video_data.asr_segments
-                if seg.start_ms < chapter.end_ms and seg.end_ms > chapter.start_ms
-            )
-            
+        chapters = video_data.metadata.chapters
+        if not chapters:
+            return coverage
+
+        # Sort each artifact's timestamps once; counting the elements in
+        # a chapter is then two binary searches instead of a full scan
+        # per chapter — O((C + N) log N) overall
+        scene_starts = np.sort(np.fromiter(
+            (s.start_ms for s in video_data.scenes),
+            dtype=np.int64, count=len(video_data.scenes)
+        ))
+        scene_ends = np.sort(np.fromiter(
+            (s.end_ms for s in video_data.scenes),
+            dtype=np.int64, count=len(video_data.scenes)
+        ))
+        asr_starts = np.sort(asr_start)
+        asr_ends = np.sort(asr_end)
+
+        # Keyframes ordered by timestamp, with a prefix sum of their OCR
+        # block counts — the blocks in a chapter become a difference of
+        # two prefix values
+        order = np.argsort(kf_ts, kind='stable')
+        kf_ts_sorted = kf_ts[order]
+        ocr_counts = np.fromiter(
+            (len(ocr_by_kf_name.get(cached_basename(kf.path), ()))
+             for kf in video_data.keyframes),
+            dtype=np.int64, count=kf_ts.size
+        )[order]
+        ocr_prefix = np.zeros(kf_ts.size + 1, dtype=np.int64)
+        np.cumsum(ocr_counts, out=ocr_prefix[1:])
+
+        for i, chapter in enumerate(chapters):
+            # Scenes are sequential and non-overlapping, so the ones
+            # contained in the chapter form a contiguous run: "starts at
+            # or after chapter start" cuts a suffix, "ends by chapter
+            # end" cuts a prefix
+            lo = np.searchsorted(scene_starts, chapter.start_ms, side='left')
+            hi = np.searchsorted(scene_ends, chapter.end_ms, side='right')
+            num_scenes = max(0, int(hi - lo))
+
+            kf_lo = int(np.searchsorted(kf_ts_sorted, chapter.start_ms, side='left'))
+            kf_hi = int(np.searchsorted(kf_ts_sorted, chapter.end_ms, side='left'))
+            num_keyframes = kf_hi - kf_lo
+
+            # Overlap count by exclusion: total minus segments ending
+            # before the chapter minus segments starting after it
+            num_asr = max(0, int(
+                np.searchsorted(asr_starts, chapter.end_ms, side='left')
+                - np.searchsorted(asr_ends, chapter.start_ms, side='right')
+            ))
+
             # OCR blocks (via keyframes in chapter)
-            keyframe_paths = {
-                str(kf.path) for kf in video_data.keyframes
-                if chapter.start_ms <= kf.timestamp_ms < chapter.end_ms
-            }
-            num_ocr = sum(
-                1 for block in video_data.ocr_blocks
-                if block.keyframe_path in keyframe_paths or
-                Path(block.keyframe_path).name in {Path(p).name for p in keyframe_paths}
-            )
-            
+            num_ocr = int(ocr_prefix[kf_hi] - ocr_prefix[kf_lo])
+
             # Coverage: chapters with keyframes and ASR
             chapter_duration_sec = (chapter.end_ms - chapter.start_ms) / 1000
             has_data = num_keyframes > 0 and num_asr > 0
@@ -241,74 +336,67 @@ class ExtractionValidator:
         
         return coverage
     
-    def _detect_keyframe_gaps(self, video_data: VideoData) -> List[Gap]:
+    def _detect_keyframe_gaps(self, kf_ts: np.ndarray) -> List[Gap]:
         """Detect gaps in keyframe coverage"""
-        gaps = []
-        
-        if not video_data.keyframes:
+        gaps: List[Gap] = []
+
+        if not kf_ts.size:
             return gaps
-        
-        # Sort keyframes by timestamp
-        sorted_kf = sorted(video_data.keyframes, key=lambda k: k.timestamp_ms)
-        
-        for i in range(len(sorted_kf) - 1):
-            gap_ms = sorted_kf[i + 1].timestamp_ms - sorted_kf[i].timestamp_ms
-            gap_sec = gap_ms / 1000
-            
-            if gap_sec > self.keyframe_gap_threshold_sec:
-                severity = "high" if gap_sec > 30 else "medium"
-                gaps.append(Gap(
-                    gap_type="keyframe",
-                    start_ms=sorted_kf[i].timestamp_ms,
-                    end_ms=sorted_kf[i + 1].timestamp_ms,
-                    duration_sec=gap_sec,
-                    severity=severity
-                ))
-        
+
+        # Sort and difference the timestamps in C; Gap objects are only
+        # built for the few indices over the threshold
+        kf_ms = np.sort(kf_ts)
+        diffs = np.diff(kf_ms)
+
+        for i in np.flatnonzero(diffs > self.keyframe_gap_threshold_sec * 1000):
+            gap_sec = float(diffs[i]) / 1000
+            gaps.append(Gap(
+                gap_type="keyframe",
+                start_ms=int(kf_ms[i]),
+                end_ms=int(kf_ms[i + 1]),
+                duration_sec=gap_sec,
+                severity="high" if gap_sec > 30 else "medium"
+            ))
+
         return gaps
     
-    def _detect_asr_gaps(self, video_data: VideoData) -> List[Gap]:
+    def _detect_asr_gaps(self, asr_start: np.ndarray, asr_end: np.ndarray) -> List[Gap]:
         """Detect gaps in ASR coverage"""
-        gaps = []
-        
-        if not video_data.asr_segments:
+        gaps: List[Gap] = []
+
+        if not asr_start.size:
             return gaps
-        
-        # Sort by start time
-        sorted_asr = sorted(video_data.asr_segments, key=lambda s: s.start_ms)
-        
-        for i in range(len(sorted_asr) - 1):
-            gap_ms = sorted_asr[i + 1].start_ms - sorted_asr[i].end_ms
-            
-            if gap_ms > 5000:  # 5 second gap
-                gap_sec = gap_ms / 1000
-                severity = "low"  # ASR gaps are often just silence
-                gaps.append(Gap(
-                    gap_type="asr",
-                    start_ms=sorted_asr[i].end_ms,
-                    end_ms=sorted_asr[i + 1].start_ms,
-                    duration_sec=gap_sec,
-                    severity=severity
-                ))
-        
+
+        # Order both columns by start time, then the silence between
+        # consecutive segments is one vectorized subtraction
+        order = np.argsort(asr_start, kind='stable')
+        starts = asr_start[order]
+        ends = asr_end[order]
+        gap_ms = starts[1:] - ends[:-1]
+
+        for i in np.flatnonzero(gap_ms > 5000):  # 5 second gap
+            gaps.append(Gap(
+                gap_type="asr",
+                start_ms=int(ends[i]),
+                end_ms=int(starts[i + 1]),
+                duration_sec=float(gap_ms[i]) / 1000,
+                severity="low"  # ASR gaps are often just silence
+            ))
+
         return gaps
     
-    def _detect_quality_issues(self, video_data: VideoData) -> List[QualityFlag]:
+    def _detect_quality_issues(
+        self,
+        video_data: VideoData,
+        ocr_by_kf_name: Dict[str, List[OCRBlock]]
+    ) -> List[QualityFlag]:
         """Detect quality issues"""
         flags = []
-        
-        # Group OCR by keyframe
-        ocr_by_kf = {}
-        for block in video_data.ocr_blocks:
-            key = Path(block.keyframe_path).name
-            if key not in ocr_by_kf:
-                ocr_by_kf[key] = []
-            ocr_by_kf[key].append(block)
-        
+
         # Check each keyframe
         for keyframe in video_data.keyframes:
-            kf_name = keyframe.path.name
-            ocr_blocks = ocr_by_kf.get(kf_name, [])
+            kf_name = cached_basename(keyframe.path)
+            ocr_blocks = ocr_by_kf_name.get(kf_name, [])
             
             # Flag keyframes with no OCR text
             if not ocr_blocks:
@@ -316,28 +404,31 @@ class ExtractionValidator:
                     flag_type="no_ocr",
                     severity="medium",
                     description="No OCR text extracted from keyframe",
-                    location=str(keyframe.path)
+                    location=keyframe.path
                 ))
                 continue
             
-            # Flag keyframes with very little text
-            total_text = " ".join(b.text for b in ocr_blocks)
-            if len(total_text) < self.min_ocr_text_length:
+            # Flag keyframes with very little text. Sum the block
+            # lengths (plus joining spaces) instead of materializing the
+            # concatenated string just to measure it
+            total_len = sum(len(b.text) for b in ocr_blocks) + len(ocr_blocks) - 1
+            if total_len < self.min_ocr_text_length:
                 flags.append(QualityFlag(
                     flag_type="low_ocr_text",
                     severity="low",
-                    description=f"Very little OCR text ({len(total_text)} chars)",
-                    location=str(keyframe.path)
+                    description=f"Very little OCR text ({total_len} chars)",
+                    location=keyframe.path
                 ))
-            
-            # Flag low confidence OCR
-            low_conf_blocks = [b for b in ocr_blocks if b.confidence < self.ocr_low_conf]
-            if low_conf_blocks:
+
+            # Flag low confidence OCR; only the count is reported, so
+            # skip building the filtered list
+            low_conf_count = sum(1 for b in ocr_blocks if b.confidence < self.ocr_low_conf)
+            if low_conf_count:
                 flags.append(QualityFlag(
                     flag_type="low_ocr_confidence",
                     severity="low",
-                    description=f"{len(low_conf_blocks)} OCR blocks with confidence < {self.ocr_low_conf}",
-                    location=str(keyframe.path)
+                    description=f"{low_conf_count} OCR blocks with confidence < {self.ocr_low_conf}",
+                    location=keyframe.path
                 ))
         
         # Check chunks without visual content
@@ -362,35 +453,50 @@ class ExtractionValidator:
     
     def _analyze_content_density(self, video_data: VideoData) -> Tuple[List[Dict], List[Dict]]:
         """Identify richest and thinnest chunks"""
-        # Score each chunk by total text length
-        scored_chunks = []
-        for chunk in video_data.chunks:
-            total_text = len(chunk.asr_text) + len(chunk.ocr_text_cleaned)
-            scored_chunks.append({
+        # Score each chunk by total text length; heap-select on the
+        # plain scores and only materialize dicts for the six survivors
+        # instead of building and fully sorting one dict per chunk
+        totals = [
+            len(chunk.asr_text) + len(chunk.ocr_text_cleaned)
+            for chunk in video_data.chunks
+        ]
+        richest_idx = heapq.nlargest(3, range(len(totals)), key=totals.__getitem__)
+        thinnest_idx = heapq.nsmallest(3, range(len(totals)), key=totals.__getitem__)
+
+        def _describe(i: int) -> Dict[str, Any]:
+            chunk = video_data.chunks[i]
+            return {
                 "chunk_id": chunk.chunk_id,
-                "total_text_chars": total_text,
+                "total_text_chars": totals[i],
                 "asr_chars": len(chunk.asr_text),
                 "ocr_chars": len(chunk.ocr_text_cleaned),
                 "duration_sec": chunk.duration_sec,
-                "density": total_text / chunk.duration_sec if chunk.duration_sec > 0 else 0
-            })
-        
-        # Sort by total text
-        scored_chunks.sort(key=lambda x: x["total_text_chars"], reverse=True)
-        
-        richest = scored_chunks[:3]  # Top 3
-        thinnest = scored_chunks[-3:]  # Bottom 3
-        
+                "density": totals[i] / chunk.duration_sec if chunk.duration_sec > 0 else 0
+            }
+
+        # Thinnest reversed so both lists stay in descending text order,
+        # matching what the old full sort produced
+        richest = [_describe(i) for i in richest_idx]
+        thinnest = [_describe(i) for i in reversed(thinnest_idx)]
+
         return richest, thinnest
     
     def save_report(self, report: ValidationReport, output_path: Path):
         """Save validation report to JSON"""
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Convert to dict
-        report_dict = asdict(report)
-        
-        with open(output_path, 'w') as f:
-            json.dump(report_dict, f, indent=2)
-        
+
+        # orjson serializes dataclasses natively, so the report tree is
+        # walked once during encoding with no asdict deep copy, and its
+        # C pretty-printer replaces stdlib's pure-Python indent path
+        if ORJSON_AVAILABLE:
+            output_path.write_bytes(
+                orjson.dumps(report, option=orjson.OPT_INDENT_2)
+            )
+        else:
+            # Single lazy traversal: each dataclass surfaces its
+            # __dict__ as the encoder reaches it, instead of asdict
+            # deep-copying the whole tree up front
+            with open(output_path, 'w') as f:
+                json.dump(report, f, indent=2, default=lambda o: o.__dict__)
+
         logger.info(f"Saved validation report to {output_path}")